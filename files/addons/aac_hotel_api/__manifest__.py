@@ -23,6 +23,9 @@
 
     'data': [
         'security/ir.model.access.csv',
+        'security/api_job_security.xml',
+        'data/ir_cron_data.xml',
+        'views/res_users_views.xml',
     ],
 
     'installable': True,
@@ -14,3 +14,5 @@ from . import informacion_precios
 from . import change_room
 from . import service_sync
 from . import batch_reservations
+from . import metrics
+from . import profiles
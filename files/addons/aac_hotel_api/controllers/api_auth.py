@@ -2,13 +2,53 @@
 import json
 import logging
 from functools import wraps
-from odoo import http
+from odoo import fields, http
 from odoo.http import request, Response
 from odoo.tools import json_default
 
+from .api_key_cache import api_key_cache, api_key_digest, get_api_key_expiration
+from .instrumentation import instrument_endpoint
+from .profiling import should_profile, run_profiled
+
 _logger = logging.getLogger(__name__)
 
 
+def _check_api_key(api_key, scope='rpc'):
+    """
+    Validar una API key nativa pasando primero por el caché compartido.
+
+    En cada acierto se comprueba que la key no haya vencido y que el
+    usuario siga activo.
+
+    Returns:
+        tuple: (uid, login). (None, None) si la key es inválida o vencida y
+        (uid, None) si el usuario asociado ya no existe.
+    """
+    env = request.env
+    missing_uids = []
+
+    def load():
+        # El método _check_credentials verifica y retorna el user_id
+        uid = env['res.users.apikeys'].sudo()._check_credentials(scope=scope, key=api_key)
+        if not uid:
+            return None
+        user = env['res.users'].sudo().browse(uid)
+        if not user.exists():
+            missing_uids.append(uid)
+            return None
+        return uid, user.login, get_api_key_expiration(env, uid, scope, api_key)
+
+    cached = api_key_cache.get_or_compute(env.cr, api_key_digest(scope, api_key), load)
+    if not cached:
+        return (missing_uids[0], None) if missing_uids else (None, None)
+    uid, login, expiration = cached
+    if expiration and expiration < fields.Datetime.now():
+        return None, None
+    if not env['res.users'].sudo().browse(uid).active:
+        return None, None
+    return uid, login
+
+
 def validate_api_key(func):
     """
     Decorador para validar API Key nativa de Odoo en endpoints.
@@ -20,6 +60,9 @@ def validate_api_key(func):
     Si la validación es exitosa, establece el usuario correspondiente en request.env.
     
     IMPORTANTE: Las peticiones OPTIONS (CORS preflight) pasan sin validación.
+
+    El endpoint queda instrumentado (ver instrumentation.py), incluyendo el
+    costo de la validación de la key.
     """
     @wraps(func)
     def wrapper(self, *args, **kwargs):
@@ -30,7 +73,7 @@ def validate_api_key(func):
         path = request.httprequest.path
         origin = request.httprequest.headers.get('Origin', 'NO-ORIGIN')
         
-        _logger.info(
+        _logger.debug(
             "🔍 [CORS DEBUG] Petición recibida: %s %s | Origin: %s | Endpoint: %s",
             method, path, origin, func.__name__
         )
@@ -39,7 +82,7 @@ def validate_api_key(func):
         # CORS PREFLIGHT: Permitir OPTIONS sin autenticación
         # ==========================================
         if method == 'OPTIONS':
-            _logger.info(
+            _logger.debug(
                 "✅ [CORS] Petición OPTIONS detectada - Respondiendo sin validación | Path: %s | Origin: %s",
                 path, origin
             )
@@ -96,19 +139,14 @@ def validate_api_key(func):
         
         # Usar el sistema nativo de autenticación de Odoo 17
         # Las API keys nativas se generan desde: Preferencias → Seguridad de la cuenta → Claves API
-        uid = None
+        uid = login = None
         
         try:
-            # Odoo 17 almacena las API keys en res.users.apikeys
-            # Usar el método nativo _check_credentials para validar
-            apikey_model = request.env['res.users.apikeys'].sudo()
-            
-            # El método _check_credentials verifica y retorna el user_id
-            uid = apikey_model._check_credentials(scope='rpc', key=api_key)
-            
-            if uid:
-                user = request.env['res.users'].sudo().browse(uid)
-                _logger.debug("API key nativa validada para usuario: %s", user.login)
+            # Odoo 17 almacena las API keys en res.users.apikeys; las ya
+            # validadas se sirven desde el caché sin volver a hashear
+            uid, login = _check_api_key(api_key)
+            if login:
+                _logger.debug("API key nativa validada para usuario: %s", login)
                 
         except (KeyError, AttributeError, ValueError) as e:
             _logger.debug("Error validando API key nativa: %s", str(e))
@@ -137,8 +175,7 @@ def validate_api_key(func):
             )
         
         # Establecer el usuario en el entorno
-        user = request.env['res.users'].sudo().browse(uid)
-        if not user.exists():
+        if not login:
             return Response(
                 json.dumps({
                     'success': False,
@@ -160,14 +197,17 @@ def validate_api_key(func):
         
         _logger.debug(
             "API key validada exitosamente para usuario %s en endpoint: %s",
-            user.login,
+            login,
             func.__name__
         )
         
         # Ejecutar la función original con el usuario correcto
+        # (bajo el profiler si un administrador lo pidió)
+        if should_profile():
+            return run_profiled(lambda: func(self, *args, **kwargs))
         return func(self, *args, **kwargs)
     
-    return wrapper
+    return instrument_endpoint(wrapper)
 
 
 class ApiKeyController(http.Controller):
@@ -298,7 +338,8 @@ class ApiKeyController(http.Controller):
         
         key_name = api_key_record.name
         
-        # Eliminar la API key (el sistema nativo de Odoo no tiene método revoke, se elimina)
+        # Eliminar la API key (el sistema nativo de Odoo no tiene método revoke, se elimina).
+        # unlink invalida además el caché de keys en todos los workers
         api_key_record.unlink()
         
         _logger.info(
@@ -343,13 +384,10 @@ class ApiKeyController(http.Controller):
             }, status=400)
         
         try:
-            # Usar el método nativo _check_credentials para validar
-            apikey_model = request.env['res.users.apikeys'].sudo()
-            
-            # El método _check_credentials verifica y retorna el user_id
-            user_id = apikey_model._check_credentials(scope='rpc', key=api_key)
+            # Validar con el método nativo, pasando por el caché de keys
+            user_id, login = _check_api_key(api_key)
             
-            if not user_id:
+            if not login:
                 _logger.warning("Intento de validación con API key inválida")
                 return self._prepare_response({
                     'success': False,
@@ -405,13 +443,10 @@ class ApiKeyController(http.Controller):
             }, status=400)
         
         try:
-            # Usar el método nativo _check_credentials para validar
-            apikey_model = request.env['res.users.apikeys'].sudo()
-            
-            # El método _check_credentials verifica y retorna el user_id
-            user_id = apikey_model._check_credentials(scope='rpc', key=api_key)
+            # Validar con el método nativo, pasando por el caché de keys
+            user_id, login = _check_api_key(api_key)
             
-            if not user_id:
+            if not login:
                 return self._prepare_response({
                     'success': False,
                     'valid': False,
@@ -438,3 +473,15 @@ class ApiKeyController(http.Controller):
                 'error': f'Error al validar API key: {str(e)}'
             }, status=500)
 
+    @http.route('/api/auth/cache_stats', auth='public', type='http', methods=['GET'], csrf=False)
+    @validate_api_key
+    def api_key_cache_stats(self, **_kw):
+        """
+        Contadores del caché de validación de API keys de este worker.
+        
+        Endpoint: GET /api/auth/cache_stats
+        """
+        return self._prepare_response({
+            'success': True,
+            'data': api_key_cache.stats(),
+        })
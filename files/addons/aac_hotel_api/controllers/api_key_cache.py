@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Caché en proceso de API keys validadas.
+
+res.users.apikeys._check_credentials hashea la key con passlib y recorre las
+keys candidatas en cada petición. Este caché LRU con TTL guarda, por digest
+SHA-256 de (scope, key), el uid, el login y el vencimiento de la key, así las
+peticiones repetidas del frontend no vuelven a hashear.
+
+La key en claro nunca se guarda. Es un SharedCache de hotel_management_system:
+revocar una key, o archivar o eliminar un usuario, invalida el caché en todos
+los workers, y en cada acierto se vuelven a comprobar el vencimiento de la
+key y que el usuario siga activo.
+"""
+import hashlib
+
+from odoo.addons.base.models.res_users import INDEX_SIZE
+from odoo.addons.hotel_management_system.tools.cache import SharedCache
+
+API_KEY_CACHE_TTL = 300
+API_KEY_CACHE_SIZE = 1024
+
+api_key_cache = SharedCache('api_key', API_KEY_CACHE_TTL, API_KEY_CACHE_SIZE)
+
+
+def api_key_digest(scope, api_key):
+    return hashlib.sha256(f"{scope}\x00{api_key}".encode()).hexdigest()
+
+
+def get_api_key_expiration(env, uid, scope, api_key):
+    """Vencimiento (UTC) de la key, None si no vence"""
+    if 'expiration_date' not in env['res.users.apikeys']._fields:
+        return None
+    env.cr.execute("""
+        SELECT MIN(expiration_date)
+          FROM res_users_apikeys
+         WHERE user_id = %s AND index = %s AND (scope IS NULL OR scope = %s)
+    """, [uid, api_key[:INDEX_SIZE], scope])
+    return env.cr.fetchone()[0]
@@ -1,14 +1,15 @@
 # -*- coding: utf-8 -*-
 """
 Controlador para creación batch de reservas.
-Maneja múltiples segmentos y detecta automáticamente si son consecutivos.
+Maneja múltiples segmentos y los crea vinculados entre sí; la validación,
+la disponibilidad y la creación están en el modelo hotel.batch.reservation.
 """
 from odoo import http
 from odoo.http import request, Response
+from odoo.exceptions import ValidationError
 from odoo.tools import json_default
 import json
 import logging
-from datetime import datetime
 from .api_auth import validate_api_key
 
 _logger = logging.getLogger(__name__)
@@ -19,6 +20,8 @@ class BatchReservationsController(http.Controller):
     Controlador para crear múltiples reservas de forma inteligente.
     
     Endpoint: POST /api/hotel/reservas/batch
+    Con async=true (query string o payload) el lote se encola como
+    hotel.api.job y su progreso se consulta en GET /api/hotel/jobs/<id>.
     
     Payload:
     {
@@ -48,7 +51,7 @@ class BatchReservationsController(http.Controller):
             headers={
 
                 'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
                 'Access-Control-Allow-Headers': 'Content-Type, X-API-Key, Authorization',
             }
         )
@@ -60,7 +63,7 @@ class BatchReservationsController(http.Controller):
             headers={
 
                 'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
                 'Access-Control-Allow-Headers': 'Content-Type, X-API-Key, Authorization',
                 'Access-Control-Max-Age': '86400',
             },
@@ -77,6 +80,9 @@ class BatchReservationsController(http.Controller):
         IMPORTANTE: TODOS los segmentos se vinculan entre sí, sin importar
         cuántos días haya entre ellos. Esto permite crear reservas con gaps
         (ej: 15-17 Enero, 25-27 Enero) que quedan conectadas.
+
+        Si algún segmento no está disponible responde 409 con la lista
+        'conflicts' por segmento y no crea ninguna reserva.
         """
         # Manejar preflight OPTIONS
         if request.httprequest.method == 'OPTIONS':
@@ -92,29 +98,33 @@ class BatchReservationsController(http.Controller):
                 'error': 'Invalid JSON format'
             }, status=400)
 
-        # Validar campos requeridos
-        required_fields = ['partner_id', 'user_id', 'hotel_id', 'segments']
-        for field in required_fields:
-            if field not in data:
+        # Modo asíncrono: encolar y responder con el id del trabajo
+        if self._is_async(data):
+            try:
+                job = request.env['hotel.api.job'].sudo().enqueue_batch_reservation(data)
+            except ValidationError as e:
                 return self._prepare_response({
                     'success': False,
-                    'error': f'Missing required field: {field}'
+                    'error': str(e)
                 }, status=400)
-
-        if not isinstance(data['segments'], list) or len(data['segments']) == 0:
             return self._prepare_response({
-                'success': False,
-                'error': 'segments must be a non-empty array'
-            }, status=400)
+                'success': True,
+                'message': 'Lote encolado para procesamiento asíncrono',
+                'data': self._serialize_job(job),
+            }, status=202)
 
         # Procesar reservas
         try:
-            _logger.info(f"📥 Batch request: {len(data['segments'])} segments")
-            result = self._process_batch_reservations(data)
-            _logger.info(f"✅ Batch completed: {result['message']}")
-
-            return self._prepare_response(result)
-
+            _logger.info(f"📥 Batch request: {len(data.get('segments') or [])} segments")
+            # Savepoint: si el lote falla a medias no queda nada escrito en la
+            # transacción que se confirma al responder
+            with request.env.cr.savepoint():
+                result = self._process_batch_reservations(data)
+        except ValidationError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=400)
         except Exception as e:
             _logger.error(f"❌ Error processing batch: {e}", exc_info=True)
             return self._prepare_response({
@@ -122,228 +132,89 @@ class BatchReservationsController(http.Controller):
                 'error': str(e)
             }, status=500)
 
-    def _process_batch_reservations(self, data):
-        """
-        Lógica principal para procesar múltiples reservas.
-        """
-        partner_id = data['partner_id']
-        user_id = data['user_id']
-        hotel_id = data['hotel_id']
-        motivo_viaje = data.get('motivo_viaje', '')
-        segments = data['segments']
-
-        # 1. Analizar consecutividad
-        groups = self._analyze_segments(segments)
-        _logger.info(f"📊 Detected {len(groups)} groups")
-
-        # 2. Crear reservas según grupos
-        created_reservations = []
+        if not result['success']:
+            # Algún segmento choca: no se creó ninguna reserva
+            return self._prepare_response(result, status=409)
+        _logger.info(f"✅ Batch completed: {result['message']}")
+        return self._prepare_response(result)
 
-        for idx, group in enumerate(groups):
-            _logger.info(f"🔄 Processing group {idx + 1}/{len(groups)}: {group['type']}")
+    @http.route('/api/hotel/jobs/<int:job_id>', type='http', auth='public',
+                methods=['GET', 'OPTIONS'], csrf=False)
+    @validate_api_key
+    def get_job(self, job_id, **kwargs):
+        """
+        Estado, progreso y resultado de un trabajo asíncrono.
 
-            if group['type'] == 'consecutive':
-                # Usar estrategia de change_room para mantener vinculadas
-                reservations = self._create_consecutive_group(
-                    group['segments'],
-                    partner_id,
-                    user_id,
-                    hotel_id,
-                    motivo_viaje
-                )
-                created_reservations.extend(reservations)
-            else:
-                # Crear reservas separadas
-                for segment in group['segments']:
-                    reservation = self._create_single_reservation(
-                        segment,
-                        partner_id,
-                        user_id,
-                        hotel_id,
-                        motivo_viaje
-                    )
-                    created_reservations.append(reservation)
+        Solo el usuario que encoló el trabajo (o un administrador) puede verlo.
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return self._cors_response()
 
-        return {
+        job = request.env['hotel.api.job'].sudo().browse(job_id).exists()
+        if not job or (
+            job.user_id.id != request.env.uid and not request.env.user.has_group('base.group_system')
+        ):
+            return self._prepare_response({
+                'success': False,
+                'error': 'Trabajo no encontrado'
+            }, status=404)
+        return self._prepare_response({
             'success': True,
-            'message': f'{len(created_reservations)} reservas creadas exitosamente',
-            'data': {
-                'reservations': [self._serialize_reservation(r) for r in created_reservations],
-                'groups': groups,
-                'total_created': len(created_reservations)
-            }
-        }
-
-    def _analyze_segments(self, segments):
-        """
-        Analiza los segmentos - SIEMPRE los trata como un grupo vinculado.
-        
-        No importa cuántos días haya entre segmentos, todos se vinculan.
-        
-        Returns:
-            [
-                {
-                    'type': 'consecutive',
-                    'segments': [seg1, seg2, seg3, ...],
-                    'count': N
-                }
-            ]
-        """
-        # SIEMPRE retornar todos los segmentos como UN SOLO grupo consecutivo
-        return [{
-            'type': 'consecutive',
-            'segments': segments,
-            'count': len(segments)
-        }]
+            'data': self._serialize_job(job, with_result=True),
+        })
 
-    def _parse_datetime(self, dt_str):
-        """Parsea string a datetime con múltiples formatos"""
-        formats = [
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d %H:%M',
-            '%Y-%m-%dT%H:%M:%S',
-            '%Y-%m-%dT%H:%M',
-        ]
-        for fmt in formats:
-            try:
-                return datetime.strptime(dt_str, fmt)
-            except ValueError:
-                continue
-        raise ValueError(f"Could not parse datetime: {dt_str}")
+    def _is_async(self, data):
+        """async=true en la query string o en el payload"""
+        value = request.httprequest.args.get('async')
+        if value is None and isinstance(data, dict):
+            value = data.get('async')
+        return str(value).lower() in ('1', 'true', 'yes')
 
-    def _create_consecutive_group(self, segments, partner_id, user_id, hotel_id, motivo_viaje):
+    def _serialize_job(self, job, with_result=False):
         """
-        Crea un grupo de reservas vinculadas.
-        
-        NUEVA ESTRATEGIA:
-        1. Crear cada reserva con sus propias fechas (no una maestra grande)
-        2. Vincularlas mediante split_from_booking_id y connected_booking_id
-        3. Cada reserva aparece como segmento individual en el calendario
+        Serializa un trabajo asíncrono; con with_result incluye las reservas
+        creadas y los conflictos o el error.
         """
-        Booking = request.env['hotel.booking'].sudo()
-        partner = request.env['res.partner'].sudo().browse(partner_id)
-        
-        created_reservations = []
-        previous_booking = None
-        
-        # Crear cada segmento como reserva individual
-        for idx, segment in enumerate(segments):
-            _logger.info(f"🏨 Creating booking {idx + 1}/{len(segments)}: {segment['check_in']} → {segment['check_out']}")
-            
-            # Preparar datos de huéspedes
-            guest_commands = self._create_guests(segment.get('guests', []))
-            if not guest_commands:
-                guest_commands = [(0, 0, {
-                    'name': partner.name or 'Huésped',
-                    'age': 30,
-                    'gender': 'other',
-                    'partner_id': partner_id,
-                })]
-            
-            # Convertir strings de fecha a datetime para evitar conversión UTC
-            check_in_dt = self._parse_datetime(segment['check_in'])
-            check_out_dt = self._parse_datetime(segment['check_out'])
-            
-            # Preparar valores de la reserva
-            booking_vals = {
-                'partner_id': partner_id,
-                'user_id': user_id,
-                'hotel_id': hotel_id,
-                'check_in': check_in_dt,  # Datetime naive → Sin conversión UTC
-                'check_out': check_out_dt,  # Datetime naive → Sin conversión UTC
-                'motivo_viaje': motivo_viaje,
-                'status_bar': 'initial',
-                'booking_line_ids': [(0, 0, {
-                    'product_id': segment['room_id'],
-                    'guest_info_ids': guest_commands,
-                })]
-            }
-            
-            # Si no es la primera, vincular con la anterior
-            if previous_booking:
-                booking_vals['split_from_booking_id'] = previous_booking.id
-                booking_vals['is_room_change_destination'] = True
-            else:
-                # La primera es el origen
-                booking_vals['is_room_change_origin'] = True
-            
-            # Crear la reserva
-            current_booking = Booking.create(booking_vals)
-            _logger.info(f"✅ Booking created: {current_booking.id} - {current_booking.sequence_id}")
-            
-            # Actualizar la reserva anterior para que apunte a esta
-            if previous_booking:
-                previous_booking.write({
-                    'connected_booking_id': current_booking.id,
-                    'is_room_change_origin': True,
-                })
-                _logger.info(f"🔗 Linked {previous_booking.sequence_id} → {current_booking.sequence_id}")
-            
-            created_reservations.append(current_booking)
-            previous_booking = current_booking
-        
-        _logger.info(f"✅ Created {len(created_reservations)} linked reservations")
-        return created_reservations
+        values = {
+            'job_id': job.id,
+            'state': job.state,
+            'total': job.total,
+            'processed': job.processed,
+            'progress': job.progress,
+            'started_at': job.started_at,
+            'finished_at': job.finished_at,
+            'url': f'/api/hotel/jobs/{job.id}',
+        }
+        if with_result:
+            result = json.loads(job.result) if job.result else {}
+            values.update({
+                'error': job.error or None,
+                'conflicts': result.get('conflicts', []),
+                'reservations': [self._serialize_reservation(r) for r in job.booking_ids.sorted('id')],
+            })
+        return values
 
-    def _create_single_reservation(self, segment, partner_id, user_id, hotel_id, motivo_viaje):
-        """
-        Crea una reserva individual.
+    def _process_batch_reservations(self, data):
         """
-        Booking = request.env['hotel.booking'].sudo()
-        partner = request.env['res.partner'].sudo().browse(partner_id)
-
-        _logger.info(f"🏨 Creating single booking: {segment['check_in']} → {segment['check_out']}")
-
-        # Preparar datos de huéspedes
-        guest_commands = self._create_guests(segment.get('guests', []))
-        if not guest_commands:
-            guest_commands = [(0, 0, {
-                'name': partner.name or 'Huésped',
-                'age': 30,
-                'gender': 'other',
-                'partner_id': partner_id,
-            })]
-
-        # Convertir strings de fecha a datetime para evitar conversión UTC
-        check_in_dt = self._parse_datetime(segment['check_in'])
-        check_out_dt = self._parse_datetime(segment['check_out'])
-
-        booking = Booking.create({
-            'partner_id': partner_id,
-            'user_id': user_id,
-            'hotel_id': hotel_id,
-            'check_in': check_in_dt,  # Datetime naive → Sin conversión UTC
-            'check_out': check_out_dt,  # Datetime naive → Sin conversión UTC
-            'motivo_viaje': motivo_viaje,
-            'status_bar': 'initial',
-            'booking_line_ids': [(0, 0, {
-                'product_id': segment['room_id'],
-                'guest_info_ids': guest_commands,
-            })]
-        })
-
-        _logger.info(f"✅ Single booking created: {booking.id} - {booking.sequence_id}")
-        return booking
+        Lógica principal para procesar múltiples reservas.
 
-    def _create_guests(self, guests_data):
+        Delegada en el motor hotel.batch.reservation: comprobación de
+        disponibilidad de todos los segmentos en una consulta, un único
+        create y enlace de la cadena en bloque.
         """
-        Crea comandos para guest_info_ids.
-        """
-        if not guests_data:
-            return []
-
-        commands = []
-        for guest in guests_data:
-            guest_vals = {
-                'name': guest.get('name', 'Guest'),
-                'age': guest.get('age', 30),
-                'gender': guest.get('gender', 'other'),
+        result = request.env['hotel.batch.reservation'].sudo().process(data)
+        if not result['success']:
+            return result
+        bookings = result.pop('bookings')
+        return {
+            'success': True,
+            'message': result['message'],
+            'data': {
+                'reservations': [self._serialize_reservation(r) for r in bookings],
+                'groups': result['groups'],
+                'total_created': len(bookings)
             }
-            if guest.get('partner_id'):
-                guest_vals['partner_id'] = guest['partner_id']
-            commands.append((0, 0, guest_vals))
-
-        return commands
+        }
 
     def _serialize_reservation(self, booking):
         """
@@ -3,12 +3,19 @@ import json
 import logging
 from odoo import http
 from odoo.http import request, Response
-from odoo.tools import json_default
+from odoo.tools import json_default, SQL
 from odoo.exceptions import ValidationError, AccessError
 from .api_auth import validate_api_key
 
 _logger = logging.getLogger(__name__)
 
+# Paginación de los desgloses por reserva
+PRICE_PAGE_SIZE = 20
+MAX_PRICE_PAGE_SIZE = 200
+
+# Precio original de una reserva: original_price o, si no hay, total_amount
+ORIGINAL_AMOUNT_SQL = "COALESCE(NULLIF(booking.original_price, 0), booking.total_amount, 0)"
+
 class HotelInformacionPreciosController(http.Controller):
     """Controlador especializado para información de precios de reservas"""
 
@@ -167,6 +174,159 @@ class HotelInformacionPreciosController(http.Controller):
             'savings_percentage': (total_discount / total_original * 100) if total_original > 0 else 0,
         }
 
+    # =============================================================================
+    # AGREGADOS EN BASE DE DATOS
+    # =============================================================================
+
+    def _get_page_params(self, kw):
+        """Extrae limit/offset de los desgloses por reserva"""
+        try:
+            limit = int(kw.get('limit') or PRICE_PAGE_SIZE)
+            offset = int(kw.get('offset') or 0)
+        except (TypeError, ValueError):
+            raise ValidationError('Los parámetros limit y offset deben ser números enteros')
+        return max(1, min(limit, MAX_PRICE_PAGE_SIZE)), max(offset, 0)
+
+    def _booking_scope(self, domain):
+        """Subconsulta con los ids de las reservas del dominio (con reglas de acceso)"""
+        request.env['hotel.booking'].flush_model()
+        request.env['hotel.booking.line'].flush_model(['booking_id'])
+        request.env['guest.info'].flush_model(['booking_line_id'])
+        return request.env['hotel.booking']._search(domain).subselect()
+
+    def _fetch_booking_totals(self, domain):
+        """Conteo, sumas y fechas extremas de las reservas del dominio en una consulta"""
+        request.env.cr.execute(SQL(f"""
+            WITH scoped AS (%s)
+            SELECT COUNT(*),
+                   COALESCE(SUM(booking.total_amount), 0)::float,
+                   COALESCE(SUM(booking.discount_amount), 0)::float,
+                   COALESCE(SUM({ORIGINAL_AMOUNT_SQL}), 0)::float,
+                   MIN(booking.create_date),
+                   MAX(booking.create_date),
+                   (SELECT COUNT(*)
+                      FROM hotel_booking_line line
+                     WHERE line.booking_id IN (SELECT id FROM scoped)),
+                   (SELECT COUNT(*)
+                      FROM hotel_booking_service_line service
+                     WHERE service.booking_id IN (SELECT id FROM scoped)),
+                   (SELECT COUNT(DISTINCT guest.id)
+                      FROM guest_info guest
+                      JOIN hotel_booking_line line ON line.id = guest.booking_line_id
+                     WHERE line.booking_id IN (SELECT id FROM scoped))
+              FROM hotel_booking booking
+              JOIN scoped ON scoped.id = booking.id
+        """, self._booking_scope(domain)))
+        (count, total_amount, total_discount, total_original, first_booking,
+         last_booking, total_rooms, total_services, unique_guests) = request.env.cr.fetchone()
+        return {
+            'count': count,
+            'total_amount': total_amount,
+            'total_discount': total_discount,
+            'total_original': total_original,
+            'first_booking': first_booking,
+            'last_booking': last_booking,
+            'total_rooms': total_rooms,
+            'total_services': total_services,
+            'unique_guests': unique_guests,
+        }
+
+    def _fetch_booking_groups(self, domain):
+        """Conteos y montos por estado y mes de creación en una consulta agrupada"""
+        request.env.cr.execute(SQL(f"""
+            WITH scoped AS (%s)
+            SELECT booking.status_bar,
+                   to_char(booking.create_date, 'YYYY-MM'),
+                   COUNT(*),
+                   COALESCE(SUM(booking.total_amount), 0)::float,
+                   COALESCE(SUM(booking.discount_amount), 0)::float,
+                   COALESCE(SUM({ORIGINAL_AMOUNT_SQL}), 0)::float
+              FROM hotel_booking booking
+              JOIN scoped ON scoped.id = booking.id
+          GROUP BY 1, 2
+          ORDER BY 2, 1
+        """, self._booking_scope(domain)))
+        return request.env.cr.fetchall()
+
+    def _fetch_filter_options(self, domain):
+        """Valores distintos y rangos de las reservas del dominio en una consulta"""
+        request.env.cr.execute(SQL("""
+            WITH scoped AS (%s)
+            SELECT COUNT(*),
+                   COALESCE(array_agg(DISTINCT booking.status_bar), '{}'),
+                   COALESCE(array_agg(DISTINCT booking.hotel_id)
+                            FILTER (WHERE booking.hotel_id IS NOT NULL), '{}'),
+                   COALESCE(array_agg(DISTINCT booking.currency_id)
+                            FILTER (WHERE booking.currency_id IS NOT NULL), '{}'),
+                   MIN(COALESCE(booking.total_amount, 0))::float,
+                   MAX(COALESCE(booking.total_amount, 0))::float,
+                   MIN(booking.check_in),
+                   MAX(booking.check_out),
+                   COALESCE(bool_or(booking.discount_amount > 0), FALSE),
+                   COALESCE(bool_or(COALESCE(booking.discount_amount, 0) = 0), FALSE)
+              FROM hotel_booking booking
+              JOIN scoped ON scoped.id = booking.id
+        """, self._booking_scope(domain)))
+        return request.env.cr.fetchone()
+
+    def _fetch_guest_groups(self, domain):
+        """Reservas, montos, hoteles y estados por huésped en una consulta agrupada"""
+        request.env['guest.info'].check_access_rights('read')
+        request.env.cr.execute(SQL("""
+            WITH scoped AS (%s)
+            SELECT guest.id,
+                   guest.name,
+                   guest.age,
+                   guest.gender,
+                   COUNT(*),
+                   COALESCE(SUM(booking.total_amount), 0)::float,
+                   MIN(booking.create_date),
+                   MAX(booking.create_date),
+                   COALESCE(array_agg(DISTINCT booking.hotel_id)
+                            FILTER (WHERE booking.hotel_id IS NOT NULL), '{}'),
+                   array_agg(DISTINCT booking.status_bar)
+              FROM hotel_booking booking
+              JOIN scoped ON scoped.id = booking.id
+              JOIN hotel_booking_line line ON line.booking_id = booking.id
+              JOIN guest_info guest ON guest.booking_line_id = line.id
+          GROUP BY guest.id
+          ORDER BY COUNT(*) DESC, guest.id
+        """, self._booking_scope(domain)))
+        return request.env.cr.fetchall()
+
+    def _search_booking_page(self, domain, limit, offset):
+        """Página de reservas del dominio para los desgloses detallados"""
+        return request.env['hotel.booking'].search(domain, limit=limit, offset=offset, order='id')
+
+    def _build_pagination(self, total, limit, offset):
+        return {
+            'total': total,
+            'limit': limit,
+            'offset': offset,
+            'has_more': offset + limit < total,
+        }
+
+    def _build_guest_booking_info(self, booking, guest_id):
+        """Información de precios de la reserva con las líneas del huésped"""
+        booking_info = self._build_price_info(booking)
+        guest_line_ids = set(booking.booking_line_ids.filtered(
+            lambda line: guest_id in line.guest_info_ids.ids
+        ).ids)
+        booking_info['guest_specific_lines'] = [
+            line_info for line_info in booking_info['room_prices']
+            if line_info['line_id'] in guest_line_ids
+        ]
+        return booking_info
+
+    def _build_guest_totals_info(self, guest_price_info, totals):
+        """Estadísticas adicionales de las reservas de un huésped o contacto"""
+        if totals['count']:
+            guest_price_info['average_amount'] = totals['total_amount'] / totals['count']
+            guest_price_info['first_booking'] = totals['first_booking']
+            guest_price_info['last_booking'] = totals['last_booking']
+            guest_price_info['savings_percentage'] = (totals['total_discount'] / totals['total_amount'] * 100) if totals['total_amount'] > 0 else 0
+        return guest_price_info
+
     # =============================================================================
     # ENDPOINTS PARA INFORMACIÓN DE PRECIOS
     # =============================================================================
@@ -426,11 +586,9 @@ class HotelInformacionPreciosController(http.Controller):
             if kw.get('guest_id'):
                 domain.append(('booking_line_ids.guest_info_ids', '=', int(kw['guest_id'])))
             
-            booking_records = request.env['hotel.booking'].search(domain)
-            
-            # Calcular estadísticas
+            # Calcular estadísticas agrupando por estado y mes en la base de datos
             stats = {
-                'total_reservas': len(booking_records),
+                'total_reservas': 0,
                 'total_amount': 0,
                 'total_discount': 0,
                 'total_original': 0,
@@ -438,24 +596,21 @@ class HotelInformacionPreciosController(http.Controller):
                 'by_month': {},
             }
             
-            for booking in booking_records:
-                stats['total_amount'] += booking.total_amount
-                stats['total_discount'] += booking.discount_amount or 0
-                stats['total_original'] += booking.original_price or booking.total_amount
+            for status, month_key, count, amount, discount, original in self._fetch_booking_groups(domain):
+                stats['total_reservas'] += count
+                stats['total_amount'] += amount
+                stats['total_discount'] += discount
+                stats['total_original'] += original
                 
                 # Por estado
-                status = booking.status_bar
-                if status not in stats['by_status']:
-                    stats['by_status'][status] = {'count': 0, 'amount': 0}
-                stats['by_status'][status]['count'] += 1
-                stats['by_status'][status]['amount'] += booking.total_amount
+                by_status = stats['by_status'].setdefault(status, {'count': 0, 'amount': 0})
+                by_status['count'] += count
+                by_status['amount'] += amount
                 
                 # Por mes
-                month_key = booking.create_date.strftime('%Y-%m')
-                if month_key not in stats['by_month']:
-                    stats['by_month'][month_key] = {'count': 0, 'amount': 0}
-                stats['by_month'][month_key]['count'] += 1
-                stats['by_month'][month_key]['amount'] += booking.total_amount
+                by_month = stats['by_month'].setdefault(month_key, {'count': 0, 'amount': 0})
+                by_month['count'] += count
+                by_month['amount'] += amount
             
             # Calcular porcentajes
             stats['savings_percentage'] = (stats['total_discount'] / stats['total_original'] * 100) if stats['total_original'] > 0 else 0
@@ -472,6 +627,11 @@ class HotelInformacionPreciosController(http.Controller):
                 }
             })
             
+        except AccessError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=403)
         except Exception as e:
             _logger.exception(f"Error inesperado en get_user_price_summary: {str(e)}")
             return self._prepare_response({
@@ -482,7 +642,12 @@ class HotelInformacionPreciosController(http.Controller):
     @http.route('/api/hotel/user/<int:user_id>/price_breakdown', auth='public', type='http', methods=['GET'], csrf=False)
     @validate_api_key
     def get_user_price_breakdown(self, user_id, **kw):
-        """Obtener desglose detallado de precios de todas las reservas de un usuario"""
+        """
+        Obtener desglose detallado de precios de las reservas de un usuario.
+        
+        Los totales cubren todas las reservas; el desglose por reserva se
+        devuelve paginado (limit/offset).
+        """
         try:
             # Verificar que el usuario existe
             user = request.env['res.users'].browse(user_id)
@@ -492,6 +657,8 @@ class HotelInformacionPreciosController(http.Controller):
                     'error': f'Usuario con ID {user_id} no encontrado'
                 }, status=404)
             
+            limit, offset = self._get_page_params(kw)
+            
             # Buscar reservas del usuario con filtros
             domain = [('partner_id', '=', user_id)]
             
@@ -507,20 +674,19 @@ class HotelInformacionPreciosController(http.Controller):
             if kw.get('guest_id'):
                 domain.append(('booking_line_ids.guest_info_ids', '=', int(kw['guest_id'])))
             
-            booking_records = request.env['hotel.booking'].search(domain)
-            
-            # Construir desglose detallado
-            breakdown_data = []
+            totals = self._fetch_booking_totals(domain)
             total_stats = {
-                'total_reservas': len(booking_records),
-                'total_amount': 0.0,
-                'total_discount': 0.0,
-                'total_rooms': 0,
-                'total_services': 0,
+                'total_reservas': totals['count'],
+                'total_amount': totals['total_amount'],
+                'total_discount': totals['total_discount'],
+                'total_rooms': totals['total_rooms'],
+                'total_services': totals['total_services'],
             }
             
-            for booking in booking_records:
-                booking_breakdown = {
+            # Construir desglose detallado solo de la página solicitada
+            breakdown_data = []
+            for booking in self._search_booking_page(domain, limit, offset):
+                breakdown_data.append({
                     'booking_id': booking.id,
                     'booking_reference': booking.sequence_id,
                     'status_bar': booking.status_bar,
@@ -529,18 +695,9 @@ class HotelInformacionPreciosController(http.Controller):
                     'room_breakdown': self._build_room_price_breakdown(booking.booking_line_ids),
                     'services_breakdown': self._build_services_data(getattr(booking, 'hotel_service_lines', [])),
                     'financial_summary': self._build_financial_summary(booking),
-                }
-                
-                breakdown_data.append(booking_breakdown)
-                
-                # Acumular estadísticas
-                total_stats['total_amount'] += float(booking.total_amount)
-                total_stats['total_discount'] += float(booking.discount_amount or 0)
-                total_stats['total_rooms'] += len(booking.booking_line_ids)
-                hotel_services = getattr(booking, 'hotel_service_lines', None)
-                total_stats['total_services'] += len(hotel_services) if hotel_services else 0
+                })
             
-            _logger.info(f"Desglose de precios obtenido para usuario {user_id}: {len(booking_records)} reservas")
+            _logger.info(f"Desglose de precios obtenido para usuario {user_id}: {totals['count']} reservas")
             
             return self._prepare_response({
                 'success': True,
@@ -548,10 +705,21 @@ class HotelInformacionPreciosController(http.Controller):
                     'user_id': user_id,
                     'user_name': user.name,
                     'total_stats': total_stats,
-                    'reservations_breakdown': breakdown_data
+                    'reservations_breakdown': breakdown_data,
+                    'pagination': self._build_pagination(totals['count'], limit, offset),
                 }
             })
             
+        except ValidationError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+        except AccessError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=403)
         except Exception as e:
             _logger.exception(f"Error inesperado en get_user_price_breakdown: {str(e)}")
             return self._prepare_response({
@@ -574,37 +742,37 @@ class HotelInformacionPreciosController(http.Controller):
             
             # Buscar reservas del usuario
             domain = [('partner_id', '=', user_id)]
-            booking_records = request.env['hotel.booking'].search(domain)
+            (total_reservas, statuses, hotel_ids, currency_ids, min_amount, max_amount,
+             earliest, latest, has_discount, no_discount) = self._fetch_filter_options(domain)
+            
+            hotels = request.env['hotel.hotels'].browse(hotel_ids)
+            currencies = request.env['res.currency'].browse(currency_ids)
             
             # Extraer opciones de filtros
             filter_options = {
-                'status_options': list(set(booking.status_bar for booking in booking_records)),
+                'status_options': statuses,
                 'hotel_options': [
-                    {'id': booking.hotel_id.id, 'name': booking.hotel_id.name}
-                    for booking in booking_records if booking.hotel_id
+                    {'id': hotel.id, 'name': hotel.name}
+                    for hotel in hotels
                 ],
                 'currency_options': [
-                    {'id': booking.currency_id.id, 'name': booking.currency_id.name, 'symbol': booking.currency_id.symbol}
-                    for booking in booking_records
+                    {'id': currency.id, 'name': currency.name, 'symbol': currency.symbol}
+                    for currency in currencies
                 ],
                 'amount_range': {
-                    'min': min(booking.total_amount for booking in booking_records) if booking_records else 0,
-                    'max': max(booking.total_amount for booking in booking_records) if booking_records else 0,
+                    'min': min_amount if total_reservas else 0,
+                    'max': max_amount if total_reservas else 0,
                 },
                 'date_range': {
-                    'earliest': min(booking.check_in for booking in booking_records) if booking_records else None,
-                    'latest': max(booking.check_out for booking in booking_records) if booking_records else None,
+                    'earliest': earliest,
+                    'latest': latest,
                 },
                 'discount_options': {
-                    'has_discount': any(booking.discount_amount > 0 for booking in booking_records),
-                    'no_discount': any(not booking.discount_amount or booking.discount_amount == 0 for booking in booking_records),
+                    'has_discount': has_discount,
+                    'no_discount': no_discount,
                 }
             }
             
-            # Eliminar duplicados en hoteles y monedas
-            filter_options['hotel_options'] = list({h['id']: h for h in filter_options['hotel_options']}.values())
-            filter_options['currency_options'] = list({c['id']: c for c in filter_options['currency_options']}.values())
-            
             _logger.info(f"Opciones de filtros obtenidas para usuario {user_id}")
             
             return self._prepare_response({
@@ -612,11 +780,16 @@ class HotelInformacionPreciosController(http.Controller):
                 'data': {
                     'user_id': user_id,
                     'user_name': user.name,
-                    'total_reservas': len(booking_records),
+                    'total_reservas': total_reservas,
                     'filter_options': filter_options
                 }
             })
             
+        except AccessError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=403)
         except Exception as e:
             _logger.exception(f"Error inesperado en get_user_price_filters: {str(e)}")
             return self._prepare_response({
@@ -637,57 +810,41 @@ class HotelInformacionPreciosController(http.Controller):
                     'error': f'Usuario con ID {user_id} no encontrado'
                 }, status=404)
             
-            # Buscar reservas del usuario
+            # Agrupar por huésped en la base de datos (ya ordenado por total de reservas)
             domain = [('partner_id', '=', user_id)]
-            booking_records = request.env['hotel.booking'].search(domain)
-            
-            # Recopilar todos los huéspedes únicos
-            guests_data = {}
-            
-            for booking in booking_records:
-                for line in booking.booking_line_ids:
-                    for guest in line.guest_info_ids:
-                        guest_id = guest.id
-                        
-                        if guest_id not in guests_data:
-                            guests_data[guest_id] = {
-                                'guest_id': guest_id,
-                                'name': guest.name,
-                                'age': guest.age,
-                                'gender': guest.gender,
-                                'total_bookings': 0,
-                                'total_amount': 0,
-                                'first_booking': booking.create_date,
-                                'last_booking': booking.create_date,
-                                'hotels': set(),
-                                'statuses': set(),
-                            }
-                        
-                        # Actualizar estadísticas del huésped
-                        guests_data[guest_id]['total_bookings'] += 1
-                        guests_data[guest_id]['total_amount'] += booking.total_amount
-                        guests_data[guest_id]['last_booking'] = max(guests_data[guest_id]['last_booking'], booking.create_date)
-                        
-                        if booking.hotel_id:
-                            guests_data[guest_id]['hotels'].add(booking.hotel_id.name)
-                        guests_data[guest_id]['statuses'].add(booking.status_bar)
-            
-            # Convertir sets a listas y preparar respuesta
-            guests_list = []
-            for guest_data in guests_data.values():
-                guest_data['hotels'] = list(guest_data['hotels'])
-                guest_data['statuses'] = list(guest_data['statuses'])
-                guests_list.append(guest_data)
-            
-            # Ordenar por total de reservas (descendente)
-            guests_list.sort(key=lambda x: x['total_bookings'], reverse=True)
+            guest_rows = self._fetch_guest_groups(domain)
+            
+            hotel_names = {
+                hotel.id: hotel.name
+                for hotel in request.env['hotel.hotels'].browse(
+                    {hotel_id for row in guest_rows for hotel_id in row[8]}
+                )
+            }
+            
+            guests_list = [
+                {
+                    'guest_id': guest_id,
+                    'name': name,
+                    'age': age,
+                    'gender': gender or False,
+                    'total_bookings': total_bookings,
+                    'total_amount': total_amount,
+                    'first_booking': first_booking,
+                    'last_booking': last_booking,
+                    'hotels': [hotel_names[hotel_id] for hotel_id in hotel_ids],
+                    'statuses': statuses,
+                }
+                for (guest_id, name, age, gender, total_bookings, total_amount,
+                     first_booking, last_booking, hotel_ids, statuses) in guest_rows
+            ]
             
             # Estadísticas generales
+            total_bookings = sum(g['total_bookings'] for g in guests_list)
             guest_stats = {
                 'total_unique_guests': len(guests_list),
-                'total_bookings': sum(g['total_bookings'] for g in guests_list),
+                'total_bookings': total_bookings,
                 'total_amount': sum(g['total_amount'] for g in guests_list),
-                'average_bookings_per_guest': sum(g['total_bookings'] for g in guests_list) / len(guests_list) if guests_list else 0,
+                'average_bookings_per_guest': total_bookings / len(guests_list) if guests_list else 0,
             }
             
             _logger.info(f"Lista de huéspedes obtenida para usuario {user_id}: {len(guests_list)} huéspedes únicos")
@@ -702,6 +859,11 @@ class HotelInformacionPreciosController(http.Controller):
                 }
             })
             
+        except AccessError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=403)
         except Exception as e:
             _logger.exception(f"Error inesperado en get_user_guests: {str(e)}")
             return self._prepare_response({
@@ -712,7 +874,7 @@ class HotelInformacionPreciosController(http.Controller):
     @http.route('/api/hotel/user/<int:user_id>/guest/<int:guest_id>/price_info', auth='public', type='http', methods=['GET'], csrf=False)
     @validate_api_key
     def get_guest_price_info(self, user_id, guest_id, **kw):
-        """Obtener información de precios específica de un huésped"""
+        """Obtener información de precios específica de un huésped (reservas paginadas)"""
         try:
             # Verificar que el usuario existe
             user = request.env['res.users'].browse(user_id)
@@ -730,6 +892,8 @@ class HotelInformacionPreciosController(http.Controller):
                     'error': f'Huésped con ID {guest_id} no encontrado'
                 }, status=404)
             
+            limit, offset = self._get_page_params(kw)
+            
             # Buscar reservas del usuario que contengan este huésped
             domain = [
                 ('partner_id', '=', user_id),
@@ -744,7 +908,7 @@ class HotelInformacionPreciosController(http.Controller):
             if kw.get('date_to'):
                 domain.append(('check_out', '<=', kw.get('date_to')))
             
-            booking_records = request.env['hotel.booking'].search(domain)
+            totals = self._fetch_booking_totals(domain)
             
             # Construir información específica del huésped
             guest_price_info = {
@@ -752,30 +916,18 @@ class HotelInformacionPreciosController(http.Controller):
                 'guest_name': guest.name,
                 'guest_age': guest.age,
                 'guest_gender': guest.gender,
-                'total_bookings': len(booking_records),
-                'total_amount': sum(booking.total_amount for booking in booking_records),
-                'total_discount': sum(booking.discount_amount or 0 for booking in booking_records),
-                'bookings': []
+                'total_bookings': totals['count'],
+                'total_amount': totals['total_amount'],
+                'total_discount': totals['total_discount'],
+                'bookings': [
+                    self._build_guest_booking_info(booking, guest_id)
+                    for booking in self._search_booking_page(domain, limit, offset)
+                ],
+                'pagination': self._build_pagination(totals['count'], limit, offset),
             }
             
-            for booking in booking_records:
-                booking_info = self._build_price_info(booking)
-                # Filtrar solo las líneas que contienen este huésped
-                guest_lines = []
-                for line_info in booking_info['room_prices']:
-                    line = request.env['hotel.booking.line'].browse(line_info['line_id'])
-                    if guest_id in line.guest_info_ids.ids:
-                        guest_lines.append(line_info)
-                
-                booking_info['guest_specific_lines'] = guest_lines
-                guest_price_info['bookings'].append(booking_info)
-            
             # Estadísticas adicionales
-            if booking_records:
-                guest_price_info['average_amount'] = guest_price_info['total_amount'] / guest_price_info['total_bookings']
-                guest_price_info['first_booking'] = min(booking.create_date for booking in booking_records)
-                guest_price_info['last_booking'] = max(booking.create_date for booking in booking_records)
-                guest_price_info['savings_percentage'] = (guest_price_info['total_discount'] / guest_price_info['total_amount'] * 100) if guest_price_info['total_amount'] > 0 else 0
+            self._build_guest_totals_info(guest_price_info, totals)
             
             _logger.info(f"Información de precios del huésped {guest_id} obtenida para usuario {user_id}")
             
@@ -784,6 +936,16 @@ class HotelInformacionPreciosController(http.Controller):
                 'data': guest_price_info
             })
             
+        except ValidationError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+        except AccessError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=403)
         except Exception as e:
             _logger.exception(f"Error inesperado en get_guest_price_info: {str(e)}")
             return self._prepare_response({
@@ -794,7 +956,7 @@ class HotelInformacionPreciosController(http.Controller):
     @http.route('/api/hotel/guest/<int:guest_id>/price_info', auth='public', type='http', methods=['GET'], csrf=False)
     @validate_api_key
     def get_guest_direct_price_info(self, guest_id, **kw):
-        """Obtener información de precios directamente de un huésped específico"""
+        """Obtener información de precios directamente de un huésped específico (reservas paginadas)"""
         try:
             # Verificar que el huésped existe
             guest = request.env['guest.info'].browse(guest_id)
@@ -804,6 +966,8 @@ class HotelInformacionPreciosController(http.Controller):
                     'error': f'Huésped con ID {guest_id} no encontrado'
                 }, status=404)
             
+            limit, offset = self._get_page_params(kw)
+            
             # Buscar reservas que contengan este huésped
             domain = [('booking_line_ids.guest_info_ids', '=', guest_id)]
             
@@ -817,7 +981,7 @@ class HotelInformacionPreciosController(http.Controller):
             if kw.get('hotel_id'):
                 domain.append(('hotel_id', '=', int(kw['hotel_id'])))
             
-            booking_records = request.env['hotel.booking'].search(domain)
+            totals = self._fetch_booking_totals(domain)
             
             # Construir información específica del huésped
             guest_price_info = {
@@ -825,30 +989,18 @@ class HotelInformacionPreciosController(http.Controller):
                 'guest_name': guest.name,
                 'guest_age': guest.age,
                 'guest_gender': guest.gender,
-                'total_bookings': len(booking_records),
-                'total_amount': sum(float(booking.total_amount) for booking in booking_records),
-                'total_discount': sum(float(booking.discount_amount or 0) for booking in booking_records),
-                'bookings': []
+                'total_bookings': totals['count'],
+                'total_amount': totals['total_amount'],
+                'total_discount': totals['total_discount'],
+                'bookings': [
+                    self._build_guest_booking_info(booking, guest_id)
+                    for booking in self._search_booking_page(domain, limit, offset)
+                ],
+                'pagination': self._build_pagination(totals['count'], limit, offset),
             }
             
-            for booking in booking_records:
-                booking_info = self._build_price_info(booking)
-                # Filtrar solo las líneas que contienen este huésped
-                guest_lines = []
-                for line_info in booking_info['room_prices']:
-                    line = request.env['hotel.booking.line'].browse(line_info['line_id'])
-                    if guest_id in line.guest_info_ids.ids:
-                        guest_lines.append(line_info)
-                
-                booking_info['guest_specific_lines'] = guest_lines
-                guest_price_info['bookings'].append(booking_info)
-            
             # Estadísticas adicionales
-            if booking_records:
-                guest_price_info['average_amount'] = guest_price_info['total_amount'] / guest_price_info['total_bookings']
-                guest_price_info['first_booking'] = min(booking.create_date for booking in booking_records)
-                guest_price_info['last_booking'] = max(booking.create_date for booking in booking_records)
-                guest_price_info['savings_percentage'] = (guest_price_info['total_discount'] / guest_price_info['total_amount'] * 100) if guest_price_info['total_amount'] > 0 else 0
+            self._build_guest_totals_info(guest_price_info, totals)
             
             _logger.info(f"Información de precios del huésped {guest_id} obtenida directamente")
             
@@ -857,6 +1009,16 @@ class HotelInformacionPreciosController(http.Controller):
                 'data': guest_price_info
             })
             
+        except ValidationError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+        except AccessError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=403)
         except Exception as e:
             _logger.exception(f"Error inesperado en get_guest_direct_price_info: {str(e)}")
             return self._prepare_response({
@@ -867,7 +1029,7 @@ class HotelInformacionPreciosController(http.Controller):
     @http.route('/api/hotel/partner/<int:partner_id>/price_info', auth='public', type='http', methods=['GET'], csrf=False)
     @validate_api_key
     def get_partner_price_info(self, partner_id, **kw):
-        """Obtener información de precios de un contacto/empresa específico"""
+        """Obtener información de precios de un contacto/empresa específico (reservas paginadas)"""
         try:
             # Verificar que el contacto existe
             partner = request.env['res.partner'].browse(partner_id)
@@ -877,6 +1039,8 @@ class HotelInformacionPreciosController(http.Controller):
                     'error': f'Contacto con ID {partner_id} no encontrado'
                 }, status=404)
             
+            limit, offset = self._get_page_params(kw)
+            
             # Buscar reservas donde este contacto es el partner_id principal
             domain = [('partner_id', '=', partner_id)]
             
@@ -890,7 +1054,7 @@ class HotelInformacionPreciosController(http.Controller):
             if kw.get('hotel_id'):
                 domain.append(('hotel_id', '=', int(kw['hotel_id'])))
             
-            booking_records = request.env['hotel.booking'].search(domain)
+            totals = self._fetch_booking_totals(domain)
             
             # Construir información específica del contacto
             partner_price_info = {
@@ -901,31 +1065,21 @@ class HotelInformacionPreciosController(http.Controller):
                 'partner_phone': partner.phone,
                 'partner_city': partner.city,
                 'partner_country': partner.country_id.name if partner.country_id else None,
-                'total_bookings': len(booking_records),
-                'total_amount': sum(float(booking.total_amount) for booking in booking_records),
-                'total_discount': sum(float(booking.discount_amount or 0) for booking in booking_records),
-                'bookings': []
+                'total_bookings': totals['count'],
+                'total_amount': totals['total_amount'],
+                'total_discount': totals['total_discount'],
+                'bookings': [
+                    self._build_price_info(booking)
+                    for booking in self._search_booking_page(domain, limit, offset)
+                ],
+                'pagination': self._build_pagination(totals['count'], limit, offset),
             }
             
-            for booking in booking_records:
-                booking_info = self._build_price_info(booking)
-                partner_price_info['bookings'].append(booking_info)
-            
             # Estadísticas adicionales
-            if booking_records:
-                partner_price_info['average_amount'] = partner_price_info['total_amount'] / partner_price_info['total_bookings']
-                partner_price_info['first_booking'] = min(booking.create_date for booking in booking_records)
-                partner_price_info['last_booking'] = max(booking.create_date for booking in booking_records)
-                partner_price_info['savings_percentage'] = (partner_price_info['total_discount'] / partner_price_info['total_amount'] * 100) if partner_price_info['total_amount'] > 0 else 0
-                
+            self._build_guest_totals_info(partner_price_info, totals)
+            if totals['count']:
                 # Información de huéspedes únicos
-                unique_guests = set()
-                for booking in booking_records:
-                    for line in booking.booking_line_ids:
-                        for guest in line.guest_info_ids:
-                            unique_guests.add(guest.id)
-                
-                partner_price_info['unique_guests_count'] = len(unique_guests)
+                partner_price_info['unique_guests_count'] = totals['unique_guests']
             
             _logger.info(f"Información de precios del contacto {partner_id} obtenida directamente")
             
@@ -934,6 +1088,16 @@ class HotelInformacionPreciosController(http.Controller):
                 'data': partner_price_info
             })
             
+        except ValidationError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+        except AccessError as e:
+            return self._prepare_response({
+                'success': False,
+                'error': str(e)
+            }, status=403)
         except Exception as e:
             _logger.exception(f"Error inesperado en get_partner_price_info: {str(e)}")
             return self._prepare_response({
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentación por petición de los endpoints de la API.
+
+validate_api_key y handle_api_errors envuelven el endpoint con
+instrument_endpoint, que mide (solo en el envoltorio más externo):
+
+- tiempo total de la petición;
+- número de consultas SQL y tiempo en SQL, a partir de los contadores
+  query_count/query_time que Odoo lleva en el hilo de la petición;
+- fallos del caché del ORM (lecturas de campos que van a la base de datos,
+  contadas en models/base.py);
+- tamaño de la respuesta.
+
+Las métricas se devuelven en las cabeceras Server-Timing y X-Query-Count,
+se registran como una línea JSON en el logger
+odoo.addons.aac_hotel_api.metrics y se acumulan en el registro compartido
+que publica /api/hotel/metrics, para detectar regresiones N+1 en
+producción sin adjuntar un profiler.
+"""
+import json
+import logging
+import threading
+import time
+from functools import wraps
+
+from odoo.http import request
+from odoo.addons.hotel_management_system.tools.metrics import metrics
+from werkzeug.wrappers import Response as WerkzeugResponse
+
+_metrics_logger = logging.getLogger('odoo.addons.aac_hotel_api.metrics')
+
+# Atributo del hilo donde models/base.py cuenta los fallos del caché del ORM
+ORM_MISSES_ATTR = 'api_orm_cache_misses'
+
+EXPOSED_HEADERS = 'Server-Timing, X-Query-Count'
+
+
+def _response_size(response):
+    if isinstance(response, WerkzeugResponse):
+        if response.is_streamed:
+            return None
+        return response.calculate_content_length()
+    # Rutas type='json': el cuerpo se serializa después de salir del endpoint
+    return None
+
+
+def _set_headers(response, values):
+    server_timing = (
+        f'app;dur={values["wall_ms"]}, '
+        f'sql;dur={values["sql_ms"]};desc="{values["sql_count"]} queries", '
+        f'orm;desc="{values["orm_cache_misses"]} cache misses"'
+    )
+    headers = {
+        'Server-Timing': server_timing,
+        'X-Query-Count': str(values['sql_count']),
+        'Access-Control-Expose-Headers': EXPOSED_HEADERS,
+        'Timing-Allow-Origin': '*',
+    }
+    target = response if isinstance(response, WerkzeugResponse) else request.future_response
+    for name, value in headers.items():
+        target.headers[name] = value
+
+
+def _record(values):
+    """Acumular la petición en el registro compartido de métricas"""
+    route = values['endpoint']
+    method = values['method']
+    metrics.observe(
+        'hotel_api_request_duration_seconds', values['wall_ms'] / 1000, route=route, method=method
+    )
+    metrics.inc('hotel_api_requests', route=route, method=method, status=values['status'])
+    metrics.inc('hotel_api_sql_queries', values['sql_count'], route=route)
+
+
+def instrument_endpoint(func):
+    """Decorador que mide el endpoint y publica sus métricas"""
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if getattr(request, '_api_instrumented', False) or request.httprequest.method == 'OPTIONS':
+            return func(self, *args, **kwargs)
+        request._api_instrumented = True
+
+        thread = threading.current_thread()
+        query_count = getattr(thread, 'query_count', 0)
+        query_time = getattr(thread, 'query_time', 0.0)
+        setattr(thread, ORM_MISSES_ATTR, 0)
+        start = time.perf_counter()
+        response = None
+        try:
+            response = func(self, *args, **kwargs)
+            return response
+        finally:
+            values = {
+                'endpoint': f'{type(self).__name__}.{func.__name__}',
+                'method': request.httprequest.method,
+                'path': request.httprequest.path,
+                'status': getattr(response, 'status_code', 200 if response is not None else 500),
+                'uid': request.env.uid if request.env else None,
+                'wall_ms': round((time.perf_counter() - start) * 1000, 2),
+                'sql_count': getattr(thread, 'query_count', 0) - query_count,
+                'sql_ms': round((getattr(thread, 'query_time', 0.0) - query_time) * 1000, 2),
+                'orm_cache_misses': getattr(thread, ORM_MISSES_ATTR, 0),
+                'response_bytes': _response_size(response),
+            }
+            delattr(thread, ORM_MISSES_ATTR)
+            if response is not None:
+                _set_headers(response, values)
+            _metrics_logger.info(json.dumps(values))
+            _record(values)
+
+    return wrapper
@@ -43,9 +43,7 @@ class BookingEndpoints:
         booking_records = request.env["hotel.booking"].search(domain)
         self._check_access_rule(booking_records, "read")
 
-        reservas_list = [
-            self._build_booking_data(booking) for booking in booking_records
-        ]
+        reservas_list = self._build_bookings_data(booking_records)
 
         _logger.info(
             "Consulta exitosa: %s reservas recuperadas para hotel %s (%s)",
@@ -159,9 +157,7 @@ class BookingEndpoints:
         booking_records = request.env["hotel.booking"].search(domain)
         self._check_access_rule(booking_records, "read")
 
-        reservas_list = [
-            self._build_booking_data(booking) for booking in booking_records
-        ]
+        reservas_list = self._build_bookings_data(booking_records)
 
         return self._prepare_response(
             {
@@ -189,6 +185,8 @@ class BookingEndpoints:
     def get_reservas(self, **kw):
         """Obtener todas las reservas con filtros opcionales"""
         cleaned_kw = {k: v for k, v in kw.items() if v not in (None, "", "None")}
+        pagination = self._pop_pagination_params(cleaned_kw)
+        projection = self._pop_fields_param(cleaned_kw)
         if "hotel" in cleaned_kw and "hotel_id" not in cleaned_kw:
             cleaned_kw["hotel_id"] = cleaned_kw.pop("hotel")
 
@@ -285,10 +283,16 @@ class BookingEndpoints:
         if not status_bar_param or status_bar_param not in ["cancel", "cancelled"]:
             domain.append(("status_bar", "not in", ["cancel", "cancelled"]))
 
-        booking_records = request.env["hotel.booking"].sudo().search(domain)
-        reservas_list = [
-            self._build_booking_data(booking) for booking in booking_records
-        ]
+        next_cursor = None
+        if pagination:
+            booking_records, next_cursor = self._search_page(
+                request.env["hotel.booking"].sudo(), domain, pagination
+            )
+        else:
+            booking_records = request.env["hotel.booking"].sudo().search(domain)
+        reservas_list = self._build_bookings_data(
+            booking_records, field_names=projection
+        )
 
         _logger.info("Consulta exitosa: %s reservas recuperadas", len(reservas_list))
 
@@ -297,6 +301,9 @@ class BookingEndpoints:
             "count": len(reservas_list),
             "data": reservas_list,
         }
+        if pagination:
+            response_data["limit"] = pagination["limit"]
+            response_data["next_cursor"] = next_cursor
         if cleaned_kw.get("hotel_id"):
             try:
                 hotel_id = int(cleaned_kw["hotel_id"])
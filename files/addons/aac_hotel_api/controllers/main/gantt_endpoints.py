@@ -11,6 +11,50 @@ _logger = logging.getLogger(__name__)
 
 class GanttEndpoints:
 
+    @http.route(
+        "/api/hotel/gantt/matrix",
+        auth="public",
+        type="http",
+        methods=["GET"],
+        csrf=False,
+        website=False,
+    )
+    @validate_api_key
+    @handle_api_errors
+    def get_gantt_matrix(self, **kw):
+        """Matriz compacta habitación × día (tramos run-length) para cualquier ventana de fechas"""
+        target_date_str = kw.get("target_date")
+        target_date = (
+            datetime.strptime(target_date_str, "%Y-%m-%d").date()
+            if target_date_str
+            else datetime.now().date()
+        )
+        date_from = (
+            datetime.strptime(kw["date_from"], "%Y-%m-%d").date()
+            if kw.get("date_from")
+            else target_date.replace(day=1)
+        )
+        date_to = (
+            datetime.strptime(kw["date_to"], "%Y-%m-%d").date()
+            if kw.get("date_to")
+            else (date_from.replace(day=1) + timedelta(days=32)).replace(day=1)
+        )
+
+        hotel_id = kw.get("hotel_id")
+        if hotel_id:
+            try:
+                hotel_id = int(hotel_id)
+            except (ValueError, TypeError):
+                hotel_id = None
+
+        matrix = (
+            request.env["hotel.room.availability"]
+            .sudo()
+            .with_context(tz=request.env.user.tz or "UTC")
+            .get_occupancy_matrix(date_from, date_to, hotel_id=hotel_id)
+        )
+        return self._prepare_response({"success": True, "data": matrix})
+
     @http.route(
         "/api/hotel/gantt/data",
         auth="public",
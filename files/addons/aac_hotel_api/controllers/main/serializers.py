@@ -1,63 +1,67 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
 from datetime import datetime
 from odoo import fields, _
 from odoo.http import request
 from .utils import ADULT_AGE_THRESHOLD
 
+# Claves de _build_booking_data que requieren consultas adicionales;
+# solo se calculan si la proyección (fields=) las solicita.
+ROOM_CHANGE_KEYS = {
+    "has_room_change",
+    "is_room_change_origin",
+    "is_room_change_destination",
+    "connected_booking_id",
+    "connected_booking_sequence",
+    "connected_booking",
+    "split_from_booking_id",
+    "split_from_booking_sequence",
+    "original_booking",
+    "room_change_info",
+    "room_change_chain",
+    "chain_shared_order",
+    "show_sync_services_button",
+}
+
+
+def _wants(field_names, *keys):
+    """Indica si la proyección field_names incluye alguna de las claves"""
+    return field_names is None or any(key in field_names for key in keys)
+
 
 class HotelApiSerializers:
     """Mixin for serializing and deserializing Hotel API data"""
 
-    def _get_room_change_chain(self, booking):
+    def _get_room_change_chains(self, bookings):
+        """
+        Cadenas de cambio de habitación de todas las reservas, resueltas con una
+        sola consulta (hotel.booking._get_room_change_chains) y un solo control
+        de acceso sobre el conjunto de reservas encadenadas.
+        """
+        chains = bookings._get_room_change_chains()
+        member_ids = {
+            member_id for chain in chains.values() for member_id in chain.ids
+        }
+        members = self._ensure_access(bookings.browse(list(member_ids)), "read")
+        # Precargar las habitaciones de todas las reservas de las cadenas
+        members.booking_line_ids.product_id.mapped("name")
+        return {
+            booking_id: chain.with_env(members.env)
+            for booking_id, chain in chains.items()
+        }
+
+    def _get_room_change_chain(self, booking, chain=None):
         """
         Rastrea toda la cadena de cambios de habitación para una reserva.
         IMPORTANTE: Devuelve la cadena COMPLETA independientemente de qué reserva se consulte.
+        chain: cadena ya resuelta por _get_room_change_chains (se calcula si falta).
         """
-        # Verificar acceso a la reserva
-        booking_checked = self._ensure_access(booking, "read")
-        visited = set()
-        all_bookings = []
-
-        def traverse_chain(current_booking):
-            """Función recursiva para recorrer la cadena en ambas direcciones"""
-            if not current_booking or current_booking.id in visited:
-                return
-            
-            visited.add(current_booking.id)
-            all_bookings.append(current_booking)
-            
-            # Ir hacia ATRÁS (split_from_booking_id = reserva origen/anterior)
-            if (
-                hasattr(current_booking, "split_from_booking_id")
-                and current_booking.split_from_booking_id
-            ):
-                prev_booking = self._ensure_access(current_booking.split_from_booking_id, "read")
-                traverse_chain(prev_booking)
-            
-            # Ir hacia ADELANTE (connected_booking_id = reserva destino/siguiente)
-            if (
-                hasattr(current_booking, "connected_booking_id")
-                and current_booking.connected_booking_id
-            ):
-                next_booking = self._ensure_access(current_booking.connected_booking_id, "read")
-                traverse_chain(next_booking)
-            
-            # También buscar reservas que tengan a esta como split_from_booking_id
-            # (por si connected_booking_id no está seteado correctamente)
-            self._check_access_rights("hotel.booking", "read")
-            next_bookings = request.env["hotel.booking"].search(
-                [("split_from_booking_id", "=", current_booking.id)]
-            )
-            if next_bookings:
-                self._check_access_rule(next_bookings, "read")
-                for next_b in next_bookings:
-                    traverse_chain(next_b)
+        if chain is None:
+            booking = self._ensure_access(booking, "read")
+            chain = self._get_room_change_chains(booking).get(booking.id, booking)
 
-        # Iniciar el recorrido desde la reserva actual
-        traverse_chain(booking_checked)
-
-        # Ordenar por check_in para tener orden cronológico
-        chain = sorted(all_bookings, key=lambda b: b.check_in)
+        # La cadena ya viene en orden cronológico (check_in)
+        chain = list(chain)
 
         # Encontrar la posición de la reserva actual en la cadena
         current_position = None
@@ -74,11 +78,10 @@ class HotelApiSerializers:
         }
 
     def _build_room_info_from_booking(self, booking):
-        """Construir información de habitaciones de una reserva"""
-        booking_checked = self._ensure_access(booking, "read")
+        """Construir información de habitaciones de una reserva (con permisos ya verificados)"""
         rooms = []
-        if booking_checked and booking_checked.booking_line_ids:
-            for line in booking_checked.booking_line_ids:
+        if booking and booking.booking_line_ids:
+            for line in booking.booking_line_ids:
                 if line.product_id:
                     rooms.append(
                         {
@@ -95,9 +98,109 @@ class HotelApiSerializers:
                     )
         return rooms
 
-    def _build_booking_data(self, booking):
-        """Construir datos de respuesta de reserva de forma optimizada"""
-        booking_checked = self._ensure_access(booking, "read")
+    def _build_booking_data(self, booking, field_names=None):
+        """Construir datos de respuesta de una reserva (ver _build_bookings_data)"""
+        bookings_data = self._build_bookings_data(booking, field_names=field_names)
+        return bookings_data[0] if bookings_data else {}
+
+    def _build_bookings_data(self, bookings, field_names=None):
+        """
+        Construir datos de respuesta de un conjunto de reservas.
+        Los permisos se verifican una sola vez para todo el recordset y las
+        relaciones (many2one, órdenes de venta, líneas) se precargan con una
+        lectura por modelo, así el número de consultas no crece con la
+        cantidad de reservas.
+        field_names: conjunto de claves a devolver (None = todas); las secciones
+        costosas (órdenes, cadena de cambios, habitaciones, documentos) solo se
+        calculan si alguna de sus claves fue solicitada.
+        """
+        if not bookings:
+            return []
+        bookings = self._ensure_access(bookings, "read")
+
+        self._prefetch_booking_relations(bookings, field_names)
+        orders_by_booking = {}
+        if _wants(field_names, "sale_orders"):
+            orders_by_booking = self._get_sale_orders_by_booking(bookings)
+        chains = {}
+        if _wants(field_names, *ROOM_CHANGE_KEYS):
+            chains = self._get_room_change_chains(bookings)
+
+        return [
+            self._assemble_booking_data(
+                booking,
+                field_names,
+                orders_by_booking.get(booking.id, []),
+                chains.get(booking.id, booking),
+            )
+            for booking in bookings
+        ]
+
+    def _prefetch_booking_relations(self, bookings, field_names=None):
+        """Precargar en bloque los registros relacionados que usa el serializador"""
+        # Una lectura por modelo para los many2one de todas las reservas
+        (bookings.partner_id | bookings.agent_id).mapped("name")
+        bookings.hotel_id.mapped("name")
+        bookings.user_id.mapped("name")
+        bookings.pricelist_id.mapped("name")
+        bookings.company_id.mapped("name")
+        (bookings.currency_id | bookings.order_id.currency_id).mapped("symbol")
+        bookings.order_id.mapped("amount_total")
+
+        extension_products = bookings.env["product.product"]
+        for field in ["early_checkin_product_id", "late_checkout_product_id"]:
+            if field in bookings._fields:
+                extension_products |= bookings.mapped(field)
+        extension_products.mapped("name")
+
+        if _wants(
+            field_names,
+            "rooms",
+            "booking_line_sequence_ids",
+            "show_sync_services_button",
+        ):
+            lines = bookings.booking_line_ids
+            lines.product_id.mapped("name")
+            if _wants(field_names, "rooms"):
+                lines.guest_info_ids.mapped("name")
+                lines.currency_id.mapped("symbol")
+
+    def _get_sale_orders_by_booking(self, bookings):
+        """Órdenes de venta de las reservas agrupadas por booking_id"""
+        # Verificar permisos antes de buscar órdenes de venta
+        self._check_access_rights("sale.order", "read")
+        orders = request.env["sale.order"].search_read(
+            [("booking_id", "in", bookings.ids)],
+            ["booking_id", "name", "state", "amount_total", "currency_id"],
+        )
+        currency_ids = {order["currency_id"][0] for order in orders if order["currency_id"]}
+        currency_symbols = {
+            currency["id"]: currency["symbol"]
+            for currency in request.env["res.currency"]
+            .browse(list(currency_ids))
+            .read(["symbol"])
+        }
+
+        orders_by_booking = defaultdict(list)
+        for order in orders:
+            currency_id = order["currency_id"][0] if order["currency_id"] else None
+            orders_by_booking[order["booking_id"][0]].append(
+                {
+                    "id": order["id"],
+                    "name": order["name"],
+                    "state": order["state"],
+                    "amount_total": order["amount_total"],
+                    "currency_id": currency_id,
+                    "currency_symbol": currency_symbols.get(currency_id),
+                }
+            )
+        return orders_by_booking
+
+    def _assemble_booking_data(self, booking, field_names, sale_orders, chain):
+        """Armar el diccionario de una reserva con permisos ya verificados"""
+
+        def wants(*keys):
+            return _wants(field_names, *keys)
 
         # Calcular información de horas para reservas por horas
         check_in_hour = None
@@ -213,26 +316,8 @@ class HotelApiSerializers:
                 }
             )
 
-        # Verificar permisos antes de buscar órdenes de venta
-        self._check_access_rights("sale.order", "read")
-        related_orders = request.env["sale.order"].search(
-            [("booking_id", "=", booking.id)]
-        )
-        self._check_access_rule(related_orders, "read")
-
-        booking_data["sale_orders"] = [
-            {
-                "id": order.id,
-                "name": order.name,
-                "state": order.state,
-                "amount_total": order.amount_total,
-                "currency_id": order.currency_id.id if order.currency_id else None,
-                "currency_symbol": (
-                    order.currency_id.symbol if order.currency_id else None
-                ),
-            }
-            for order in related_orders
-        ]
+        if wants("sale_orders"):
+            booking_data["sale_orders"] = sale_orders
 
         # Campos de la extensión
         extension_fields = [
@@ -272,15 +357,49 @@ class HotelApiSerializers:
                 booking.late_checkout_product_id.name
             )
 
+        if wants(*ROOM_CHANGE_KEYS):
+            self._build_room_change_data(booking, booking_data, chain)
+
+        if wants("rooms"):
+            booking_data["rooms"] = self._build_room_lines(booking.booking_line_ids)
+        if wants("documents"):
+            booking_data["documents"] = self._build_documents_data(booking.docs_ids)
+
+        if wants("booking_line_sequence_ids"):
+            booking_data["booking_line_sequence_ids"] = [
+                line.booking_sequence_id
+                for line in booking.booking_line_ids
+                if line.booking_sequence_id
+            ]
+
+        if wants("show_sync_services_button"):
+            has_room_change = booking_data.get("has_room_change", False)
+            is_multiple_booking = len(booking.booking_line_ids) > 1
+            booking_data["show_sync_services_button"] = (
+                has_room_change or is_multiple_booking
+            )
+
+        if field_names is not None:
+            booking_data = {
+                key: value
+                for key, value in booking_data.items()
+                if key == "id" or key in field_names
+            }
+
+        return booking_data
+
+    def _build_room_change_data(self, booking, booking_data, chain=None):
+        """Agregar a booking_data la información de la cadena de cambios de habitación"""
         # Información de cambio de habitación
         is_room_change_origin = False
         is_room_change_destination = False
         connected_booking_id = None
         split_from_booking_id = None
 
-        current_rooms = self._build_room_info_from_booking(booking_checked)
-        change_chain = self._get_room_change_chain(booking_checked)
+        current_rooms = self._build_room_info_from_booking(booking)
+        change_chain = self._get_room_change_chain(booking, chain)
         chain = change_chain["chain"]
+        chain_by_id = {chain_booking.id: chain_booking for chain_booking in chain}
         current_position = change_chain["current_position"]
         total_changes = change_chain["total_changes"]
 
@@ -300,17 +419,17 @@ class HotelApiSerializers:
             )
 
             if (
-                hasattr(booking_checked, "connected_booking_id")
-                and booking_checked.connected_booking_id
+                hasattr(booking, "connected_booking_id")
+                and booking.connected_booking_id
             ):
-                connected_booking_id = booking_checked.connected_booking_id.id
+                connected_booking_id = booking.connected_booking_id.id
                 booking_data["connected_booking_id"] = connected_booking_id
                 booking_data["connected_booking_sequence"] = (
-                    booking_checked.connected_booking_id.sequence_id
-                )
-                connected_booking = self._ensure_access(
-                    booking_checked.connected_booking_id, "read"
+                    booking.connected_booking_id.sequence_id
                 )
+                connected_booking = chain_by_id.get(
+                    connected_booking_id
+                ) or self._ensure_access(booking.connected_booking_id, "read")
                 booking_data["connected_booking"] = {
                     "id": connected_booking.id,
                     "sequence_id": connected_booking.sequence_id,
@@ -326,17 +445,17 @@ class HotelApiSerializers:
                 }
 
             if (
-                hasattr(booking_checked, "split_from_booking_id")
-                and booking_checked.split_from_booking_id
+                hasattr(booking, "split_from_booking_id")
+                and booking.split_from_booking_id
             ):
-                split_from_booking_id = booking_checked.split_from_booking_id.id
+                split_from_booking_id = booking.split_from_booking_id.id
                 booking_data["split_from_booking_id"] = split_from_booking_id
                 booking_data["split_from_booking_sequence"] = (
-                    booking_checked.split_from_booking_id.sequence_id
-                )
-                original_booking_obj = self._ensure_access(
-                    booking_checked.split_from_booking_id, "read"
+                    booking.split_from_booking_id.sequence_id
                 )
+                original_booking_obj = chain_by_id.get(
+                    split_from_booking_id
+                ) or self._ensure_access(booking.split_from_booking_id, "read")
                 booking_data["original_booking"] = {
                     "id": original_booking_obj.id,
                     "sequence_id": original_booking_obj.sequence_id,
@@ -443,23 +562,6 @@ class HotelApiSerializers:
             booking_data["room_change_chain"] = []
             booking_data["chain_shared_order"] = None
 
-        booking_data["rooms"] = self._build_room_lines(booking.booking_line_ids)
-        booking_data["documents"] = self._build_documents_data(booking.docs_ids)
-
-        booking_data["booking_line_sequence_ids"] = [
-            line.booking_sequence_id
-            for line in booking.booking_line_ids
-            if line.booking_sequence_id
-        ]
-
-        has_room_change = booking_data.get("has_room_change", False)
-        is_multiple_booking = len(booking.booking_line_ids) > 1
-        booking_data["show_sync_services_button"] = (
-            has_room_change or is_multiple_booking
-        )
-
-        return booking_data
-
     def _build_room_lines(self, booking_lines):
         room_lines = []
         for line in booking_lines:
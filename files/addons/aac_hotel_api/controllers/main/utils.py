@@ -9,6 +9,8 @@ from odoo.http import request, Response
 from odoo.tools import json_default
 from odoo.exceptions import ValidationError, AccessError, UserError, MissingError
 from ..api_auth import validate_api_key
+from ..instrumentation import instrument_endpoint
+from odoo.addons.hotel_management_system.tools.metrics import metrics
 
 _logger = logging.getLogger(__name__)
 
@@ -43,6 +45,14 @@ VALID_GENDERS = ["male", "female", "other"]
 
 VALID_COMMISSION_TYPES = ["fixed", "percentage"]
 
+# Paginación por cursor (keyset)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+KEYSET_ORDERS = {
+    "id": "id desc",
+    "write_date": "write_date asc, id asc",
+}
+
 STATUS_TRANSITIONS = {
     "initial": ["confirmed", "cancelled"],
     "draft": ["confirmed", "cancelled"],
@@ -60,18 +70,21 @@ STATUS_TRANSITIONS = {
 
 
 def handle_api_errors(func):
-    """Decorador para manejo centralizado de errores en endpoints"""
+    """Decorador para manejo centralizado de errores en endpoints (instrumentado)"""
 
     @wraps(func)
     def wrapper(self, *args, **kwargs):
+        route = f"{type(self).__name__}.{func.__name__}"
         try:
             return func(self, *args, **kwargs)
         except ValueError as e:
+            metrics.inc("hotel_api_errors", route=route, kind="validation")
             _logger.warning("Error de validación en %s: %s", func.__name__, str(e))
             return self._prepare_response(
                 {"success": False, "error": str(e)}, status=400
             )
         except (AccessError, MissingError) as e:
+            metrics.inc("hotel_api_errors", route=route, kind="access")
             _logger.warning("Error de acceso en %s: %s", func.__name__, str(e))
             return self._prepare_response(
                 {
@@ -81,17 +94,19 @@ def handle_api_errors(func):
                 status=403,
             )
         except UserError as e:
+            metrics.inc("hotel_api_errors", route=route, kind="user")
             _logger.warning("Error de usuario en %s: %s", func.__name__, str(e))
             return self._prepare_response(
                 {"success": False, "error": str(e)}, status=400
             )
         except Exception as e:
+            metrics.inc("hotel_api_errors", route=route, kind="internal")
             _logger.exception("Error inesperado en %s: %s", func.__name__, str(e))
             return self._prepare_response(
                 {"success": False, "error": "Error interno del servidor"}, status=500
             )
 
-    return wrapper
+    return instrument_endpoint(wrapper)
 
 
 class HotelApiUtils:
@@ -261,6 +276,91 @@ class HotelApiUtils:
             else:
                 return {}
 
+    def _pop_pagination_params(self, params):
+        """
+        Extraer limit/cursor/order de los parámetros (no son filtros de dominio).
+        Devuelve None si la petición no solicita paginación.
+        """
+        limit = params.pop("limit", None)
+        cursor = params.pop("cursor", None)
+        order = params.pop("order", None) or "id"
+
+        if order not in KEYSET_ORDERS:
+            raise ValueError(
+                f'Orden inválido: {order}. Órdenes válidos: {", ".join(KEYSET_ORDERS)}'
+            )
+        if limit is None and cursor is None:
+            return None
+
+        try:
+            limit = int(limit) if limit else DEFAULT_PAGE_SIZE
+        except (ValueError, TypeError):
+            raise ValueError("El limit debe ser un número entero válido")
+        if limit < 1:
+            raise ValueError("El limit debe ser mayor a 0")
+
+        return {
+            "limit": min(limit, MAX_PAGE_SIZE),
+            "order": order,
+            "after": self._decode_cursor(cursor, order) if cursor else None,
+        }
+
+    def _pop_fields_param(self, params):
+        """Extraer la proyección fields=a,b,c (None = todos los campos)"""
+        fields_param = params.pop("fields", None)
+        if not fields_param:
+            return None
+        return {name.strip() for name in fields_param.split(",") if name.strip()}
+
+    def _keyset_domain(self, pagination):
+        """Dominio que continúa después del último registro de la página anterior"""
+        after = pagination["after"]
+        if not after:
+            return []
+        if pagination["order"] == "id":
+            return [("id", "<", after["id"])]
+        return [
+            "|",
+            ("write_date", ">", after["write_date"]),
+            "&",
+            ("write_date", "=", after["write_date"]),
+            ("id", ">", after["id"]),
+        ]
+
+    def _search_page(self, model, domain, pagination):
+        """Buscar una página por keyset; devuelve (registros, next_cursor)"""
+        records = model.search(
+            domain + self._keyset_domain(pagination),
+            order=KEYSET_ORDERS[pagination["order"]],
+            limit=pagination["limit"] + 1,
+        )
+        if len(records) <= pagination["limit"]:
+            return records, None
+        records = records[: pagination["limit"]]
+        return records, self._encode_cursor(records[-1], pagination["order"])
+
+    def _encode_cursor(self, record, order):
+        payload = {"o": order, "id": record.id}
+        if order == "write_date":
+            # Valor exacto con microsegundos: to_string los trunca y la página
+            # siguiente repetiría las filas escritas en el mismo segundo
+            payload["w"] = record.write_date.isoformat()
+        return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode(
+            "ascii"
+        )
+
+    def _decode_cursor(self, cursor, order):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            after = {"id": int(payload["id"])}
+            if order == "write_date":
+                after["write_date"] = datetime.fromisoformat(payload["w"])
+        except Exception:
+            raise ValueError("Cursor inválido")
+        if payload.get("o") != order:
+            raise ValueError("El cursor no corresponde al orden solicitado")
+        return after
+
     def _parse_datetime(self, date_str, field_name="fecha"):
         """Parsear string a datetime con manejo de errores mejorado"""
         if not date_str:
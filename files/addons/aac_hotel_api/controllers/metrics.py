@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Exportador de métricas en formato OpenMetrics (Prometheus).
+
+GET /api/hotel/metrics publica los contadores e histogramas del registro
+compartido de hotel_management_system (sumados entre todos los workers):
+latencia, peticiones, consultas SQL y errores por endpoint, aciertos y
+fallos de los cachés del hotel y duración de los crons; más un gauge con
+las reservas por estado calculado al momento del scrape. Solo se publican
+las muestras de la base de datos de la petición (etiqueta db).
+"""
+from collections import defaultdict
+
+from odoo import http
+from odoo.http import request, Response
+from odoo.addons.hotel_management_system.tools.metrics import (
+    LATENCY_BUCKETS,
+    METRIC_FAMILIES,
+    metrics,
+)
+
+from .api_auth import validate_api_key
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_sample(name, labels, value):
+    label_text = ','.join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}'
+
+
+def _render_histogram(family, samples):
+    lines = []
+    # Los buckets sin observaciones no se guardan: se completan con 0
+    series = defaultdict(dict)
+    for labels, value in samples.get(f'{family}_bucket', []):
+        key = tuple(sorted((k, v) for k, v in labels.items() if k != 'le'))
+        series[key][labels['le']] = value
+    totals = {
+        suffix: {tuple(sorted(labels.items())): value for labels, value in samples.get(f'{family}_{suffix}', [])}
+        for suffix in ('count', 'sum')
+    }
+    for key in sorted(series):
+        for bound in [str(bound) for bound in LATENCY_BUCKETS] + ['+Inf']:
+            labels = dict(key, le=bound)
+            lines.append(_format_sample(f'{family}_bucket', labels, series[key].get(bound, 0)))
+        for suffix in ('count', 'sum'):
+            lines.append(_format_sample(f'{family}_{suffix}', dict(key), totals[suffix].get(key, 0)))
+    return lines
+
+
+class HotelMetricsController(http.Controller):
+
+    def _get_booking_state_counts(self):
+        """Reservas por estado, en una sola consulta agrupada"""
+        groups = request.env['hotel.booking'].sudo().read_group(
+            [], ['status_bar'], ['status_bar'], lazy=False
+        )
+        return [(group['status_bar'] or 'none', group['__count']) for group in groups]
+
+    def _render_metrics(self):
+        samples = metrics.collect(db=request.env.cr.dbname)
+        lines = []
+        for family, (kind, help_text) in METRIC_FAMILIES.items():
+            lines.append(f'# TYPE {family} {kind}')
+            lines.append(f'# HELP {family} {help_text}')
+            if kind == 'histogram':
+                lines.extend(_render_histogram(family, samples))
+            else:
+                for labels, value in samples.get(f'{family}_total', []):
+                    lines.append(_format_sample(f'{family}_total', labels, value))
+
+        lines.append('# TYPE hotel_bookings gauge')
+        lines.append('# HELP hotel_bookings Bookings per state')
+        for state, count in self._get_booking_state_counts():
+            lines.append(_format_sample('hotel_bookings', {'state': state}, count))
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    @http.route('/api/hotel/metrics', type='http', auth='public', methods=['GET'], csrf=False)
+    @validate_api_key
+    def get_metrics(self, **kwargs):
+        """Métricas del hotel en formato OpenMetrics para Prometheus"""
+        return Response(self._render_metrics(), status=200, content_type=OPENMETRICS_CONTENT_TYPE)
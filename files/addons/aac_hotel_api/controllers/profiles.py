@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Listado de las peticiones perfiladas bajo demanda (ver profiling.py).
+"""
+import json
+
+from odoo import http
+from odoo.http import request, Response
+from odoo.tools import json_default
+
+from .api_auth import validate_api_key
+
+PROFILE_LIST_LIMIT = 50
+MAX_PROFILE_LIST_LIMIT = 200
+
+
+class HotelProfilesController(http.Controller):
+
+    def _prepare_response(self, data, status=200):
+        """Preparar respuesta HTTP con formato JSON"""
+        return Response(
+            json.dumps(data, default=json_default),
+            status=status,
+            content_type='application/json',
+        )
+
+    @http.route('/api/hotel/profiles', type='http', auth='public', methods=['GET'], csrf=False)
+    @validate_api_key
+    def list_profiles(self, route=None, limit=None, **kwargs):
+        """
+        Perfiles de peticiones del hotel, del más reciente al más antiguo.
+
+        Parámetros: route (filtra por ruta, ilike) y limit.
+        Cada perfil se abre en speedscope (flame graph) desde speedscope_url.
+        """
+        if not request.env.user._is_system():
+            return self._prepare_response({
+                'success': False,
+                'error': 'Solo los administradores pueden consultar los perfiles'
+            }, status=403)
+        try:
+            limit = min(int(limit or PROFILE_LIST_LIMIT), MAX_PROFILE_LIST_LIMIT)
+        except ValueError:
+            return self._prepare_response({
+                'success': False,
+                'error': 'limit debe ser un número entero'
+            }, status=400)
+
+        domain = [('hotel_route', '!=', False)]
+        if route:
+            domain.append(('hotel_route', 'ilike', route))
+        profiles = request.env['ir.profile'].sudo().search_read(
+            domain,
+            ['name', 'hotel_route', 'hotel_user_id', 'create_date', 'duration', 'sql_count', 'entry_count'],
+            limit=limit,
+            order='id desc',
+        )
+        for profile in profiles:
+            profile['speedscope_url'] = f"/web/speedscope/{profile['id']}"
+        return self._prepare_response({
+            'success': True,
+            'data': profiles,
+            'count': len(profiles),
+        })
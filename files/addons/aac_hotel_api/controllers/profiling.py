@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Perfilado bajo demanda de los endpoints del hotel.
+
+Solo para administradores (base.group_system) y solo si se pide: con la
+cabecera X-Hotel-Profile: 1 o con el indicador hotel_profile_requests del
+usuario. La petición se ejecuta bajo el Profiler de Odoo con los colectores
+'sql' (consultas con su traza) y 'traces_async' (muestreo de pilas de
+Python, exportable a speedscope como flame graph). El resultado queda en un
+registro ir.profile con la ruta en hotel_route, y su id se devuelve en la
+cabecera X-Hotel-Profile-Id. Se listan en GET /api/hotel/profiles.
+
+Las rutas con sesión (/hotel/...) se perfilan desde ir.http._dispatch; las
+rutas con API key desde validate_api_key, que es donde se conoce el usuario.
+"""
+import logging
+
+from odoo.http import request
+from odoo.tools.profiler import Profiler
+from werkzeug.wrappers import Response as WerkzeugResponse
+
+_logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Hotel-Profile'
+PROFILE_ID_HEADER = 'X-Hotel-Profile-Id'
+PROFILE_SESSION = 'hotel_endpoints'
+PROFILE_COLLECTORS = ['sql', 'traces_async']
+# Prefijos de las rutas que se pueden perfilar
+PROFILE_PATH_PREFIXES = ('/hotel/', '/api/')
+
+
+def should_profile():
+    """Si la petición actual debe ejecutarse bajo el profiler"""
+    if getattr(request, '_hotel_profiling', False):
+        return False
+    if not request.httprequest.path.startswith(PROFILE_PATH_PREFIXES):
+        return False
+    user = request.env.user
+    if not user or not user._is_system():
+        return False
+    header = request.httprequest.headers.get(PROFILE_HEADER, '')
+    return header.lower() in ('1', 'true', 'yes') or user.sudo().hotel_profile_requests
+
+
+def run_profiled(call):
+    """Ejecutar call() bajo el profiler y enlazar el ir.profile con la ruta"""
+    request._hotel_profiling = True
+    path = request.httprequest.path
+    profiler = Profiler(
+        db=request.env.cr.dbname,
+        collectors=PROFILE_COLLECTORS,
+        description=f'{request.httprequest.method} {path}',
+        profile_session=PROFILE_SESSION,
+    )
+    with profiler:
+        response = call()
+
+    profile_id = getattr(profiler, 'profile_id', None)
+    if not profile_id:
+        return response
+    request.env['ir.profile'].sudo().browse(profile_id).write({
+        'hotel_route': path,
+        'hotel_user_id': request.env.uid,
+    })
+    target = response if isinstance(response, WerkzeugResponse) else request.future_response
+    target.headers[PROFILE_ID_HEADER] = str(profile_id)
+    _logger.info("Petición %s perfilada en ir.profile %s", path, profile_id)
+    return response
@@ -1,3 +1,10 @@
 # -*- coding: utf-8 -*-
 
-from . import api_response
\ No newline at end of file
+from . import api_response
+from . import base
+from . import res_users_apikeys
+from . import batch_reservation
+from . import api_job
+from . import ir_http
+from . import ir_profile
+from . import res_users
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Trabajos asíncronos de la API.
+
+Un lote grande de /api/hotel/reservas/batch?async=true se guarda como un
+hotel.api.job y se responde de inmediato con su id. El cron
+ir_cron_process_api_jobs procesa los trabajos por tramos de
+JOB_CHUNK_SIZE segmentos: cada tramo corre en un savepoint y se confirma
+por separado, así el progreso es visible en /api/hotel/jobs/<id> y ningún
+worker web queda ocupado con el lote.
+"""
+import json
+import logging
+import time
+
+from odoo import models, fields, api, _
+from odoo.tools import json_default
+from odoo.addons.hotel_management_system.tools.metrics import metrics
+
+_logger = logging.getLogger(__name__)
+
+# Segmentos creados por tramo (un savepoint y un commit por tramo)
+JOB_CHUNK_SIZE = 25
+# Segundos de trabajo por ejecución del cron antes de volver a programarse
+JOB_TIME_BUDGET = 60
+
+
+class HotelApiJob(models.Model):
+    _name = 'hotel.api.job'
+    _description = 'Trabajo Asíncrono de la API'
+    _order = 'id desc'
+
+    name = fields.Char('Referencia', required=True, default=lambda self: _('Lote de reservas'))
+    job_type = fields.Selection(
+        [('batch_reservation', 'Reservas en lote')],
+        string='Tipo',
+        required=True,
+        default='batch_reservation',
+    )
+    state = fields.Selection(
+        [
+            ('pending', 'Pendiente'),
+            ('running', 'En proceso'),
+            ('done', 'Completado'),
+            ('failed', 'Fallido'),
+        ],
+        string='Estado',
+        required=True,
+        default='pending',
+        index=True,
+    )
+    user_id = fields.Many2one('res.users', string='Solicitado por', index=True)
+    payload = fields.Text('Payload')
+    total = fields.Integer('Total de segmentos')
+    processed = fields.Integer('Segmentos procesados')
+    progress = fields.Float('Progreso (%)', compute='_compute_progress')
+    booking_ids = fields.Many2many('hotel.booking', string='Reservas creadas')
+    last_booking_id = fields.Many2one('hotel.booking', string='Última reserva creada')
+    result = fields.Text('Resultado')
+    error = fields.Text('Error')
+    started_at = fields.Datetime('Inicio')
+    finished_at = fields.Datetime('Fin')
+
+    @api.depends('total', 'processed')
+    def _compute_progress(self):
+        for job in self:
+            job.progress = round(100.0 * job.processed / job.total, 2) if job.total else 0.0
+
+    # ------------------------------------------------------------------
+    # Encolado
+    # ------------------------------------------------------------------
+
+    @api.model
+    def enqueue_batch_reservation(self, data):
+        """Validar el lote, guardarlo como trabajo y despertar al cron.
+
+        :raise ValidationError: si el payload es inválido
+        """
+        segments = self.env['hotel.batch.reservation'].validate_payload(data)
+        job = self.create({
+            'name': _('Lote de reservas (%s segmentos)') % len(segments),
+            'job_type': 'batch_reservation',
+            'user_id': self.env.uid,
+            'payload': json.dumps(data, default=json_default),
+            'total': len(segments),
+        })
+        self.env.ref('aac_hotel_api.ir_cron_process_api_jobs').sudo()._trigger()
+        return job
+
+    # ------------------------------------------------------------------
+    # Procesamiento
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Procesar tramos de los trabajos pendientes hasta agotar el tiempo"""
+        deadline = time.monotonic() + JOB_TIME_BUDGET
+        with metrics.timer('hotel_cron_duration_seconds', cron='api_jobs'):
+            while time.monotonic() < deadline:
+                job = self._acquire_next_job()
+                if not job:
+                    return
+                job._process_next_chunk()
+                self.env.cr.commit()
+        # Quedan trabajos: continuar en otra ejecución
+        if self.search_count([('state', 'in', ('pending', 'running'))], limit=1):
+            self.env.ref('aac_hotel_api.ir_cron_process_api_jobs')._trigger()
+
+    @api.model
+    def _acquire_next_job(self):
+        """Siguiente trabajo pendiente, bloqueado para este worker"""
+        self.flush_model(['state'])
+        self.env.cr.execute("""
+            SELECT id FROM hotel_api_job
+             WHERE state IN ('pending', 'running')
+          ORDER BY id
+             LIMIT 1
+               FOR UPDATE SKIP LOCKED
+        """)
+        row = self.env.cr.fetchone()
+        return self.browse(row[0]) if row else self.browse()
+
+    def _process_next_chunk(self):
+        """Crear el siguiente tramo de reservas del trabajo.
+
+        En el primer tramo se comprueba la disponibilidad de todo el lote;
+        cada tramo vuelve a comprobar la de sus propios segmentos porque el
+        bloqueo de habitaciones no sobrevive a los commits entre tramos. Si
+        un tramo falla el trabajo queda fallido con las reservas creadas
+        hasta entonces.
+        """
+        self.ensure_one()
+        Engine = self.env['hotel.batch.reservation'].sudo()
+        data = json.loads(self.payload)
+        vals = {}
+        if self.state == 'pending':
+            vals.update(state='running', started_at=fields.Datetime.now())
+        try:
+            with self.env.cr.savepoint():
+                segments = Engine.validate_payload(data)
+                check = segments if not self.processed else []
+                chunk = segments[self.processed:self.processed + JOB_CHUNK_SIZE]
+                Engine._lock_rooms({segment['room_id'] for segment in chunk})
+                conflicts = Engine.find_conflicts(check or chunk)
+                if conflicts:
+                    offset = 0 if check else self.processed
+                    for conflict in conflicts:
+                        conflict['segment'] += offset
+                    vals.update(
+                        state='failed',
+                        error=_('%s segmentos no están disponibles') % len(conflicts),
+                        result=json.dumps({'conflicts': conflicts}, default=json_default),
+                        finished_at=fields.Datetime.now(),
+                    )
+                else:
+                    bookings = Engine.create_reservations(
+                        data, chunk,
+                        first_index=self.processed,
+                        total=len(segments),
+                        previous=self.last_booking_id.sudo(),
+                    )
+                    vals.update(
+                        processed=self.processed + len(chunk),
+                        booking_ids=[(4, booking_id) for booking_id in bookings.ids],
+                        last_booking_id=bookings[-1:].id or self.last_booking_id.id,
+                    )
+                    if vals['processed'] >= len(segments):
+                        vals.update(state='done', finished_at=fields.Datetime.now())
+        except Exception as e:
+            _logger.error("Trabajo %s fallido: %s", self.id, e, exc_info=True)
+            vals.update(state='failed', error=str(e), finished_at=fields.Datetime.now())
+        self.write(vals)
+        if vals.get('state') in ('done', 'failed'):
+            _logger.info(
+                "Trabajo %s %s: %s/%s segmentos", self.id, self.state, self.processed, self.total
+            )
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+import threading
+
+from odoo import models
+
+from ..controllers.instrumentation import ORM_MISSES_ATTR
+
+
+class Base(models.AbstractModel):
+    _inherit = 'base'
+
+    def _fetch_field(self, field):
+        """Contar los fallos del caché del ORM de las peticiones instrumentadas"""
+        thread = threading.current_thread()
+        if hasattr(thread, ORM_MISSES_ATTR):
+            setattr(thread, ORM_MISSES_ATTR, getattr(thread, ORM_MISSES_ATTR) + 1)
+        return super()._fetch_field(field)
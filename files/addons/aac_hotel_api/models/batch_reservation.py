@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de creación masiva de reservas para /api/hotel/reservas/batch.
+
+Todos los segmentos se validan antes de escribir nada: la disponibilidad de
+todas las habitaciones se comprueba con una sola consulta y, si algún
+segmento choca con una reserva existente o con otro segmento del mismo
+lote, se devuelve la lista de conflictos sin crear reservas. Si no hay
+conflictos, las reservas se crean con un único create(vals_list) y la
+cadena split_from_booking_id/connected_booking_id se enlaza con un único
+UPDATE.
+"""
+import logging
+from datetime import datetime
+
+from odoo import models, api, _
+from odoo.exceptions import ValidationError
+
+_logger = logging.getLogger(__name__)
+
+DATETIME_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M',
+]
+
+BATCH_REQUIRED_FIELDS = ['partner_id', 'user_id', 'hotel_id', 'segments']
+
+
+class HotelBatchReservation(models.AbstractModel):
+    _name = 'hotel.batch.reservation'
+    _description = 'Motor de Reservas en Lote'
+
+    # ------------------------------------------------------------------
+    # Validación
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _parse_datetime(self, value):
+        """Parsea string a datetime con múltiples formatos"""
+        if isinstance(value, str):
+            for fmt in DATETIME_FORMATS:
+                try:
+                    return datetime.strptime(value, fmt)
+                except ValueError:
+                    continue
+        raise ValueError(f"Could not parse datetime: {value}")
+
+    @api.model
+    def validate_payload(self, data):
+        """Validar el payload y normalizar sus segmentos.
+
+        :return: lista de segmentos con room_id entero y fechas como datetime
+        :raise ValidationError: con el detalle de cada segmento inválido
+        """
+        for field in BATCH_REQUIRED_FIELDS:
+            if field not in data:
+                raise ValidationError(_('Missing required field: %s') % field)
+        if not isinstance(data['segments'], list) or not data['segments']:
+            raise ValidationError(_('segments must be a non-empty array'))
+
+        segments = []
+        errors = []
+        for index, segment in enumerate(data['segments']):
+            try:
+                check_in = self._parse_datetime(segment['check_in'])
+                check_out = self._parse_datetime(segment['check_out'])
+                room_id = int(segment['room_id'])
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append(f"segment {index}: {e}")
+                continue
+            if check_out <= check_in:
+                errors.append(f"segment {index}: check_out must be after check_in")
+                continue
+            segments.append(dict(segment, room_id=room_id, check_in=check_in, check_out=check_out))
+        if errors:
+            raise ValidationError('; '.join(errors))
+        return segments
+
+    @api.model
+    def _lock_rooms(self, room_ids):
+        """Bloquear las habitaciones hasta el fin de la transacción para que
+        dos lotes concurrentes no reserven la misma habitación"""
+        self.env.cr.execute(
+            "SELECT id FROM product_product WHERE id IN %s ORDER BY id FOR NO KEY UPDATE",
+            [tuple(room_ids)],
+        )
+
+    @api.model
+    def find_conflicts(self, segments):
+        """Conflictos de cada segmento, sin crear nada.
+
+        Un segmento choca si su habitación está ocupada por una reserva
+        existente en sus fechas o si se solapa con otro segmento del lote en
+        la misma habitación.
+
+        :return: lista de {'segment': índice, 'room_id', 'check_in',
+            'check_out', 'bookings': [...], 'segments': [...]}
+        """
+        Availability = self.env['hotel.room.availability']
+        booking_conflicts = Availability.get_room_conflicts([
+            (segment['room_id'], segment['check_in'], segment['check_out'])
+            for segment in segments
+        ])
+
+        # Solapes dentro del mismo lote, por habitación
+        windows = [
+            Availability._get_availability_window(segment['check_in'], segment['check_out'])
+            for segment in segments
+        ]
+        by_room = {}
+        for index, segment in enumerate(segments):
+            by_room.setdefault(segment['room_id'], []).append(index)
+        segment_conflicts = {}
+        for indexes in by_room.values():
+            indexes.sort(key=lambda index: windows[index][0])
+            for position, index in enumerate(indexes):
+                for other in indexes[position + 1:]:
+                    if windows[other][0] >= windows[index][1]:
+                        break
+                    segment_conflicts.setdefault(index, []).append(other)
+                    segment_conflicts.setdefault(other, []).append(index)
+
+        return [
+            {
+                'segment': index,
+                'room_id': segment['room_id'],
+                'check_in': segment['check_in'],
+                'check_out': segment['check_out'],
+                'bookings': booking_conflicts.get(index, []),
+                'segments': sorted(segment_conflicts.get(index, [])),
+            }
+            for index, segment in enumerate(segments)
+            if index in booking_conflicts or index in segment_conflicts
+        ]
+
+    # ------------------------------------------------------------------
+    # Creación
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _prepare_guest_commands(self, guests_data, partner):
+        """Comandos para guest_info_ids (huésped por defecto si no hay)"""
+        commands = []
+        for guest in guests_data or []:
+            guest_vals = {
+                'name': guest.get('name', 'Guest'),
+                'age': guest.get('age', 30),
+                'gender': guest.get('gender', 'other'),
+            }
+            if guest.get('partner_id'):
+                guest_vals['partner_id'] = guest['partner_id']
+            commands.append((0, 0, guest_vals))
+        if not commands:
+            commands.append((0, 0, {
+                'name': partner.name or 'Huésped',
+                'age': 30,
+                'gender': 'other',
+                'partner_id': partner.id,
+            }))
+        return commands
+
+    @api.model
+    def _prepare_booking_vals_list(self, data, segments, first_index=0, total=None):
+        """Valores de las reservas de los segmentos.
+
+        first_index y total sitúan los segmentos dentro del lote completo
+        cuando se crean por tramos (modo asíncrono).
+        """
+        partner = self.env['res.partner'].browse(data['partner_id'])
+        last = (total or len(segments)) - 1
+        return [
+            {
+                'partner_id': data['partner_id'],
+                'user_id': data['user_id'],
+                'hotel_id': data['hotel_id'],
+                'check_in': segment['check_in'],  # Datetime naive → Sin conversión UTC
+                'check_out': segment['check_out'],
+                'motivo_viaje': data.get('motivo_viaje', ''),
+                'status_bar': 'initial',
+                # Todos salvo el último apuntan al siguiente; todos salvo el primero vienen del anterior
+                'is_room_change_origin': index < last or not index,
+                'is_room_change_destination': index > 0,
+                'booking_line_ids': [(0, 0, {
+                    'product_id': segment['room_id'],
+                    'guest_info_ids': self._prepare_guest_commands(segment.get('guests'), partner),
+                })],
+            }
+            for index, segment in enumerate(segments, start=first_index)
+        ]
+
+    @api.model
+    def _link_booking_chain(self, bookings, previous=None):
+        """Enlazar las reservas (en orden) con un único UPDATE.
+
+        Cada reserva apunta a la anterior por split_from_booking_id y a la
+        siguiente por connected_booking_id. Luego se invalidan los campos y
+        se marcan como modificados para recalcular chain_root_id y
+        has_room_change, y se refresca el estado de las habitaciones.
+
+        :param previous: última reserva ya creada del lote (modo por tramos),
+            la cadena continúa desde ella
+        """
+        bookings = (previous or self.env['hotel.booking']) | bookings
+        if len(bookings) < 2:
+            return
+        ids = bookings.ids
+        link_fields = ['split_from_booking_id', 'connected_booking_id']
+        bookings.flush_recordset(link_fields)
+        self.env.cr.execute("""
+            UPDATE hotel_booking booking
+               SET split_from_booking_id = COALESCE(link.previous_id, booking.split_from_booking_id),
+                   connected_booking_id = link.next_id
+              FROM unnest(%(ids)s::int[], %(previous)s::int[], %(next)s::int[])
+                   AS link(booking_id, previous_id, next_id)
+             WHERE booking.id = link.booking_id
+        """, {
+            'ids': ids,
+            'previous': [None] + ids[:-1],
+            'next': ids[1:] + [None],
+        })
+        bookings.invalidate_recordset(link_fields)
+        bookings.modified(link_fields)
+        self.env['hotel.room.state']._refresh_rooms(bookings._get_room_state_room_ids())
+
+    @api.model
+    def create_reservations(self, data, segments, first_index=0, total=None, previous=None):
+        """Crear y enlazar las reservas de los segmentos ya validados"""
+        bookings = self.env['hotel.booking'].create(
+            self._prepare_booking_vals_list(data, segments, first_index, total)
+        )
+        self._link_booking_chain(bookings, previous)
+        return bookings
+
+    @api.model
+    def process(self, data):
+        """Validar, comprobar disponibilidad y crear el lote completo.
+
+        :return: dict de resultado; con 'conflicts' y success=False si algún
+            segmento choca (en ese caso no se crea ninguna reserva)
+        :raise ValidationError: si el payload es inválido
+        """
+        segments = self.validate_payload(data)
+        self._lock_rooms({segment['room_id'] for segment in segments})
+        conflicts = self.find_conflicts(segments)
+        if conflicts:
+            return {
+                'success': False,
+                'error': _('%s segmentos no están disponibles') % len(conflicts),
+                'conflicts': conflicts,
+            }
+
+        bookings = self.create_reservations(data, segments)
+        _logger.info("Batch de reservas creado: %s reservas (%s)", len(bookings), bookings.ids)
+        return {
+            'success': True,
+            'message': f'{len(bookings)} reservas creadas exitosamente',
+            'bookings': bookings,
+            'groups': [{
+                'type': 'consecutive',
+                'segments': data['segments'],
+                'count': len(segments),
+            }],
+        }
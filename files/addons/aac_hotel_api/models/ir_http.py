@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+from ..controllers.profiling import should_profile, run_profiled
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = 'ir.http'
+
+    @classmethod
+    def _dispatch(cls, endpoint):
+        """Perfilar bajo demanda las rutas del hotel con sesión de administrador"""
+        if should_profile():
+            return run_profiled(lambda: super(IrHttp, cls)._dispatch(endpoint))
+        return super()._dispatch(endpoint)
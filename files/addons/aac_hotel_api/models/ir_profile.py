@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields
+
+
+class IrProfile(models.Model):
+    _inherit = 'ir.profile'
+
+    hotel_route = fields.Char('Ruta del hotel', index=True, readonly=True)
+    hotel_user_id = fields.Many2one('res.users', string='Perfilado por', readonly=True)
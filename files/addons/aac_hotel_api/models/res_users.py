@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields
+
+from ..controllers.api_key_cache import api_key_cache
+
+
+class ResUsers(models.Model):
+    _inherit = 'res.users'
+
+    hotel_profile_requests = fields.Boolean(
+        'Perfilar peticiones del hotel',
+        groups='base.group_system',
+        help='Ejecutar bajo el profiler todas las peticiones /hotel/ y /api/ de este '
+             'administrador (ver ir.profile). Desactivar al terminar.',
+    )
+
+    def write(self, vals):
+        # Un usuario archivado deja de autenticarse con sus API keys en
+        # todos los workers
+        if 'active' in vals:
+            api_key_cache.invalidate(self.env.cr)
+        return super().write(vals)
+
+    def unlink(self):
+        # Sus API keys se eliminan en cascada, sin pasar por su unlink
+        api_key_cache.invalidate(self.env.cr)
+        return super().unlink()
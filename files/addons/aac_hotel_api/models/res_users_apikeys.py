@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+from ..controllers.api_key_cache import api_key_cache
+
+
+class ResUsersApikeys(models.Model):
+    _inherit = 'res.users.apikeys'
+
+    def init(self):
+        super().init()
+        api_key_cache.init_generation(self.env.cr)
+
+    def unlink(self):
+        # Una key eliminada (desde la API o desde Preferencias) deja de estar
+        # en caché en todos los workers
+        result = super().unlink()
+        api_key_cache.invalidate(self.env.cr)
+        return result
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+from . import test_query_counts
+from .perf import test_perf_hot_paths
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Dataset parametrizable para las pruebas de rendimiento del hotel.
+
+HotelDatasetMixin crea N hoteles con M habitaciones cada uno y K reservas
+repartidas entre todas las habitaciones sin solaparse: la reserva i ocupa
+la habitación i % habitaciones en el tramo i // habitaciones (una noche
+cada dos días a partir de hace DATASET_DAYS_BACK días). Además:
+
+- cada CHAIN_EVERY reservas, la reserva se encadena (cambio de habitación)
+  con la del tramo siguiente en la habitación contigua, así que también
+  hay cadenas de más de dos segmentos;
+- cada SERVICE_EVERY reservas, la línea de la reserva lleva un servicio;
+- los estados se alternan entre BOOKING_STATES.
+"""
+from datetime import datetime, time, timedelta
+
+from odoo import fields
+
+CHAIN_EVERY = 5
+SERVICE_EVERY = 3
+BOOKING_STATES = ['initial', 'confirmed', 'checkin']
+DATASET_DAYS_BACK = 3
+
+DATASET_CONTEXT = {
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_notrack': True,
+}
+
+
+class HotelDatasetMixin:
+    """Mezcla para TransactionCase/HttpCase que siembra el dataset"""
+
+    @classmethod
+    def _create_hotel_dataset(cls, hotels=1, rooms=5, bookings=10, prefix='Perf'):
+        """Crear el dataset y devolver sus registros.
+
+        :param hotels: número de hoteles
+        :param rooms: habitaciones por hotel
+        :param bookings: reservas en total
+        :return: dict con 'hotels', 'rooms' (product.product), 'partner',
+            'user', 'service', 'start' y los de _create_dataset_bookings
+        """
+        env = cls.env(context=dict(cls.env.context, **DATASET_CONTEXT))
+        partner = env['res.partner'].create({'name': f'{prefix} Guest', 'email': 'perf.guest@example.com'})
+        hotel_records = env['hotel.hotels'].create([
+            {'name': f'{prefix} Hotel {index}', 'partner_id': partner.id}
+            for index in range(hotels)
+        ])
+        dataset = {
+            'hotels': hotel_records,
+            'rooms': cls._create_dataset_rooms(hotel_records, rooms, prefix=prefix),
+            'partner': partner,
+            'user': env.ref('base.user_admin'),
+            'service': env['hotel.service'].create({'name': f'{prefix} Laundry', 'service_type': 'paid'}),
+            'start': datetime.combine(
+                fields.Date.today() - timedelta(days=DATASET_DAYS_BACK), time(14, 0)
+            ),
+        }
+        dataset.update(cls._create_dataset_bookings(dataset, bookings))
+        return dataset
+
+    @classmethod
+    def _create_dataset_rooms(cls, hotels, rooms, prefix='Perf', first_index=0):
+        """Crear rooms tipos de habitación por hotel.
+
+        :param first_index: primer número de habitación (para no repetir
+            nombres al agregar habitaciones a un dataset)
+        :return: las variantes (product.product) de los tipos creados
+        """
+        env = cls.env(context=dict(cls.env.context, **DATASET_CONTEXT))
+        templates = env['product.template'].create([
+            {
+                'name': f'{prefix} Room {hotel.id}-{index}',
+                'is_room_type': True,
+                'hotel_id': hotel.id,
+                'type': 'consu',
+                'list_price': 100.0,
+                'max_adult': 2,
+                'max_child': 1,
+            }
+            for hotel in hotels
+            for index in range(first_index, first_index + rooms)
+        ])
+        return templates.product_variant_id
+
+    @classmethod
+    def _create_dataset_bookings(cls, dataset, count, first_index=0, rooms=None):
+        """Crear count reservas más en las habitaciones del dataset.
+
+        first_index es el número de reservas que ya tiene el dataset: las
+        nuevas ocupan los tramos siguientes, así que no se solapan con ellas.
+        Con rooms (habitaciones nuevas, no las del dataset) las reservas se
+        reparten entre ellas desde el primer tramo, en las mismas fechas que
+        las del dataset.
+
+        :return: dict con 'bookings', 'chains' (pares origen/destino
+            enlazados) y 'services'
+        """
+        env = cls.env(context=dict(cls.env.context, **DATASET_CONTEXT))
+        rooms = rooms or dataset['rooms']
+        total_rooms = len(rooms)
+        indexes = range(first_index, first_index + count)
+        bookings = env['hotel.booking'].create([
+            cls._prepare_dataset_booking_vals(
+                index, rooms[index % total_rooms], dataset['partner'], dataset['user'],
+                dataset['start'] + timedelta(days=2 * (index // total_rooms)),
+            )
+            for index in indexes
+        ])
+        by_index = dict(zip(indexes, bookings))
+
+        # Cadenas de cambio de habitación: i -> i + habitaciones + 1 (tramo
+        # siguiente, habitación contigua); en orden para que los enlaces
+        # intermedios no se pisen
+        chains = []
+        Batch = env['hotel.batch.reservation']
+        for index in indexes:
+            target = by_index.get(index + total_rooms + 1)
+            if index % CHAIN_EVERY or not target:
+                continue
+            Batch._link_booking_chain(by_index[index] | target)
+            chains.append((by_index[index], target))
+        if chains:
+            env['hotel.booking'].union(*[origin for origin, _target in chains]).write(
+                {'is_room_change_origin': True}
+            )
+            env['hotel.booking'].union(*[target for _origin, target in chains]).write(
+                {'is_room_change_destination': True}
+            )
+
+        services = env['hotel.booking.service.line'].create([
+            {
+                'booking_line_id': booking.booking_line_ids[:1].id,
+                'service_id': dataset['service'].id,
+                'amount': 25.0,
+            }
+            for index, booking in by_index.items()
+            if not index % SERVICE_EVERY
+        ])
+        env.flush_all()
+        env.invalidate_all()
+        return {'bookings': bookings, 'chains': chains, 'services': services}
+
+    @classmethod
+    def _prepare_dataset_booking_vals(cls, index, room, partner, user, check_in):
+        return {
+            'partner_id': partner.id,
+            'user_id': user.id,
+            'hotel_id': room.hotel_id.id,
+            'check_in': check_in,
+            'check_out': check_in + timedelta(hours=22),
+            'status_bar': BOOKING_STATES[index % len(BOOKING_STATES)],
+            'booking_line_ids': [(0, 0, {
+                'product_id': room.id,
+                'guest_info_ids': [(0, 0, {
+                    'name': f'{partner.name} {index}',
+                    'age': 30,
+                    'gender': 'other',
+                    'partner_id': partner.id,
+                })],
+            })],
+        }
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Medición y reporte del benchmark de rutas calientes del hotel.
+
+Parámetros por variables de entorno (para comparar ramas en local):
+
+- HOTEL_PERF_HOTELS, HOTEL_PERF_ROOMS (por hotel), HOTEL_PERF_BOOKINGS:
+  tamaño del dataset;
+- HOTEL_PERF_REPEAT: repeticiones de cada medición;
+- HOTEL_PERF_REPORT: ruta del reporte JSON (por defecto en el directorio
+  temporal);
+- HOTEL_PERF_LABEL: etiqueta libre del reporte (p. ej. la rama).
+"""
+import json
+import logging
+import math
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime
+
+from odoo import release
+
+_logger = logging.getLogger(__name__)
+
+
+def env_int(name, default):
+    try:
+        return int(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+PERF_HOTELS = env_int('HOTEL_PERF_HOTELS', 2)
+PERF_ROOMS = env_int('HOTEL_PERF_ROOMS', 20)
+PERF_BOOKINGS = env_int('HOTEL_PERF_BOOKINGS', 400)
+PERF_REPEAT = env_int('HOTEL_PERF_REPEAT', 10)
+PERF_REPORT = os.environ.get('HOTEL_PERF_REPORT') or os.path.join(
+    tempfile.gettempdir(), 'hotel_perf_report.json'
+)
+PERF_LABEL = os.environ.get('HOTEL_PERF_LABEL')
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano (sin interpolar)"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(math.ceil(pct / 100.0 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class PerfRecorder:
+    """Acumula las mediciones de cada ruta y escribe el reporte JSON"""
+
+    def __init__(self, cr):
+        self.cr = cr
+        self.results = {}
+
+    def measure(self, name, call, repeat=PERF_REPEAT, before=None):
+        """Ejecutar call() repeat veces midiendo tiempo y consultas SQL.
+
+        :param before: función que se llama antes de cada repetición, fuera
+            de la medición (p. ej. para vaciar cachés)
+        :return: el resultado de la última llamada
+        """
+        durations = []
+        queries = []
+        result = None
+        for _run in range(repeat):
+            if before:
+                before()
+            count = self.cr.sql_log_count
+            start = time.perf_counter()
+            result = call()
+            durations.append((time.perf_counter() - start) * 1000)
+            queries.append(self.cr.sql_log_count - count)
+        self.results[name] = {
+            'runs': repeat,
+            'p50_ms': round(percentile(durations, 50), 2),
+            'p95_ms': round(percentile(durations, 95), 2),
+            'min_ms': round(min(durations), 2),
+            'max_ms': round(max(durations), 2),
+            'queries_p50': percentile(queries, 50),
+            'queries_max': max(queries),
+        }
+        _logger.info("perf %s: %s", name, self.results[name])
+        return result
+
+    def write_report(self, dataset):
+        report = {
+            'label': PERF_LABEL,
+            'generated_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'odoo_version': release.version,
+            'python_version': platform.python_version(),
+            'database': self.cr.dbname,
+            'dataset': dataset,
+            'results': dict(sorted(self.results.items())),
+        }
+        with open(PERF_REPORT, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+        _logger.info("Reporte de rendimiento escrito en %s", PERF_REPORT)
+        return report
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de las rutas calientes del hotel.
+
+No corre con las pruebas normales (etiqueta -standard); se lanza contra
+una base local con:
+
+    HOTEL_PERF_BOOKINGS=2000 HOTEL_PERF_LABEL=mi-rama \\
+    odoo-bin -d hotel_perf -i aac_hotel_api --test-tags hotel_perf --stop-after-init
+
+Cada ruta se mide HOTEL_PERF_REPEAT veces y el reporte JSON (p50/p95 en
+milisegundos y consultas SQL por llamada) queda en HOTEL_PERF_REPORT, para
+comparar el mismo dataset entre ramas. Ver perf/common.py.
+"""
+import json
+from datetime import timedelta
+
+from odoo.tests import HttpCase, tagged
+
+from ..common import HotelDatasetMixin
+from .common import (
+    PERF_BOOKINGS,
+    PERF_HOTELS,
+    PERF_REPEAT,
+    PERF_ROOMS,
+    PerfRecorder,
+)
+
+# Días a partir de los cuales el benchmark de lotes crea sus reservas, lejos
+# del dataset para no chocar con él
+BATCH_DAYS_AHEAD = 400
+BATCH_SEGMENTS = 3
+
+
+@tagged('post_install', '-at_install', 'hotel_perf', '-standard')
+class TestHotelPerfHotPaths(HotelDatasetMixin, HttpCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dataset = cls._create_hotel_dataset(
+            hotels=PERF_HOTELS, rooms=PERF_ROOMS, bookings=PERF_BOOKINGS
+        )
+        cls.hotel = cls.dataset['hotels'][0]
+        cls.admin = cls.env.ref('base.user_admin')
+        cls.api_key = cls.env['res.users.apikeys'].with_user(cls.admin)._generate(
+            scope='rpc', name='hotel perf'
+        )
+        cls.recorder = PerfRecorder(cls.cr)
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.recorder.results:
+            cls.recorder.write_report({
+                'hotels': PERF_HOTELS,
+                'rooms_per_hotel': PERF_ROOMS,
+                'rooms': len(cls.dataset['rooms']),
+                'bookings': len(cls.dataset['bookings']),
+                'room_change_chains': len(cls.dataset['chains']),
+                'service_lines': len(cls.dataset['services']),
+                'repeat': PERF_REPEAT,
+            })
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate('admin', 'admin')
+
+    def _clear_caches(self):
+        self.env['hotel.booking.dashboard']._clear_dashboard_cache()
+        self.env['website']._clear_shop_availability_cache()
+        self.env.invalidate_all()
+
+    def _api_get(self, url):
+        response = self.url_open(url, headers={'X-API-Key': self.api_key}, timeout=60)
+        self.assertEqual(response.status_code, 200, response.text)
+        return response
+
+    # ------------------------------------------------------------------
+    # Métodos de modelo
+    # ------------------------------------------------------------------
+
+    def test_filter_booking_based_on_date(self):
+        bookings = self.env['hotel.booking'].search([])
+        check_in = self.dataset['start']
+        check_out = check_in + timedelta(days=7)
+        result = self.recorder.measure(
+            'filter_booking_based_on_date',
+            lambda: bookings.filter_booking_based_on_date(check_in, check_out),
+            before=self.env.invalidate_all,
+        )
+        self.assertTrue(result)
+
+    def test_fetch_data_for_dashboard(self):
+        Booking = self.env['hotel.booking']
+        for scale in ('today', 'month'):
+            result = self.recorder.measure(
+                f'fetch_data_for_dashboard[{scale}]',
+                lambda: Booking.fetch_data_for_dashboard(scale=scale, hotel_id=self.hotel.id),
+                before=self._clear_caches,
+            )
+            self.assertIsInstance(result, dict)
+        # Con el caché del tablero ya caliente
+        self.recorder.measure(
+            'fetch_data_for_dashboard[month,cached]',
+            lambda: Booking.fetch_data_for_dashboard(scale='month', hotel_id=self.hotel.id),
+        )
+
+    # ------------------------------------------------------------------
+    # Rutas del backend (sesión)
+    # ------------------------------------------------------------------
+
+    def test_gantt_data(self):
+        params = {
+            'target_date': self.dataset['start'].date().isoformat(),
+            'hotel_id': self.hotel.id,
+        }
+        result = self.recorder.measure(
+            '/hotel/gantt_data',
+            lambda: self.make_jsonrpc_request('/hotel/gantt_data', params),
+            before=self._clear_caches,
+        )
+        self.assertTrue(result.get('success'), result)
+
+    def test_room_panel_data(self):
+        result = self.recorder.measure(
+            '/hotel/room_panel_data',
+            lambda: self.make_jsonrpc_request('/hotel/room_panel_data', {'hotel_id': self.hotel.id}),
+            before=self._clear_caches,
+        )
+        self.assertTrue(result.get('success'), result)
+
+    def test_available_qty_details(self):
+        room = self.dataset['rooms'].filtered(lambda room: room.hotel_id == self.hotel)[:1]
+        check_in = self.dataset['start'].date()
+        params = {
+            'requirement_qty': 1,
+            'product_template_id': room.product_tmpl_id.id,
+            'product_id': room.id,
+            'hotel_id': self.hotel.id,
+            'check_in': check_in.isoformat(),
+            'check_out': (check_in + timedelta(days=2)).isoformat(),
+        }
+        self.recorder.measure(
+            '/available/qty/details',
+            lambda: self.make_jsonrpc_request('/available/qty/details', params),
+            before=self._clear_caches,
+        )
+
+    # ------------------------------------------------------------------
+    # Rutas de la API (API key)
+    # ------------------------------------------------------------------
+
+    def test_api_reservas(self):
+        response = self.recorder.measure(
+            '/api/hotel/reservas',
+            lambda: self._api_get(f'/api/hotel/reservas?hotel_id={self.hotel.id}'),
+            before=self._clear_caches,
+        )
+        self.assertTrue(response.json()['success'])
+        self.recorder.measure(
+            '/api/hotel/reservas[limit=50]',
+            lambda: self._api_get(f'/api/hotel/reservas?hotel_id={self.hotel.id}&limit=50'),
+            before=self._clear_caches,
+        )
+
+    def test_api_batch_reservations(self):
+        rooms = self.dataset['rooms'][:BATCH_SEGMENTS]
+        start = self.dataset['start'] + timedelta(days=BATCH_DAYS_AHEAD)
+        runs = iter(range(PERF_REPEAT))
+
+        def post_batch():
+            # Cada repetición reserva otras fechas para no chocar con la anterior
+            run_start = start + timedelta(days=2 * BATCH_SEGMENTS * next(runs))
+            segments = [
+                {
+                    'room_id': room.id,
+                    'check_in': (run_start + timedelta(days=2 * index)).strftime('%Y-%m-%d %H:%M:%S'),
+                    'check_out': (run_start + timedelta(days=2 * index + 1)).strftime('%Y-%m-%d %H:%M:%S'),
+                }
+                for index, room in enumerate(rooms)
+            ]
+            response = self.url_open(
+                '/api/hotel/reservas/batch',
+                data=json.dumps({
+                    'partner_id': self.dataset['partner'].id,
+                    'user_id': self.admin.id,
+                    'hotel_id': self.hotel.id,
+                    'segments': segments,
+                }),
+                headers={'X-API-Key': self.api_key, 'Content-Type': 'application/json'},
+                timeout=60,
+            )
+            self.assertEqual(response.status_code, 200, response.text)
+            return response
+
+        self.recorder.measure(
+            '/api/hotel/reservas/batch',
+            post_batch,
+            before=self._clear_caches,
+        )
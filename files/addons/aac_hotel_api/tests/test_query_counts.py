@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Guardas de número de consultas SQL de las rutas de la API y del backend.
+
+Cada ruta se llama con el dataset pequeño (SMALL_BOOKINGS reservas), se
+agregan reservas hasta LARGE_BOOKINGS en habitaciones nuevas de los mismos
+hoteles y en las mismas fechas (así las ventanas que consultan las rutas,
+hoy o target_date..+2 días, tienen el triple de reservas) y se vuelve a
+llamar: el número de consultas no debe crecer con las reservas.
+Una consulta por reserva (N+1) en _build_booking_data,
+_get_room_change_chain, _compute_room_status, cal_room_availability o en
+cualquier otra ruta hace fallar la prueba de esa ruta.
+
+Las rutas que modifican una sola reserva (pagos, facturas, precios,
+correos, estados) no dependen del número de reservas y no se incluyen; el
+alta se cubre con /api/hotel/reservas/batch.
+"""
+import json
+from datetime import timedelta
+
+from odoo.tests import HttpCase, tagged
+
+from .common import HotelDatasetMixin
+
+ROOMS_PER_HOTEL = 4
+SMALL_BOOKINGS = 12
+LARGE_BOOKINGS = 36
+# Habitaciones que se agregan por hotel para que las reservas nuevas caigan
+# en las fechas de las existentes: con el triple de habitaciones, cada tramo
+# tiene el triple de reservas
+GROWTH_ROOMS_PER_HOTEL = ROOMS_PER_HOTEL * (LARGE_BOOKINGS // SMALL_BOOKINGS - 1)
+
+# Rutas GET de la API (API key); los {} se completan con route_args
+API_GET_ROUTES = [
+    '/api/hotel/reservas',
+    '/api/hotel/reservas?hotel_id={hotel_id}',
+    '/api/hotel/reservas?hotel_id={hotel_id}&limit=100',
+    '/api/hotel/reservas/{hotel_id}',
+    '/api/hotel/reservas/habitacion/{room_id}',
+    '/api/hotel/reserva/{booking_id}',
+    '/api/hotel/reserva/{booking_id}/advance_payment/options',
+    '/api/hotel/gantt/data?hotel_id={hotel_id}&target_date={target_date}',
+    '/api/hotel/gantt/matrix?hotel_id={hotel_id}&target_date={target_date}',
+    '/api/hotel/habitaciones?hotel_id={hotel_id}',
+    '/api/hotel/health',
+    '/api/hotel/hoteles',
+    '/api/hotel/hoteles/{hotel_id}',
+    '/api/hotel/hoteles/search?name=QC',
+    '/api/hotel/hoteles/{hotel_id}/cuartos',
+    '/api/hotel/cuartos',
+    '/api/hotel/cuartos/{template_id}',
+    '/api/hotel/debug/data',
+    '/api/hotel/booking/{booking_id}/price_info',
+    '/api/hotel/booking/{booking_id}/price_breakdown',
+    '/api/hotel/booking/{booking_id}/price_history',
+    '/api/hotel/booking/{booking_id}/lines/price_info',
+    '/api/hotel/booking/{booking_id}/extra_infos',
+    '/api/hotel/booking_line/{line_id}/price_info',
+    '/api/hotel/booking_line/{line_id}/price_history',
+    '/api/hotel/user/{user_id}/price_summary',
+    '/api/hotel/user/{user_id}/price_breakdown',
+    '/api/hotel/user/{user_id}/price_filters',
+    '/api/hotel/user/{user_id}/guests',
+    '/api/hotel/user/{user_id}/guest/{guest_id}/price_info',
+    '/api/hotel/guest/{guest_id}/price_info',
+    '/api/hotel/partner/{partner_id}/price_info',
+    '/api/hotel/jobs/{job_id}',
+    '/api/hotel/metrics',
+    '/api/hotel/profiles',
+    '/api/v1/hotel/states',
+    '/api/v1/hotel/states/booking',
+    '/api/v1/hotel/states/booking/confirmed',
+    '/api/v1/hotel/states/housekeeping',
+    '/api/v1/hotel/states/housekeeping/draft',
+    '/api/v1/hotel/states/validate-transition?type=booking&from_state=initial&to_state=confirmed',
+    '/api/v1/responsables',
+    '/api/v1/responsables/{user_id}',
+    '/api/v1/responsables/search?search=admin',
+    '/api/v1/responsables/stats',
+    '/api/v1/contacts',
+    '/api/v1/contacts/{partner_id}',
+    '/api/v1/contacts/search?search=QC',
+    '/api/v1/contacts/stats',
+    '/api/v1/contacts/export',
+    '/api/auth/my_keys',
+    '/api/auth/test_key',
+    '/api/auth/cache_stats',
+]
+
+# Rutas type='json' de la API (API key)
+API_JSON_ROUTES = [
+    ('/api/hotel/reserva/{booking_id}/change_room/options', {}),
+]
+
+# Rutas type='json' del backend y del sitio web (sesión)
+SESSION_JSON_ROUTES = [
+    ('/hotel/gantt_data', {'hotel_id': '{hotel_id}', 'target_date': '{target_date}'}),
+    ('/hotel/gantt_matrix', {'hotel_id': '{hotel_id}', 'target_date': '{target_date}'}),
+    ('/hotel/gantt_room_panel_data', {'hotel_id': '{hotel_id}'}),
+    ('/hotel/gantt_filters', {}),
+    ('/hotel/get_hotels', {}),
+    ('/hotel/get_default_partner', {}),
+    ('/hotel/get_product_from_template', {'template_id': '{template_id}'}),
+    ('/hotel/room_panel_data', {'hotel_id': '{hotel_id}'}),
+    ('/hotel/room_panel_filters', {}),
+    ('/hotel/room_change_info/{booking_id}', {}),
+    ('/available/qty/details', {
+        'requirement_qty': '1',
+        'product_template_id': '{template_id}',
+        'product_id': '{room_id}',
+        'hotel_id': '{hotel_id}',
+        'check_in': '{target_date}',
+        'check_out': '{check_out_date}',
+        'availabilty_check': '1',
+    }),
+]
+
+
+@tagged('post_install', '-at_install', 'hotel_query_count')
+class TestHotelQueryCounts(HotelDatasetMixin, HttpCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dataset = cls._create_hotel_dataset(
+            hotels=2, rooms=ROOMS_PER_HOTEL, bookings=SMALL_BOOKINGS, prefix='QC'
+        )
+        cls.admin = cls.dataset['user']
+        cls.api_key = cls.env['res.users.apikeys'].with_user(cls.admin)._generate(
+            scope='rpc', name='hotel query count'
+        )
+        hotel = cls.dataset['hotels'][0]
+        room = cls.dataset['rooms'].filtered(lambda room: room.hotel_id == hotel)[:1]
+        # Destino de una cadena de cambio de habitación, con servicio
+        booking = cls.dataset['chains'][0][1]
+        line = booking.booking_line_ids[:1]
+        job = cls.env['hotel.api.job'].create({
+            'user_id': cls.admin.id,
+            'payload': '{}',
+            'state': 'done',
+            'booking_ids': [(6, 0, booking.ids)],
+        })
+        target_date = cls.dataset['start'].date()
+        cls.route_args = {
+            'hotel_id': hotel.id,
+            'room_id': room.id,
+            'template_id': room.product_tmpl_id.id,
+            'booking_id': booking.id,
+            'line_id': line.id,
+            'guest_id': line.guest_info_ids[:1].id,
+            'user_id': cls.admin.id,
+            'partner_id': cls.dataset['partner'].id,
+            'job_id': job.id,
+            'target_date': target_date.isoformat(),
+            'check_out_date': (target_date + timedelta(days=2)).isoformat(),
+        }
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate('admin', 'admin')
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _format(self, value):
+        if isinstance(value, dict):
+            return {key: self._format(item) for key, item in value.items()}
+        return value.format(**self.route_args)
+
+    def _clear_caches(self):
+        """Vaciar los cachés con TTL para contar siempre el cálculo completo"""
+        self.env['hotel.booking.dashboard']._clear_dashboard_cache()
+        self.env['website']._clear_shop_availability_cache()
+        self.env.invalidate_all()
+
+    def _api_get(self, route):
+        def call():
+            response = self.url_open(self._format(route), headers={'X-API-Key': self.api_key})
+            self.assertEqual(response.status_code, 200, f'{route}: {response.text}')
+        return call
+
+    def _json_call(self, route, params, headers=None):
+        def call():
+            result = self.make_jsonrpc_request(self._format(route), self._format(params), headers=headers)
+            if isinstance(result, dict) and 'success' in result:
+                self.assertTrue(result['success'], f'{route}: {result}')
+        return call
+
+    def _count_queries(self, call):
+        self._clear_caches()
+        count = self.cr.sql_log_count
+        call()
+        return self.cr.sql_log_count - count
+
+    def assertQueryCountStable(self, calls):
+        """Las llamadas no hacen más consultas con LARGE_BOOKINGS reservas
+        que con SMALL_BOOKINGS.
+
+        :param calls: lista de (nombre, función sin argumentos)
+        """
+        # Primera llamada fuera de la cuenta: cachés del registro, de la API key...
+        for _name, call in calls:
+            call()
+        small = {name: self._count_queries(call) for name, call in calls}
+        rooms = self._create_dataset_rooms(
+            self.dataset['hotels'], GROWTH_ROOMS_PER_HOTEL, prefix='QC', first_index=ROOMS_PER_HOTEL
+        )
+        self._create_dataset_bookings(self.dataset, LARGE_BOOKINGS - SMALL_BOOKINGS, rooms=rooms)
+        large = {name: self._count_queries(call) for name, call in calls}
+        for name, _call in calls:
+            with self.subTest(route=name):
+                self.assertLessEqual(
+                    large[name], small[name],
+                    f'{name}: {small[name]} consultas con {SMALL_BOOKINGS} reservas '
+                    f'y {large[name]} con {LARGE_BOOKINGS}',
+                )
+
+    # ------------------------------------------------------------------
+    # Pruebas
+    # ------------------------------------------------------------------
+
+    def test_api_routes(self):
+        headers = {'X-API-Key': self.api_key}
+        self.assertQueryCountStable(
+            [(route, self._api_get(route)) for route in API_GET_ROUTES]
+            + [(route, self._json_call(route, params, headers)) for route, params in API_JSON_ROUTES]
+        )
+
+    def test_session_routes(self):
+        self.assertQueryCountStable(
+            [(route, self._json_call(route, params)) for route, params in SESSION_JSON_ROUTES]
+        )
+
+    def test_batch_reservations(self):
+        rooms = self.dataset['rooms'][:2]
+        start = self.dataset['start'] + timedelta(days=400)
+        runs = iter(range(10))
+
+        def post_batch():
+            # Cada llamada reserva otras fechas para no chocar con la anterior
+            run_start = start + timedelta(days=10 * next(runs))
+            segments = [
+                {
+                    'room_id': room.id,
+                    'check_in': (run_start + timedelta(days=2 * index)).strftime('%Y-%m-%d %H:%M:%S'),
+                    'check_out': (run_start + timedelta(days=2 * index + 1)).strftime('%Y-%m-%d %H:%M:%S'),
+                }
+                for index, room in enumerate(rooms)
+            ]
+            response = self.url_open(
+                '/api/hotel/reservas/batch',
+                data=json.dumps({
+                    'partner_id': self.dataset['partner'].id,
+                    'user_id': self.admin.id,
+                    'hotel_id': self.route_args['hotel_id'],
+                    'segments': segments,
+                }),
+                headers={'X-API-Key': self.api_key, 'Content-Type': 'application/json'},
+            )
+            self.assertEqual(response.status_code, 200, response.text)
+
+        self.assertQueryCountStable([('/api/hotel/reservas/batch', post_batch)])
+
+    def test_model_methods(self):
+        Booking = self.env['hotel.booking']
+        check_in = self.dataset['start']
+
+        def recompute_room_status():
+            # Incluye las habitaciones agregadas
+            self.env['product.template'].search([
+                ('is_room_type', '=', True), ('hotel_id', 'in', self.dataset['hotels'].ids),
+            ])._refresh_room_status()
+            self.env.flush_all()
+
+        self.assertQueryCountStable([
+            ('filter_booking_based_on_date', lambda: Booking.search([]).filter_booking_based_on_date(
+                check_in, check_in + timedelta(days=30)
+            )),
+            ('fetch_data_for_dashboard', lambda: Booking.fetch_data_for_dashboard(
+                scale='month', hotel_id=self.route_args['hotel_id']
+            )),
+            ('_compute_room_status', recompute_room_status),
+        ])
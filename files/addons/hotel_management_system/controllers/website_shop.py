@@ -199,70 +199,24 @@ class WebsiteShopInherit(WebsiteSale):
                 int(product_template_id))
             total_room = product_template.product_variant_ids
 
-            total_booking = request.env['hotel.booking'].sudo().search(
-                [('status_bar', 'not in', ['initial', 'checkout'])])
-            website_id = request.website
-            pricelist = website_id.sudo()._get_current_pricelist()
-            added_cart_room = 0
+            availability = request.env['hotel.room.availability'].sudo()
+            free_rooms = availability.allocate_rooms(
+                total_room,
+                check_in_val,
+                check_out_val,
+                quantity=int(requirement_qty) if availabilty_check == '0' else None,
+                exclude_room_ids=sale_order.order_line.product_id.ids,
+                excluded_states=availability._get_non_blocking_states() + ['initial'],
+            )
+            added_cart_room = len(free_rooms)
 
             sale_order.write({'hotel_id': int(hotel_id or 0)})
 
-            for room in total_room:
-                not_available = False
-                if room.id not in (sale_order.mapped('order_line.product_id')).ids:
-                    for booking in total_booking:
-                        if room.id in (booking.mapped('booking_line_ids.product_id')).ids:
-                            if booking.filter_booking_based_on_date(check_in_val, check_out_val):
-                                not_available = True
-                                break
-                            else:
-
-                                added_cart_room += 1
-                                room_id = room
-                                qty = (check_out_val.date() -
-                                       check_in_val.date()).days or 1
-                                price_unit = sale_order.pricelist_id._get_product_price(
-                                    room_id, qty)
-                                if availabilty_check == '0':
-                                    if order_des:
-                                        name = room_id.name + \
-                                            '('+check_in+' ' + check_out + \
-                                            ')' + f'\n {order_des}'
-                                    else:
-                                        name = room_id.name + \
-                                            '('+check_in+' ' + check_out+')'
-                                    request.env['sale.order.line'].sudo().create({
-                                        'name': name,
-                                        'product_id': room_id.id,
-                                        'product_uom_qty': qty,
-                                        'product_uom': room_id.uom_id.id,
-                                        'price_unit': price_unit,
-                                        'order_id': sale_order.id,
-                                    })
-                                break
-
-                    # if room not in booking list
-                    if room.id not in (sale_order.mapped('order_line.product_id')).ids and not_available is False:
-                        added_cart_room += 1
-                        room_id = room
-                        qty = (check_out_val.date() -
-                               check_in_val.date()).days or 1
-                        price_unit = sale_order.sudo().pricelist_id._get_product_price(room_id, qty)
-                        if availabilty_check == '0':
-                            if order_des:
-                                name = room_id.name + f'\n {order_des}'
-                            else:
-                                name = room_id.name
-                            request.env['sale.order.line'].sudo().create({
-                                'name': name,
-                                'product_id': room_id.id,
-                                'product_uom_qty': qty,
-                                'product_uom': room_id.uom_id.id,
-                                'price_unit': price_unit,
-                                'order_id': sale_order.id,
-                            })
-                    if added_cart_room == int(requirement_qty) and availabilty_check == '0':
-                        return {'result': 'done', }
+            if availabilty_check == '0':
+                self._add_rooms_to_cart(
+                    sale_order, free_rooms, check_in_val, check_out_val, order_des)
+                if added_cart_room == int(requirement_qty):
+                    return {'result': 'done', }
 
             if availabilty_check == '1' and added_cart_room:
                 return {'result': 'done', 'tot_available_room': added_cart_room}
@@ -273,6 +227,21 @@ class WebsiteShopInherit(WebsiteSale):
                     msg = f'{added_cart_room} rooms have been added to the cart, remaining rooms are not available currently...'
                 return {'result': 'fail', 'msg': msg}
 
+    def _add_rooms_to_cart(self, sale_order, rooms, check_in, check_out, order_des=''):
+        """Add ``rooms`` to the cart, priced in one pricelist call and created in one batch."""
+        if not rooms:
+            return request.env['sale.order.line'].sudo()
+        qty = (check_out.date() - check_in.date()).days or 1
+        prices = sale_order.sudo().pricelist_id._get_products_price(rooms, qty)
+        return request.env['sale.order.line'].sudo().create([{
+            'name': room.name + f'\n {order_des}' if order_des else room.name,
+            'product_id': room.id,
+            'product_uom_qty': qty,
+            'product_uom': room.uom_id.id,
+            'price_unit': prices[room.id],
+            'order_id': sale_order.id,
+        } for room in rooms])
+
     @http.route(['/shop/cart/update_json'], type='json', auth="public", methods=['POST'], website=True, sitemap=False)
     def cart_update_json(self, product_id, line_id=None, add_qty=None, set_qty=None, display=True, product_custom_attribute_values=None, no_variant_attribute_value_ids=None, **kwargs):
         res = super(WebsiteShopInherit, self).cart_update_json(product_id, line_id, add_qty, set_qty,
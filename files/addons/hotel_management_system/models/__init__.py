@@ -17,7 +17,9 @@ from . import hotel_facility
 from . import hotel_service
 from . import sale_order
 from . import product_image
+from . import room_availability
 from . import hotel_booking
+from . import booking_dashboard
 from . import product
 from . import guest_info
 from . import website
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+##########################################################################
+# Author : Webkul Software Pvt. Ltd. (<https://webkul.com/>;)
+# Copyright(c): 2017-Present Webkul Software Pvt. Ltd.
+# All Rights Reserved.
+#
+#
+#
+# This program is copyright property of the author mentioned above.
+# You can`t redistribute it and/or modify it.
+#
+#
+# You should have received a copy of the License along with this program.
+# If not, see <https://store.webkul.com/license.html/>;
+##########################################################################
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from odoo import api, fields, models
+
+from ..tools.cache import SharedCache
+
+# Dashboard payloads keyed by
+# (companies, language, hotel, kind, today, scale or start day). Every booking
+# change invalidates it in all the workers.
+DASHBOARD_CACHE_TTL = 60
+DASHBOARD_CACHE_SIZE = 256
+dashboard_cache = SharedCache("booking_dashboard", DASHBOARD_CACHE_TTL, DASHBOARD_CACHE_SIZE)
+
+BOOKING_DASHBOARD_FIELDS = [
+    "status_bar",
+    "check_in",
+    "check_out",
+    "partner_id",
+    "total_amount",
+    "currency_id",
+    "booking_reference",
+]
+
+
+class HotelBookingDashboard(models.AbstractModel):
+    _name = "hotel.booking.dashboard"
+    _description = "Hotel Booking Dashboard Data"
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def init(self):
+        dashboard_cache.init_generation(self.env.cr)
+
+    def _get_cached(self, kind, hotel_id, variant, compute):
+        key = (
+            tuple(sorted(self.env.companies.ids)),
+            self.env.lang,
+            hotel_id or False,
+            kind,
+            fields.Date.today(),
+            variant,
+        )
+        return dashboard_cache.get_or_compute(self.env.cr, key, compute)
+
+    @api.model
+    def _clear_dashboard_cache(self):
+        """Drop the cached dashboard data of the current database in every worker."""
+        dashboard_cache.invalidate(self.env.cr)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _get_scale_bounds(self, scale):
+        """[start, end) of the calendar scale around today."""
+        today_date = datetime.combine(fields.Date.today(), time.min)
+        if scale == "week":
+            start_date = today_date - timedelta(days=today_date.weekday())
+            end_date = start_date + timedelta(weeks=1)
+        elif scale == "month":
+            start_date = datetime(today_date.year, today_date.month, 1)
+            end_date = (start_date + timedelta(days=31)).replace(day=1)
+        elif scale == "year":
+            start_date = datetime(today_date.year, 1, 1)
+            end_date = datetime(today_date.year + 1, 1, 1)
+        else:
+            start_date = today_date
+            end_date = today_date + timedelta(days=1)
+        return start_date, end_date
+
+    def _hotel_clause(self, hotel_id, alias="booking"):
+        return f"AND {alias}.hotel_id = %(hotel_id)s" if hotel_id else ""
+
+    def _flush_bookings(self):
+        self.env["hotel.booking"].flush_model(
+            [
+                "check_in",
+                "check_out",
+                "status_bar",
+                "hotel_id",
+                "partner_id",
+                "total_amount",
+                "create_date",
+            ]
+        )
+        self.env["hotel.booking.line"].flush_model(["booking_id", "product_id"])
+
+    # ------------------------------------------------------------------
+    # Calendar KPIs (hotel.booking.fetch_data_for_dashboard)
+    # ------------------------------------------------------------------
+
+    @api.model
+    def get_calendar_kpis(self, scale="today", hotel_id=None):
+        """Room and check-in/out counters of the booking calendar."""
+        return self._get_cached(
+            "calendar", hotel_id, scale,
+            lambda: self._compute_calendar_kpis(scale, hotel_id),
+        )
+
+    def _compute_calendar_kpis(self, scale, hotel_id):
+        start_date, end_date = self._get_scale_bounds(scale)
+        params = {"start": start_date, "end": end_date, "hotel_id": hotel_id}
+        self._flush_bookings()
+
+        # Rooms held by a live booking overlapping the scale
+        self.env.cr.execute(
+            f"""
+            SELECT DISTINCT line.product_id
+              FROM hotel_booking_line line
+              JOIN hotel_booking booking ON booking.id = line.booking_id
+             WHERE booking.check_out > %(start)s
+               AND booking.check_in <= %(end)s
+               AND COALESCE(booking.status_bar, '') NOT IN ('initial', 'checkout')
+               AND line.product_id IS NOT NULL
+               {self._hotel_clause(hotel_id)}
+          ORDER BY line.product_id
+            """,
+            params,
+        )
+        booked_room_ids = [row[0] for row in self.env.cr.fetchall()]
+        available_domain = [
+            ("is_room_type", "=", True),
+            ("active", "=", True),
+            ("id", "not in", booked_room_ids),
+        ]
+        if hotel_id:
+            available_domain.append(("product_tmpl_id.hotel_id", "=", hotel_id))
+        available_rooms = self.env["product.product"].search_count(available_domain)
+
+        # Check-ins, check-outs and drafts of the scale in one pass
+        self.env.cr.execute(
+            f"""
+            SELECT COALESCE(array_agg(booking.id ORDER BY booking.id) FILTER (
+                       WHERE booking.check_in >= %(start)s
+                         AND booking.check_in < %(end)s
+                         AND COALESCE(booking.status_bar, '') NOT IN ('checkout', 'cancel')
+                   ), '{{}}'),
+                   COALESCE(array_agg(booking.id ORDER BY booking.id) FILTER (
+                       WHERE booking.check_out >= %(start)s
+                         AND booking.check_out < %(end)s
+                         AND booking.status_bar = 'allot'
+                   ), '{{}}'),
+                   COALESCE(array_agg(booking.id ORDER BY booking.id) FILTER (
+                       WHERE booking.status_bar = 'initial'
+                   ), '{{}}')
+              FROM hotel_booking booking
+             WHERE TRUE {self._hotel_clause(hotel_id)}
+            """,
+            params,
+        )
+        check_in_ids, check_out_ids, to_confirm_ids = self.env.cr.fetchone()
+
+        room_domain = [("is_room_type", "=", True)]
+        if hotel_id:
+            room_domain.append(("hotel_id", "=", hotel_id))
+        room_data = (
+            self.env["product.template"]
+            .sudo()
+            .search_read(room_domain, ["name", "product_variant_count"])
+        )
+
+        return {
+            "booked_room": len(booked_room_ids),
+            "available_rooms": available_rooms,
+            "booked_room_ids": booked_room_ids,
+            "room_data": room_data,
+            "check_in_booking": check_in_ids,
+            "check_out_booking": check_out_ids,
+            "current_date_check_in": len(check_in_ids),
+            "current_date_check_out": len(check_out_ids),
+            "bookings_to_confirm": to_confirm_ids,
+        }
+
+    # ------------------------------------------------------------------
+    # Overview (hotel.booking.get_dashboard_data)
+    # ------------------------------------------------------------------
+
+    @api.model
+    def get_overview(self, start_date, hotel_id=None):
+        """Bookings created since start_date, with revenue, map and top customers."""
+        if isinstance(start_date, str):
+            start_date = start_date[:10]
+        start_day = fields.Date.to_date(start_date)
+        data = self._get_cached(
+            "overview", hotel_id, start_day,
+            lambda: self._compute_overview(start_day, hotel_id),
+        )
+        return dict(data, hotels=self.env["hotel.hotels"].search_read([], ["name"]))
+
+    def _compute_overview(self, start_day, hotel_id):
+        start_date = datetime.combine(start_day, time.min)
+        booking_domain = [("create_date", ">=", start_date)]
+        room_domain = [("is_room_type", "=", True)]
+        if hotel_id:
+            room_domain.append(("hotel_id", "=", hotel_id))
+            booking_domain.append(("hotel_id", "=", hotel_id))
+
+        rooms = self.env["product.template"].search_read(
+            room_domain,
+            ["display_name", "list_price", "product_website_description"],
+        )
+        bookings = self.env["hotel.booking"].search_read(
+            booking_domain, BOOKING_DASHBOARD_FIELDS, order="id"
+        )
+        currency_id = next(
+            (booking["currency_id"][0] for booking in bookings if booking["currency_id"]),
+            None,
+        )
+        currency_symbol = (
+            self.env["res.currency"].browse(currency_id).symbol if currency_id else None
+        )
+
+        today_date = fields.Date.today()
+        params = {
+            "start": start_date,
+            "hotel_id": hotel_id,
+            "today": today_date,
+            "yesterday": today_date - timedelta(days=1),
+            "last_week_start": today_date - timedelta(days=today_date.weekday() + 7),
+            "last_week_end": today_date - timedelta(days=today_date.weekday() + 1),
+        }
+        self._flush_bookings()
+
+        # Revenue of today, yesterday and last week by check-in date
+        self.env.cr.execute(
+            f"""
+            SELECT COALESCE(SUM(booking.total_amount) FILTER (
+                       WHERE booking.check_in::date = %(today)s), 0),
+                   COALESCE(SUM(booking.total_amount) FILTER (
+                       WHERE booking.check_in::date = %(yesterday)s), 0),
+                   COALESCE(SUM(booking.total_amount) FILTER (
+                       WHERE booking.check_in::date BETWEEN %(last_week_start)s AND %(last_week_end)s
+                         AND booking.check_in::date NOT IN (%(today)s, %(yesterday)s)), 0)
+              FROM hotel_booking booking
+             WHERE booking.create_date >= %(start)s
+               AND COALESCE(booking.status_bar, '') NOT IN ('cancel', 'draft')
+               {self._hotel_clause(hotel_id)}
+            """,
+            params,
+        )
+        today, yesterday, last_week = self.env.cr.fetchone()
+
+        # Guest location of every booking, for the city counters and the map
+        self.env.cr.execute(
+            f"""
+            SELECT state.name,
+                   partner.city,
+                   partner.partner_latitude,
+                   partner.partner_longitude
+              FROM hotel_booking booking
+              JOIN res_partner partner ON partner.id = booking.partner_id
+         LEFT JOIN res_country_state state ON state.id = partner.state_id
+             WHERE booking.create_date >= %(start)s
+               {self._hotel_clause(hotel_id)}
+          ORDER BY booking.id
+            """,
+            params,
+        )
+        locations = self.env.cr.fetchall()
+        city_booking_count = defaultdict(int)
+        for state_name, _city, _latitude, _longitude in locations:
+            if state_name:
+                city_booking_count[state_name] += 1
+        map_data = [
+            {
+                "city": f"{state_name or False} ({city_booking_count[state_name]}) bookings",
+                "latitude": latitude,
+                "longitude": longitude,
+            }
+            for state_name, city, latitude, longitude in locations
+            if city and latitude and longitude
+        ]
+
+        # Top 5 partners based on booking count
+        domain = [("partner_id", "!=", False)]
+        if hotel_id:
+            domain.append(("hotel_id", "=", hotel_id))
+        top_partners = self.env["hotel.booking"].read_group(
+            domain,
+            ["partner_id"],
+            ["partner_id"],
+            orderby="partner_id_count desc",
+            limit=5,
+        )
+        partners = self.env["res.partner"].browse(
+            [data["partner_id"][0] for data in top_partners]
+        )
+        top_customers = [
+            {
+                "name": partner.name,
+                "steps": data["partner_id_count"],
+                "pictureSettings": {
+                    "src": f"/web/image/res.partner/{partner.id}/avatar_128"
+                },
+            }
+            for partner, data in zip(partners, top_partners)
+        ]
+
+        return {
+            "rooms": rooms,
+            "bookings": bookings,
+            "booking_ids": [booking["id"] for booking in bookings],
+            "revenue": {"today": today, "yesterday": yesterday, "last_week": last_week},
+            "currency_symbol": currency_symbol,
+            "map_data": map_data,
+            "top_customers": top_customers,
+        }
@@ -14,14 +14,34 @@
 # If not, see <https://store.webkul.com/license.html/>;
 ##########################################################################
 import datetime as dt
+import logging
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 import pytz
-from collections import defaultdict
 
 from odoo import fields, models, api, _
 from odoo.http import request
 from odoo.exceptions import ValidationError, UserError
+from odoo.tools import split_every
+from odoo.tools.sql import create_index
+
+from ..tools.metrics import metrics
+from .room_availability import occupancy_range
+
+_logger = logging.getLogger(__name__)
+
+# Booking fields that change which rooms the website shop shows as available
+SHOP_AVAILABILITY_FIELDS = {"check_in", "check_out", "status_bar", "booking_line_ids"}
+
+# Booking fields read by hotel.booking.dashboard: writing only other fields
+# keeps its cache
+DASHBOARD_FIELDS = {
+    "check_in", "check_out", "status_bar", "hotel_id", "partner_id", "company_id",
+    "total_amount", "currency_id", "booking_reference", "booking_line_ids",
+}
+
+# Housekeeping tasks created (and committed) per chunk by the daily cron
+HOUSEKEEPING_CHUNK_SIZE = 500
 
 class HotelBooking(models.Model):
     _name = "hotel.booking"
@@ -30,6 +50,25 @@ class HotelBooking(models.Model):
 
     _rec_name = "sequence_id"
 
+    def init(self):
+        # GiST index on the occupancy interval used by hotel.room.availability,
+        # replacing the one built on the former (empty for day use) interval
+        self._cr.execute("DROP INDEX IF EXISTS hotel_booking_occupancy_range_index")
+        create_index(
+            self._cr,
+            "hotel_booking_occupancy_interval_index",
+            self._table,
+            [occupancy_range()],
+            method="gist",
+        )
+        # Keyset pagination of the REST API by (write_date, id)
+        create_index(
+            self._cr,
+            "hotel_booking_write_date_id_index",
+            self._table,
+            ["write_date", "id"],
+        )
+
     """ This method is called from a cron job.
         It is used to create house keeping record based on housekeeping config.
     """
@@ -37,9 +76,99 @@ class HotelBooking(models.Model):
         if self.env["ir.config_parameter"].sudo().get_param(
             "hotel_management_system.housekeeping_config"
         ) in ["daily", "both"]:
-            records = self.search(["status_bar", "=", "allot"])
-            for rec in records:
-                rec.create_housekeeping()
+            with metrics.timer("hotel_cron_duration_seconds", cron="housekeeping"):
+                self.generate_daily_housekeeping(auto_commit=True)
+
+    @api.model
+    def _get_housekeeping_team(self):
+        return self.env["crm.team"].search([("name", "=", "Housekeeping")], limit=1)
+
+    @api.model
+    def _prepare_daily_housekeeping_vals(self):
+        """Housekeeping values of every allotted line, read with one query.
+
+        Only one task per room is prepared, and rooms that already have an
+        open (not completed) task are skipped.
+
+        :return: tuple (vals_list, number of allotted lines skipped)
+        """
+        self.flush_model(["status_bar", "order_id"])
+        self.env["hotel.booking.line"].flush_model(["booking_id", "product_id"])
+        self.env["hotel.housekeeping"].flush_model(["room_id", "state"])
+        self.env["sale.order"].flush_model(["user_id"])
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT ON (line.product_id)
+                   line.id, line.product_id, sale_order.user_id,
+                   EXISTS (
+                       SELECT 1
+                         FROM hotel_housekeeping task
+                        WHERE task.room_id = line.product_id
+                          AND COALESCE(task.state, 'draft') != 'completed'
+                   ) AS has_open_task,
+                   COUNT(*) OVER () AS line_count
+              FROM hotel_booking_line line
+              JOIN hotel_booking booking ON booking.id = line.booking_id
+         LEFT JOIN sale_order ON sale_order.id = booking.order_id
+             WHERE booking.status_bar = 'allot'
+               AND line.product_id IS NOT NULL
+          ORDER BY line.product_id, line.id
+            """
+        )
+        rows = self.env.cr.fetchall()
+        team = self._get_housekeeping_team()
+        vals_list = [
+            {
+                "booking_line_id": line_id,
+                "state": "draft",
+                "room_id": room_id,
+                "responsible": user_id or False,
+                "team_id": team.id,
+            }
+            for line_id, room_id, user_id, has_open_task, _count in rows
+            if not has_open_task
+        ]
+        line_count = rows[0][4] if rows else 0
+        return vals_list, line_count - len(vals_list)
+
+    @api.model
+    def generate_daily_housekeeping(self, chunk_size=HOUSEKEEPING_CHUNK_SIZE, auto_commit=False):
+        """Create the housekeeping tasks of the day in batches.
+
+        Tasks are created with one ``create`` per chunk and linked to their
+        booking line with one update per chunk. With ``auto_commit`` every
+        chunk is committed, so a long run keeps its progress and does not
+        hold locks on the whole set.
+
+        :return: dict with the number of tasks created, allotted lines
+            skipped and chunks processed
+        """
+        vals_list, skipped = self._prepare_daily_housekeeping_vals()
+        Housekeeping = self.env["hotel.housekeeping"]
+        BookingLine = self.env["hotel.booking.line"]
+        created = chunks = 0
+        for chunk in split_every(chunk_size, vals_list, list):
+            tasks = Housekeeping.create(chunk)
+            BookingLine.flush_model(["housekeeping_id"])
+            self.env.cr.execute(
+                """
+                UPDATE hotel_booking_line line
+                   SET housekeeping_id = task.task_id
+                  FROM unnest(%s::int[], %s::int[]) AS task(line_id, task_id)
+                 WHERE line.id = task.line_id
+                """,
+                [[vals["booking_line_id"] for vals in chunk], tasks.ids],
+            )
+            lines = BookingLine.browse([vals["booking_line_id"] for vals in chunk])
+            lines.invalidate_recordset(["housekeeping_id"])
+            lines.modified(["housekeeping_id"])
+            created += len(tasks)
+            chunks += 1
+            if auto_commit:
+                self.env.cr.commit()
+        counts = {"created": created, "skipped": skipped, "chunks": chunks}
+        _logger.info("Daily housekeeping: %(created)s created, %(skipped)s skipped in %(chunks)s chunks", counts)
+        return counts
 
     def _default_pricelist_id(self):
         res = self.env["product.pricelist"].search(
@@ -53,12 +182,10 @@ class HotelBooking(models.Model):
 
     def action_add_rooms(self):
         self.ensure_one()
-        booking = self.env["hotel.booking"].search([])
         product_ids = self.env["product.product"].search([('product_tmpl_id.hotel_id', '!=', self.hotel_id.id)])
-
-        for line in booking:
-            if line.filter_booking_based_on_date(self.check_in, self.check_out):
-                product_ids += line.mapped("booking_line_ids.product_id")
+        product_ids |= self.env["hotel.room.availability"].get_booked_rooms(
+            self.check_in, self.check_out
+        )
 
         return {
             'name': 'Add Rooms',
@@ -373,107 +500,8 @@ class HotelBooking(models.Model):
                     raise UserError("Check-out date cannot be before Check-in date.")
 
     def get_dashboard_data(self, start_date, hotel_id=None):
-        hotels = self.env["hotel.hotels"].search_read([], ['name'])
-        room_domain = [("is_room_type", "=", True)]
-        booking_domain = [("create_date", ">=", start_date)]
-
-        if hotel_id:
-            room_domain.append(("hotel_id", "=", hotel_id))
-            booking_domain.append(("hotel_id", "=", hotel_id))
-
-        rooms = self.env["product.template"].search_read(
-            room_domain,
-            ["display_name", "list_price", "product_website_description"]
-        )
-        bookings = self.search(booking_domain)
-
-        today_date = datetime.today().date()
-        last_week_start = today_date - timedelta(days=today_date.weekday() + 7)
-        last_week_end = today_date - timedelta(days=today_date.weekday() + 1)
-
-        # Initialize revenue data and currency symbol
-        revenue_data = {"today": 0, "yesterday": 0, "last_week": 0}
-        currency_symbol = next(
-            (booking.currency_id.symbol for booking in bookings if booking.currency_id),
-            None,
-        )
-
-        # Count the total revenue for today, yesterday, and last week
-        for booking in bookings:
-            if booking.status_bar not in ["cancel", "draft"]:
-                check_in_date = fields.Date.from_string(booking.check_in)
-                if check_in_date == today_date:
-                    revenue_data["today"] += booking.total_amount
-                elif check_in_date == today_date - timedelta(days=1):
-                    revenue_data["yesterday"] += booking.total_amount
-                elif last_week_start <= check_in_date <= last_week_end:
-                    revenue_data["last_week"] += booking.total_amount
-
-        # Count bookings per city
-        city_booking_count = defaultdict(int)
-        for booking in bookings:
-            if booking.partner_id and booking.partner_id.state_id:
-                city_booking_count[booking.partner_id.state_id.name] += 1
-
-        # Generate map data
-        map_data = [
-            {
-                "city": f"{booking.partner_id.state_id.name} ({city_booking_count[booking.partner_id.state_id.name]}) bookings",
-                "latitude": booking.partner_id.partner_latitude,
-                "longitude": booking.partner_id.partner_longitude,
-            }
-            for booking in bookings
-            if booking.partner_id
-            and booking.partner_id.city
-            and booking.partner_id.partner_latitude
-            and booking.partner_id.partner_longitude
-        ]
-
-        # Fetch top 5 partners based on booking count
-        domain = [("partner_id", "!=", False)]
-        if hotel_id:
-            domain.append(("hotel_id", "=", hotel_id))
-
-        top_partners = self.read_group(
-            domain,
-            ["partner_id"],
-            ["partner_id"],
-            orderby="partner_id_count desc",
-            limit=5,
-        )
-
-        # Prepare top customers' data
-        top_customers = [
-            {
-                "name": self.env["res.partner"].browse(data["partner_id"][0]).name,
-                "steps": data["partner_id_count"],
-                "pictureSettings": {
-                    "src": f"/web/image/res.partner/{data['partner_id'][0]}/avatar_128"
-                },
-            }
-            for data in top_partners
-        ]
-
-        return {
-            "hotels": hotels,
-            "rooms": rooms,
-            "bookings": bookings.read(
-                [
-                    "status_bar",
-                    "check_in",
-                    "check_out",
-                    "partner_id",
-                    "total_amount",
-                    "currency_id",
-                    "booking_reference",
-                ]
-            ),
-            "booking_ids": bookings.ids,
-            "revenue": revenue_data,
-            "currency_symbol": currency_symbol,
-            "map_data": map_data,
-            "top_customers": top_customers,
-        }
+        """Dashboard overview, aggregated in SQL and cached per company/hotel/day."""
+        return self.env["hotel.booking.dashboard"].get_overview(start_date, hotel_id)
 
     def action_add_service(self):
         return {
@@ -654,95 +682,10 @@ class HotelBooking(models.Model):
     @api.model
     def fetch_data_for_dashboard(self, **kwargs):
         """fetch data for dashboard reload"""
-
-        fetch_data = {}
-        product = self.env["product.product"]
-        booking = self.env["hotel.booking"]
-        room_type_product = product.search(
-            [("is_room_type", "=", True), ("active", "=", True)]
-        )
-
-        today_date = datetime.combine(fields.Date.today(), datetime.min.time())
-        
-        scale = kwargs.get('scale', 'today')
-        if scale == 'today':
-            start_date = today_date
-            end_date = today_date + timedelta(days=1)
-        elif scale == 'week':
-            start_date = today_date - timedelta(days=today_date.weekday())
-            end_date = start_date + timedelta(weeks=1)
-        elif scale == 'month':
-            start_date = datetime(today_date.year, today_date.month, 1)
-            end_date = (start_date + timedelta(days=31)).replace(day=1)
-        elif scale == 'year':
-            start_date = datetime(today_date.year, 1, 1)
-            end_date = datetime(today_date.year + 1, 1, 1)
-        else:
-            start_date = today_date
-            end_date = today_date + timedelta(days=1)
-
-        # Fetching bookings based on the scale
-        today_booking = booking.search(
-            [
-                ("check_out", ">", start_date.date()),
-                ("check_in", "<=", end_date),
-                ("status_bar", "not in", ["initial", "checkout"]),
-            ]
-        )
-
-        booked_room = today_booking.mapped("booking_line_ids.product_id")
-        available_rooms = room_type_product - booked_room
-
-        fetch_data.update(
-            {
-                "booked_room": len(booked_room),
-                "available_rooms": len(available_rooms),
-                "booked_room_ids": booked_room.ids,
-            }
+        return self.env["hotel.booking.dashboard"].get_calendar_kpis(
+            kwargs.get("scale", "today"), kwargs.get("hotel_id")
         )
 
-        room_data = (
-            self.env["product.template"]
-            .sudo()
-            .search([["is_room_type", "=", True]])
-            .read(["name", "product_variant_count"])
-        )
-
-        # Check-ins and check-outs for the selected time range
-        current_date_check_in = self.search(
-            [
-                ("check_in", ">=", start_date),
-                ("check_in", "<", end_date),
-                ("status_bar", "not in", ["checkout", "cancel"]),
-            ]
-        )
-
-        current_date_check_out = self.search(
-            [
-                ("check_out", ">=", start_date),
-                ("check_out", "<", end_date),
-                ("status_bar", "=", "allot"),
-            ]
-        )
-
-        # Bookings that need confirmation (draft orders)
-        bookings_to_confirm = self.env['hotel.booking'].search([
-            ('status_bar', '=', 'initial'),
-        ])
-
-        fetch_data.update(
-            {
-                "room_data": room_data,
-                "check_in_booking": current_date_check_in.ids,
-                "check_out_booking": current_date_check_out.ids,
-                "current_date_check_in": len(current_date_check_in),
-                "current_date_check_out": len(current_date_check_out),
-                "bookings_to_confirm": bookings_to_confirm.ids,
-            }
-        )
-        
-        return fetch_data
-
     def get_booked_and_available_rooms(self, selected_date):
         """method will use to calculate booked and available rooms"""
         product = self.env["product.product"]
@@ -975,8 +918,17 @@ class HotelBooking(models.Model):
                     "hotel.booking", sequence_date=seq_date
                 ) or _("New")
 
+        self.env["website"]._clear_shop_availability_cache()
+        self.env["hotel.booking.dashboard"]._clear_dashboard_cache()
         return super().create(vals_list)
 
+    def write(self, vals):
+        if SHOP_AVAILABILITY_FIELDS.intersection(vals):
+            self.env["website"]._clear_shop_availability_cache()
+        if DASHBOARD_FIELDS.intersection(vals):
+            self.env["hotel.booking.dashboard"]._clear_dashboard_cache()
+        return super().write(vals)
+
     def _valid_field_parameter(self, field, name):
         return name == "tracking" or super()._valid_field_parameter(field, name)
 
@@ -1078,7 +1030,7 @@ class HotelBooking(models.Model):
 
     def create_housekeeping(self):
         housekeeping_model = self.env["hotel.housekeeping"]
-        team_id = self.env["crm.team"].search([("name", "=", "Housekeeping")])
+        team_id = self._get_housekeeping_team()
         for line_id in self.booking_line_ids:
             rec = housekeeping_model.create(
                 {
@@ -1421,6 +1373,8 @@ class HotelBooking(models.Model):
                         "Please Cancel the booking before deleting."
                     )
                 )
+        self.env["website"]._clear_shop_availability_cache()
+        self.env["hotel.booking.dashboard"]._clear_dashboard_cache()
         return super().unlink()
 
     @api.depends('pricelist_id', 'company_id')
@@ -1442,8 +1396,8 @@ class HotelBookingLine(models.Model):
         default=lambda self: _("New"),
     )
     image_1920 = fields.Image(related="product_id.image_1920")
-    product_id = fields.Many2one("product.product", string="Rooms")
-    booking_id = fields.Many2one("hotel.booking", readonly=True, copy=False)
+    product_id = fields.Many2one("product.product", string="Rooms", index=True)
+    booking_id = fields.Many2one("hotel.booking", readonly=True, copy=False, index=True)
     guest_info_ids = fields.One2many(
         "guest.info", "booking_line_id", string="Members", required=True
     )
@@ -1527,6 +1481,9 @@ class HotelBookingLine(models.Model):
 
     def write(self, vals):
         self.ensure_one()
+        if {"product_id", "booking_id"}.intersection(vals):
+            self.env["website"]._clear_shop_availability_cache()
+            self.env["hotel.booking.dashboard"]._clear_dashboard_cache()
         rec = super().write(vals)
         if self.sale_order_line_id:
             self.sale_order_line_id.write({
@@ -1559,7 +1516,14 @@ class HotelBookingLine(models.Model):
                 vals["booking_sequence_id"] = self.env["ir.sequence"].next_by_code(
                     "hotel.booking.line"
                 ) or _("New")
+        self.env["website"]._clear_shop_availability_cache()
+        self.env["hotel.booking.dashboard"]._clear_dashboard_cache()
         return super().create(vals_list)
+
+    def unlink(self):
+        self.env["website"]._clear_shop_availability_cache()
+        self.env["hotel.booking.dashboard"]._clear_dashboard_cache()
+        return super().unlink()
     
     @api.onchange("product_id")
     def _onchange_product_id_set_taxes(self):
@@ -18,6 +18,8 @@ from odoo import fields, models, api
 from odoo.exceptions import UserError
 import logging
 
+from ..tools.metrics import metrics
+
 _logger = logging.getLogger(__name__)
 
 
@@ -54,11 +56,12 @@ class ProductTemplate(models.Model):
 
     def reset_trending_room(self):
         # use sql or orm to set count to 0
-        rec = (
-            self.env["product.template"].sudo().search(
-                [(("is_room_type", "=", True))])
-        )
-        rec.write({"count": 0})
+        with metrics.timer("hotel_cron_duration_seconds", cron="trending_reset"):
+            rec = (
+                self.env["product.template"].sudo().search(
+                    [(("is_room_type", "=", True))])
+            )
+            rec.write({"count": 0})
 
     @api.model
     def get_room_multiline_policy_description(self):
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+##########################################################################
+# Author : Webkul Software Pvt. Ltd. (<https://webkul.com/>;)
+# Copyright(c): 2017-Present Webkul Software Pvt. Ltd.
+# All Rights Reserved.
+#
+#
+#
+# This program is copyright property of the author mentioned above.
+# You can`t redistribute it and/or modify it.
+#
+#
+# You should have received a copy of the License along with this program.
+# If not, see <https://store.webkul.com/license.html/>;
+##########################################################################
+from datetime import datetime, time, timedelta
+
+from odoo import api, fields, models, _
+from odoo.exceptions import ValidationError
+
+# Occupancy interval of a booking. It must stay identical to the expression
+# of the GiST index created in ``hotel.booking.init`` so PostgreSQL can use it.
+# Same-time (day use) bookings occupy at least one second, an empty range
+# would never overlap anything and the room could be allotted twice.
+OCCUPANCY_RANGE_SQL = (
+    "tsrange({alias}check_in, "
+    "GREATEST({alias}check_out, {alias}check_in + interval '1 second'), '[)')"
+)
+
+
+def occupancy_range(alias=""):
+    return OCCUPANCY_RANGE_SQL.format(alias=f"{alias}." if alias else "")
+
+
+class HotelRoomAvailability(models.AbstractModel):
+    """Room availability engine.
+
+    Answers "which rooms are booked/free between A and B" with a single
+    query on the indexed occupancy range of ``hotel.booking`` instead of
+    loading every booking and filtering it in Python.
+    """
+
+    _name = "hotel.room.availability"
+    _description = "Hotel Room Availability Engine"
+
+    def _get_non_blocking_states(self):
+        """Booking states that do not keep a room occupied."""
+        return ["cancel", "checkout"]
+
+    def _get_availability_window(self, check_in, check_out):
+        """Return the ``[start, end)`` interval to test for overlap.
+
+        Availability is checked by nights: a booking leaving on the arrival
+        day does not block the room, one arriving on the departure day does.
+        """
+        if not (check_in and check_out):
+            raise ValidationError(
+                _("Please fill the Check in and Check out Details !!")
+            )
+        check_in = fields.Datetime.to_datetime(check_in)
+        check_out = fields.Datetime.to_datetime(check_out)
+        start = datetime.combine(check_in.date() + timedelta(days=1), time.min)
+        end = datetime.combine(check_out.date() + timedelta(days=1), time.min)
+        return start, max(end, start + timedelta(days=1))
+
+    @api.model
+    def get_booked_room_ids(
+        self,
+        check_in,
+        check_out,
+        room_ids=None,
+        excluded_states=None,
+        exclude_booking_ids=None,
+    ):
+        """Ids of the ``product.product`` rooms occupied between the dates.
+
+        :param room_ids: only check these rooms (all rooms when ``None``)
+        :param excluded_states: booking states ignored, defaults to
+            :meth:`_get_non_blocking_states`
+        :param exclude_booking_ids: bookings ignored (e.g. the one being edited)
+        :return: set of product ids
+        """
+        start, end = self._get_availability_window(check_in, check_out)
+        if excluded_states is None:
+            excluded_states = self._get_non_blocking_states()
+
+        self.env["hotel.booking"].flush_model(["check_in", "check_out", "status_bar"])
+        self.env["hotel.booking.line"].flush_model(["booking_id", "product_id"])
+
+        query = f"""
+            SELECT DISTINCT line.product_id
+              FROM hotel_booking booking
+              JOIN hotel_booking_line line ON line.booking_id = booking.id
+             WHERE {occupancy_range("booking")} && tsrange(%s, %s, '[)')
+               AND line.product_id IS NOT NULL
+        """
+        params = [start, end]
+        if excluded_states:
+            query += " AND booking.status_bar NOT IN %s"
+            params.append(tuple(excluded_states))
+        if room_ids is not None:
+            if not room_ids:
+                return set()
+            query += " AND line.product_id IN %s"
+            params.append(tuple(room_ids))
+        if exclude_booking_ids:
+            query += " AND booking.id NOT IN %s"
+            params.append(tuple(exclude_booking_ids))
+
+        self.env.cr.execute(query, params)
+        return {row[0] for row in self.env.cr.fetchall()}
+
+    @api.model
+    def get_room_conflicts(self, requests, excluded_states=None):
+        """Bookings colliding with each requested ``(room_id, check_in, check_out)``.
+
+        All the requests are checked with a single query joined on an
+        ``unnest`` of their windows.
+
+        :param requests: list of ``(room_id, check_in, check_out)``
+        :param excluded_states: booking states ignored, defaults to
+            :meth:`_get_non_blocking_states`
+        :return: ``{request index: [booking values, ...]}`` for the requests
+            with at least one conflict
+        """
+        if not requests:
+            return {}
+        if excluded_states is None:
+            excluded_states = self._get_non_blocking_states()
+        windows = [
+            self._get_availability_window(check_in, check_out)
+            for _room_id, check_in, check_out in requests
+        ]
+
+        self.env["hotel.booking"].flush_model(
+            ["check_in", "check_out", "status_bar", "sequence_id"]
+        )
+        self.env["hotel.booking.line"].flush_model(["booking_id", "product_id"])
+
+        self.env.cr.execute(
+            f"""
+            SELECT request.idx, booking.id, booking.sequence_id,
+                   booking.check_in, booking.check_out, booking.status_bar
+              FROM unnest(%(indexes)s::int[], %(room_ids)s::int[],
+                          %(starts)s::timestamp[], %(ends)s::timestamp[])
+                   AS request(idx, room_id, start_at, end_at)
+              JOIN hotel_booking_line line ON line.product_id = request.room_id
+              JOIN hotel_booking booking ON booking.id = line.booking_id
+             WHERE {occupancy_range("booking")} && tsrange(request.start_at, request.end_at, '[)')
+               AND booking.status_bar NOT IN %(excluded)s
+          ORDER BY request.idx, booking.id
+            """,
+            {
+                "indexes": list(range(len(requests))),
+                "room_ids": [request[0] for request in requests],
+                "starts": [window[0] for window in windows],
+                "ends": [window[1] for window in windows],
+                "excluded": tuple(excluded_states or [""]),
+            },
+        )
+        conflicts = {}
+        for index, booking_id, sequence, check_in, check_out, state in self.env.cr.fetchall():
+            conflicts.setdefault(index, []).append({
+                "booking_id": booking_id,
+                "sequence_id": sequence,
+                "check_in": check_in,
+                "check_out": check_out,
+                "status_bar": state,
+            })
+        return conflicts
+
+    @api.model
+    def get_booked_rooms(self, check_in, check_out, **kwargs):
+        """Same as :meth:`get_booked_room_ids` but returns a recordset."""
+        return self.env["product.product"].browse(
+            self.get_booked_room_ids(check_in, check_out, **kwargs)
+        )
+
+    @api.model
+    def get_available_rooms(self, check_in, check_out, domain=None, **kwargs):
+        """Room products matching ``domain`` that are free between the dates."""
+        domain = list(domain or [("is_room_type", "=", True)])
+        booked_ids = self.get_booked_room_ids(check_in, check_out, **kwargs)
+        if booked_ids:
+            domain.append(("id", "not in", list(booked_ids)))
+        return self.env["product.product"].search(domain)
+
+    @api.model
+    def get_available_room_template_ids(
+        self, check_in, check_out, min_adult=0, min_child=0, excluded_states=None
+    ):
+        """Ids of the room types with at least one variant free between the dates.
+
+        Resolved with a single ``NOT EXISTS`` subquery on the indexed occupancy
+        range, without loading the booked rooms.
+        """
+        start, end = self._get_availability_window(check_in, check_out)
+        if excluded_states is None:
+            excluded_states = self._get_non_blocking_states()
+
+        self.env["hotel.booking"].flush_model(["check_in", "check_out", "status_bar"])
+        self.env["hotel.booking.line"].flush_model(["booking_id", "product_id"])
+        self.env["product.template"].flush_model(["is_room_type", "max_adult", "max_child"])
+
+        self.env.cr.execute(
+            f"""
+            SELECT DISTINCT product.product_tmpl_id
+              FROM product_product product
+              JOIN product_template tmpl ON tmpl.id = product.product_tmpl_id
+             WHERE tmpl.is_room_type
+               AND product.active
+               AND tmpl.max_adult >= %(min_adult)s
+               AND tmpl.max_child >= %(min_child)s
+               AND NOT EXISTS (
+                       SELECT 1
+                         FROM hotel_booking_line line
+                         JOIN hotel_booking booking ON booking.id = line.booking_id
+                        WHERE line.product_id = product.id
+                          AND {occupancy_range("booking")} && tsrange(%(start)s, %(end)s, '[)')
+                          AND booking.status_bar NOT IN %(excluded)s
+                   )
+            """,
+            {
+                "min_adult": min_adult,
+                "min_child": min_child,
+                "start": start,
+                "end": end,
+                "excluded": tuple(excluded_states or [""]),
+            },
+        )
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def is_room_available(self, room, check_in, check_out, **kwargs):
+        """Whether ``room`` (record or id) is free between the dates."""
+        room_id = room if isinstance(room, int) else room.id
+        return not self.get_booked_room_ids(
+            check_in, check_out, room_ids=[room_id], **kwargs
+        )
+
+    @api.model
+    def allocate_rooms(self, rooms, check_in, check_out, quantity=None, exclude_room_ids=None, **kwargs):
+        """Free rooms among ``rooms`` between the dates, keeping their order.
+
+        :param quantity: maximum number of rooms to return (all when ``None``)
+        :param exclude_room_ids: rooms to skip (e.g. the ones already in a cart)
+        :return: ``product.product`` recordset
+        """
+        skipped_ids = self.get_booked_room_ids(check_in, check_out, room_ids=rooms.ids, **kwargs)
+        skipped_ids |= set(exclude_room_ids or ())
+        free_rooms = rooms.filtered(lambda room: room.id not in skipped_ids)
+        return free_rooms if quantity is None else free_rooms[:quantity]
@@ -121,17 +121,15 @@ class SaleOrder(models.Model):
 
     def action_add_rooms(self):
         self.ensure_one()
-        booking = self.env["hotel.booking"].search([])
 
         if not self.hotel_id:
             raise ValidationError("Please add Hotel first to add Rooms.")
 
 
         product_ids = self.env["product.product"].search([('product_tmpl_id.hotel_id', '!=', self.hotel_id.id)])
-
-        for line in booking:
-            if line.filter_booking_based_on_date(self.hotel_check_in, self.hotel_check_out):
-                product_ids += line.mapped("booking_line_ids.product_id")
+        product_ids |= self.env["hotel.room.availability"].get_booked_rooms(
+            self.hotel_check_in, self.hotel_check_out
+        )
 
         if self.order_line:
             product_ids += self.order_line.mapped("product_id")
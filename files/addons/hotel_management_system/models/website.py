@@ -20,12 +20,27 @@ from odoo import api, fields, models, _lt
 from odoo.http import request
 from odoo.addons.website.models import ir_http
 
+from ..tools.cache import SharedCache
+
 _logger = logging.getLogger(__name__)
 
+# Room types available for a date-filtered shop listing, keyed by
+# (website, check_in, check_out, adult, child). Every booking change
+# invalidates it in all the workers.
+SHOP_AVAILABILITY_CACHE_TTL = 30
+SHOP_AVAILABILITY_CACHE_SIZE = 512
+shop_availability_cache = SharedCache(
+    "shop_availability", SHOP_AVAILABILITY_CACHE_TTL, SHOP_AVAILABILITY_CACHE_SIZE
+)
+
 
 class Website(models.Model):
     _inherit = "website"
 
+    def init(self):
+        super().init()
+        shop_availability_cache.init_generation(self.env.cr)
+
     def apply_cron(self):
         website_id = self.get_current_website()
         website_id.cron_id = self.env.ref(
@@ -57,10 +72,12 @@ class Website(models.Model):
 
         if is_frontend:
             if request.params.get("check_in", False) and request.params.get("check_out", False):
+                adult = int(request.params.get("adult", 0) or 0)
+                child = int(request.params.get("child", 0) or 0)
                 subdomain = [
                     ("is_room_type", "=", True),
-                    ('max_adult', '>=', int(request.params.get("adult", 0) or 0)),
-                    ('max_child', '>=', int(request.params.get("child", 0) or 0)),
+                    ('max_adult', '>=', adult),
+                    ('max_child', '>=', child),
                 ]
 
                 check_in = datetime.strptime(
@@ -70,14 +87,10 @@ class Website(models.Model):
                     request.params.get("check_out"), "%m/%d/%Y"
                 )
 
-                booking = request.env["hotel.booking"].search([])
-                all_room_type_products = request.env["product.product"].search(
-                    subdomain)
-                filtered_booking = booking.filter_booking_based_on_date(
-                    check_in, check_out)
-                available_rooms = (all_room_type_products - filtered_booking.mapped(
-                    "booking_line_ids.product_id")).mapped("product_tmpl_id")
-                domain = [("id", "in", available_rooms.ids)]
+                available_template_ids = self._get_available_room_template_ids(
+                    check_in, check_out, adult, child
+                )
+                domain = [("id", "in", available_template_ids)]
                 subdomain = ["&"] + subdomain + domain
 
         if subdomain:
@@ -85,6 +98,21 @@ class Website(models.Model):
         else:
             return super(Website, self).sale_product_domain()
 
+    def _get_available_room_template_ids(self, check_in, check_out, adult=0, child=0):
+        """Room types with a free room between the dates, cached for a few seconds."""
+        return shop_availability_cache.get_or_compute(
+            self.env.cr,
+            (self.id, check_in, check_out, adult, child),
+            lambda: self.env["hotel.room.availability"].sudo().get_available_room_template_ids(
+                check_in, check_out, min_adult=adult, min_child=child
+            ),
+        )
+
+    @api.model
+    def _clear_shop_availability_cache(self):
+        """Drop the cached shop availability of the current database in every worker."""
+        shop_availability_cache.invalidate(self.env.cr)
+
     @api.model
     def hotel_management_system_snippet_data(self):
         default_website = self.env["website"].search([], limit=1)
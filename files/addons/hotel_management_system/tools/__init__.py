@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+##########################################################################
+# Author : Webkul Software Pvt. Ltd. (<https://webkul.com/>;)
+# Copyright(c): 2017-Present Webkul Software Pvt. Ltd.
+# All Rights Reserved.
+#
+#
+#
+# This program is copyright property of the author mentioned above.
+# You can`t redistribute it and/or modify it.
+#
+#
+# You should have received a copy of the License along with this program.
+# If not, see <https://store.webkul.com/license.html/>;
+##########################################################################
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+##########################################################################
+# Author : Webkul Software Pvt. Ltd. (<https://webkul.com/>;)
+# Copyright(c): 2017-Present Webkul Software Pvt. Ltd.
+# All Rights Reserved.
+#
+#
+#
+# This program is copyright property of the author mentioned above.
+# You can`t redistribute it and/or modify it.
+#
+#
+# You should have received a copy of the License along with this program.
+# If not, see <https://store.webkul.com/license.html/>;
+##########################################################################
+"""In-process LRU caches with TTL shared by the threads of a worker and
+invalidated across the prefork workers.
+
+Each cache has a generation counter per database: a PostgreSQL sequence
+created by the ``init`` of the model owning the cache. Entries remember the
+generation read before computing them and are only served while it is still
+the current one, so ``invalidate`` drops the entries of every worker at once.
+
+Reading the generation is one query per lookup. Caches that must serve hits
+without any query pass a ``check_interval``: each worker then reads the
+generation at most once per interval and database, so invalidations made by
+other workers are seen within that delay (immediately in the worker that
+invalidates).
+
+Sequences are not transactional: ``invalidate`` bumps the generation right
+away (the current transaction no longer sees its stale entries) and again
+after the commit, so entries computed by other workers from the data preceding
+the commit are not served either. The caches invalidated by a transaction are
+bumped together, in one query on the committing cursor. On rollback, only the
+entries this worker computed from the rolled back data have to go: other
+workers never saw it, so they are dropped locally.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from .metrics import metrics
+
+# cr.postcommit.data key of the caches invalidated in the transaction
+PENDING_KEY = "hotel_cache_invalidate"
+
+
+def _bump_generations(cr, caches):
+    """Bump the generation of ``caches`` in one query."""
+    cr.execute(
+        "SELECT nextval(sequence::regclass) FROM unnest(%s::text[]) AS sequence",
+        [[cache.sequence for cache in caches]],
+    )
+    for cache in caches:
+        with cache._lock:
+            cache._generations.pop(cr.dbname, None)
+            cache.invalidations += 1
+
+
+class SharedCache:
+    """Locked LRU cache with TTL: key -> value, per database."""
+
+    def __init__(self, name, ttl, max_size, check_interval=0):
+        assert re.fullmatch(r"[a-z_]+", name), "invalid cache name %r" % name
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self.check_interval = check_interval
+        self.sequence = "hotel_cache_%s_generation" % name
+        self._entries = OrderedDict()
+        # database -> (checked_at, generation), with check_interval
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def init_generation(self, cr):
+        """Create the generation sequence, called from a model ``init``."""
+        cr.execute("CREATE SEQUENCE IF NOT EXISTS %s" % self.sequence)
+
+    def _get_generation(self, cr):
+        now = time.monotonic()
+        if self.check_interval:
+            with self._lock:
+                checked = self._generations.get(cr.dbname)
+            if checked and now - checked[0] < self.check_interval:
+                return checked[1]
+        cr.execute("SELECT last_value FROM %s" % self.sequence)
+        generation = cr.fetchone()[0]
+        if self.check_interval:
+            with self._lock:
+                self._generations[cr.dbname] = (now, generation)
+        return generation
+
+    def get_or_compute(self, cr, key, compute):
+        """Cached value of ``key``, computing and caching it on a miss.
+
+        None results are returned but not cached.
+        """
+        generation = self._get_generation(cr)
+        entry_key = (cr.dbname, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry and entry[0] > time.monotonic() and entry[1] == generation:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                value = entry[2]
+            else:
+                if entry:
+                    del self._entries[entry_key]
+                self.misses += 1
+                value = None
+        if value is not None:
+            metrics.inc("hotel_cache_hits", cache=self.name)
+            return value
+
+        metrics.inc("hotel_cache_misses", cache=self.name)
+        value = compute()
+        if value is not None:
+            self._set(entry_key, value, generation)
+            pending = cr.postcommit.data.get(PENDING_KEY)
+            if pending and self.name in pending["caches"]:
+                # computed from data this transaction may still roll back
+                pending["filled"].add(self.name)
+        return value
+
+    def _set(self, entry_key, value, generation):
+        with self._lock:
+            self._entries[entry_key] = (time.monotonic() + self.ttl, generation, value)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, cr):
+        """Drop the entries of the database of ``cr`` in every worker."""
+        _bump_generations(cr, [self])
+        pending = cr.postcommit.data.get(PENDING_KEY)
+        if pending is None:
+            pending = cr.postcommit.data[PENDING_KEY] = {"caches": {}, "filled": set()}
+            dbname = cr.dbname
+
+            def drop_filled():
+                for name in pending["filled"]:
+                    pending["caches"][name]._drop(dbname)
+
+            cr.postcommit.add(lambda: _bump_generations(cr, list(pending["caches"].values())))
+            cr.postrollback.add(drop_filled)
+        pending["caches"][self.name] = self
+
+    def _drop(self, dbname):
+        """Drop the entries of ``dbname`` in this worker."""
+        with self._lock:
+            for entry_key in [key for key in self._entries if key[0] == dbname]:
+                del self._entries[entry_key]
+
+    def clear(self):
+        """Drop every entry of this worker."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
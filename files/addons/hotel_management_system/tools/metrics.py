@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+##########################################################################
+# Author : Webkul Software Pvt. Ltd. (<https://webkul.com/>;)
+# Copyright(c): 2017-Present Webkul Software Pvt. Ltd.
+# All Rights Reserved.
+#
+#
+#
+# This program is copyright property of the author mentioned above.
+# You can`t redistribute it and/or modify it.
+#
+#
+# You should have received a copy of the License along with this program.
+# If not, see <https://store.webkul.com/license.html/>;
+##########################################################################
+"""Process-shared counters and histograms for the hotel addons.
+
+Every worker accumulates its increments in memory and adds them to a small
+SQLite file at most every ``METRICS_FLUSH_INTERVAL`` seconds, so the values
+read by the metrics endpoint are the totals of all the prefork workers, not
+only of the worker serving the scrape.
+
+The file lives in the ``hotel_metrics_dir`` option of the Odoo config file,
+or in the system temporary directory (use a tmpfs in production). It is
+shared by every database of the server, so each sample carries a ``db``
+label (the database of the current request or cron) and ``collect`` can be
+restricted to one database. The buffer is also flushed when the worker
+exits, so recycled workers do not lose their last increments.
+"""
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+METRICS_FLUSH_INTERVAL = 5
+METRICS_FILE_NAME = "hotel_metrics.sqlite"
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# name -> (type, help) of every known metric family
+METRIC_FAMILIES = {
+    "hotel_api_request_duration_seconds": ("histogram", "Latency of the hotel API endpoints"),
+    "hotel_api_requests": ("counter", "Requests served by the hotel API endpoints"),
+    "hotel_api_errors": ("counter", "Errors returned by handle_api_errors, by kind"),
+    "hotel_api_sql_queries": ("counter", "SQL queries executed by the hotel API endpoints"),
+    "hotel_cache_hits": ("counter", "Hits of the hotel in-process caches"),
+    "hotel_cache_misses": ("counter", "Misses of the hotel in-process caches"),
+    "hotel_cron_duration_seconds": ("histogram", "Duration of the hotel scheduled actions"),
+}
+
+
+def _with_db(labels):
+    """Add the database of the current request or cron to ``labels``."""
+    dbname = getattr(threading.current_thread(), "dbname", None)
+    return dict(labels, db=dbname) if dbname else labels
+
+
+def _format_labels(labels):
+    return json.dumps(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricsRegistry:
+    """Counters buffered per process and summed in a shared SQLite file."""
+
+    def __init__(self, flush_interval=METRICS_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = defaultdict(float)
+        self._last_flush = time.monotonic()
+        self._connection = None
+        self._pid = None
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def inc(self, name, value=1, **labels):
+        """Add ``value`` to the counter ``name`` (without the ``_total`` suffix)."""
+        labels = _with_db(labels)
+        with self._lock:
+            self._pending[(f"{name}_total", _format_labels(labels))] += value
+        self._maybe_flush()
+
+    def observe(self, name, seconds, **labels):
+        """Record one observation of the histogram ``name``."""
+        labels = _with_db(labels)
+        with self._lock:
+            for bound in LATENCY_BUCKETS:
+                if seconds <= bound:
+                    self._pending[(f"{name}_bucket", _format_labels(dict(labels, le=bound)))] += 1
+            self._pending[(f"{name}_bucket", _format_labels(dict(labels, le="+Inf")))] += 1
+            self._pending[(f"{name}_sum", _format_labels(labels))] += seconds
+            self._pending[(f"{name}_count", _format_labels(labels))] += 1
+        self._maybe_flush()
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the duration of the ``with`` block in the histogram ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    # ------------------------------------------------------------------
+    # Shared storage
+    # ------------------------------------------------------------------
+
+    def _get_path(self):
+        directory = config.get("hotel_metrics_dir") or tempfile.gettempdir()
+        return os.path.join(directory, METRICS_FILE_NAME)
+
+    def _get_connection(self):
+        # Forked workers must not share the connection of their parent
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self._get_path(), timeout=5, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS metric (
+                       name TEXT NOT NULL,
+                       labels TEXT NOT NULL,
+                       value REAL NOT NULL,
+                       PRIMARY KEY (name, labels)
+                   )"""
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Add the increments buffered by this process to the shared file."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(float)
+            self._last_flush = time.monotonic()
+            if not pending:
+                return
+            rows = [(name, labels, value) for (name, labels), value in pending.items()]
+            try:
+                with self._get_connection() as connection:
+                    connection.executemany(
+                        """INSERT INTO metric (name, labels, value) VALUES (?, ?, ?)
+                           ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value""",
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                _logger.warning("Could not flush the hotel metrics: %s", e)
+                # Keep the increments for the next flush
+                for key, value in pending.items():
+                    self._pending[key] += value
+
+    def collect(self, db=None):
+        """Totals of every sample of all the workers.
+
+        :param db: only return the samples of this database
+        :return: ``{sample name: [(labels dict, value), ...]}``
+        """
+        self.flush()
+        samples = defaultdict(list)
+        with self._lock:
+            try:
+                rows = self._get_connection().execute(
+                    "SELECT name, labels, value FROM metric ORDER BY name, labels"
+                ).fetchall()
+            except sqlite3.Error as e:
+                _logger.warning("Could not read the hotel metrics: %s", e)
+                rows = []
+        for name, labels, value in rows:
+            labels = dict(json.loads(labels))
+            if db and labels.get("db") != db:
+                continue
+            samples[name].append((labels, value))
+        return samples
+
+
+metrics = MetricsRegistry()
+atexit.register(metrics.flush)
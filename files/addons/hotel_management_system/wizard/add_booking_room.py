@@ -42,13 +42,11 @@ class ADDROOM(models.TransientModel):
         if (check_in or check_out) is False:
             raise UserError(_("Please select Check in/out date first..."))
 
-        booking = self.env["hotel.booking"].search([])
         product_ids = self.env["product.product"].search(
             [('hotel_id', '!=', active_booking_id.hotel_id.id)])
-
-        for line in booking:
-            if line.filter_booking_based_on_date(check_in, check_out):
-                product_ids += line.mapped("booking_line_ids.product_id")
+        product_ids |= self.env["hotel.room.availability"].get_booked_rooms(
+            check_in, check_out
+        )
         self.write({"booked_booking_ids": product_ids})
 
     available_room_ids = fields.Many2many(
@@ -58,12 +58,11 @@ class ExchangeRoom(models.TransientModel):
 
             check_in = active_booking.check_in
             check_out = active_booking.check_out
-            booking = self.env['hotel.booking'].search([])
-
-            product_ids = self.env['product.product'].search([("product_tmpl_id.is_published", "=", True), ("product_tmpl_id.is_room_type", "=", True), ('hotel_id', '=', active_booking.hotel_id.id)])
-            if booking:
-                booked_booking_ids = booking.filter_booking_based_on_date(check_in, check_out)
-                return product_ids - booked_booking_ids.mapped('booking_line_ids.product_id')
+            product_ids = self.env['hotel.room.availability'].get_available_rooms(
+                check_in,
+                check_out,
+                [("product_tmpl_id.is_published", "=", True), ("product_tmpl_id.is_room_type", "=", True), ('hotel_id', '=', active_booking.hotel_id.id)],
+            )
 
             # Now we want to show all type of available rooms at the time of exchange
 
@@ -19,6 +19,7 @@
         "security/ir.model.access.csv",
         "data/product_data.xml",
         "data/mail_template_data.xml",
+        "data/ir_cron_data.xml",
         "views/calendar_views.xml",
         "views/hotel_booking_extension_views.xml",
         "views/price_change_wizard_views.xml",
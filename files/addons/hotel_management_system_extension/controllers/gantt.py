@@ -53,6 +53,36 @@ class ReservationGanttController(http.Controller):
             _logger.error(f"Error en get_gantt_data: {str(e)}")
             return {'success': False, 'error': str(e)}
 
+    @http.route('/hotel/gantt_matrix', type='json', auth='user')
+    def get_gantt_matrix(self, **kwargs):
+        """
+        Matriz compacta de ocupación habitación × día para cualquier ventana.
+        Alternativa ligera a /hotel/gantt_data: sin límite de filas y sin un dict por reserva.
+        """
+        try:
+            target_date_str = kwargs.get('target_date')
+            target_date = date.fromisoformat(target_date_str) if target_date_str else date.today()
+            date_from = date.fromisoformat(kwargs['date_from']) if kwargs.get('date_from') else target_date.replace(day=1)
+            date_to = (
+                date.fromisoformat(kwargs['date_to'])
+                if kwargs.get('date_to')
+                else (date_from.replace(day=1) + timedelta(days=32)).replace(day=1)
+            )
+
+            hotel_id = kwargs.get('hotel_id')
+            try:
+                hotel_id = int(hotel_id) if hotel_id else None
+            except (ValueError, TypeError):
+                hotel_id = None
+
+            matrix = request.env['hotel.room.availability'].get_occupancy_matrix(
+                date_from, date_to, hotel_id=hotel_id
+            )
+            return dict(matrix, success=True)
+        except Exception as e:
+            _logger.error(f"Error en get_gantt_matrix: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
     def _get_or_create_default_partner(self):
         """
         Obtiene o crea un cliente por defecto para reservas rápidas.
@@ -1,6 +1,6 @@
 import logging
 from typing import Dict, List, Any, Optional
-from datetime import datetime, date, timezone
+from datetime import datetime, date
 from odoo import http, fields
 from odoo.http import request
 
@@ -70,31 +70,6 @@ ROOM_STATES = {
     }
 }
 
-# Mapeo directo de estados de reserva - UNIFICADO CON RESERVATION_GANTT
-BOOKING_TO_ROOM_STATE = {
-    # Estados principales del Gantt - MAPPING DIRECTO
-    'initial': 'initial',           # BORRADOR → BORRADOR
-    'confirmed': 'confirmed',       # CONFIRMADA → CONFIRMADA
-    'checkin': 'checkin',           # CHECK-IN → CHECK-IN
-    'checkout': 'checkout',         # CHECK-OUT → CHECK-OUT
-    'cleaning_needed': 'cleaning_needed', # LIMPIEZA NECESARIA → LIMPIEZA NECESARIA
-    'room_ready': 'room_ready',     # HABITACION LISTA → HABITACION LISTA
-    'cancelled': 'cancelled',       # CANCELADA → CANCELADA
-    'no_show': 'no_show',           # NO SE PRESENTO → NO SE PRESENTO
-    
-    # Estados legacy (compatibilidad) - Mapeados a estados del Gantt
-    'draft': 'initial',             # draft → initial (BORRADOR)
-    'confirm': 'confirmed',         # confirm → confirmed (CONFIRMADA)
-    'allot': 'checkin',             # allot → checkin (CHECK-IN)
-    'check_in': 'checkin',          # check_in → checkin (CHECK-IN)
-    'checkout_pending': 'checkout', # checkout_pending → checkout (CHECK-OUT)
-    'pending': 'confirmed',         # pending → confirmed (CONFIRMADA)
-    'room_assigned': 'checkin',     # room_assigned → checkin (CHECK-IN)
-    'cancel': 'cancelled',          # cancel → cancelled (CANCELADA)
-    'done': 'room_ready'            # done → room_ready (HABITACION LISTA)
-}
-
-
 class RoomPanelControllerExtension(http.Controller):
     
     def _get_or_create_default_partner(self):
@@ -212,8 +187,20 @@ class RoomPanelControllerExtension(http.Controller):
                 'connected_booking_id': booking.connected_booking_id.id if booking.connected_booking_id else None,
                 'is_room_change_origin': booking.is_room_change_origin,
                 'is_room_change_destination': booking.is_room_change_destination,
-                'has_room_change': bool(booking.split_from_booking_id or booking.connected_booking_id)
+                'has_room_change': bool(booking.split_from_booking_id or booking.connected_booking_id),
+                'chain_root_id': booking.chain_root_id.id or booking.id,
             }
+
+            # Cadena completa de cambios (una sola consulta recursiva)
+            chain = booking._get_room_change_chains().get(booking.id, booking)
+            room_change_info['chain'] = [{
+                'id': chain_booking.id,
+                'sequence_id': chain_booking.sequence_id,
+                'check_in': chain_booking.check_in.isoformat() if chain_booking.check_in else None,
+                'check_out': chain_booking.check_out.isoformat() if chain_booking.check_out else None,
+                'status': chain_booking.status_bar,
+                'is_current': chain_booking.id == booking.id,
+            } for chain_booking in chain]
             
             # Si tiene reserva original, obtener información adicional
             if booking.split_from_booking_id:
@@ -441,299 +428,12 @@ class RoomPanelControllerExtension(http.Controller):
 
     def _calculate_room_states(self, room_ids: List[int]) -> Dict[int, Dict[str, Any]]:
         """
-        Calcula el estado actual de cada habitación basado en las reservas activas.
-        Versión simplificada para evitar errores de transacción.
+        Obtiene el estado actual de cada habitación desde hotel.room.state,
+        que se mantiene de forma incremental al modificar las reservas.
         """
-        room_states = {}
-        
         if not room_ids:
-            return room_states
-
-        # Inicializar todas las habitaciones como room_ready (IDÉNTICO AL GANTT)
-        self._initialize_room_states(room_states, room_ids)
-
-        # PASO 1: Procesar reservas canceladas
-        self._process_cancelled_reservations(room_states, room_ids)
-
-        # PASO 2: Procesar todas las reservas activas
-        self._process_active_reservations(room_states, room_ids)
-
-        return room_states
-
-    def _initialize_room_states(self, room_states: Dict[int, Dict[str, Any]], room_ids: List[int]) -> None:
-        """Inicializa los estados de las habitaciones"""
-        for room_id in room_ids:
-            room_states[room_id] = {
-                'status': 'room_ready',
-                'current_reservation': None,
-                'next_reservation': None
-            }
-
-    def _process_cancelled_reservations(self, room_states: Dict[int, Dict[str, Any]], room_ids: List[int]) -> None:
-        """Procesa las reservas canceladas para convertirlas a room_ready"""
-        try:
-            cancelled_query = """
-                SELECT DISTINCT pp.product_tmpl_id as room_id
-                FROM hotel_booking_line hbl
-                JOIN hotel_booking hb ON hbl.booking_id = hb.id
-                JOIN product_product pp ON hbl.product_id = pp.id
-                WHERE pp.product_tmpl_id = ANY(%s)
-                    AND hb.status_bar = 'cancel'
-            """
-            
-            request.env.cr.execute(cancelled_query, [room_ids])
-            cancelled_results = request.env.cr.dictfetchall()
-            
-            # Forzar todas las habitaciones con reservas canceladas a room_ready
-            for cancelled_row in cancelled_results:
-                cancelled_room_id = cancelled_row['room_id']
-                if cancelled_room_id in room_states:
-                    room_states[cancelled_room_id].update({
-                        'status': 'room_ready',
-                        'current_reservation': None,
-                        'next_reservation': None
-                    })
-                    
-        except Exception as e:
-            _logger.error("Error procesando reservas canceladas: %s", e)
-
-    def _process_active_reservations(self, room_states: Dict[int, Dict[str, Any]], room_ids: List[int]) -> None:
-        """Procesa todas las reservas activas"""
-        try:
-            # Usar una consulta más simple y directa
-            # ADAPTADO: Incluir información de vínculos de cambio de habitación
-            all_reservations_query = """
-                SELECT DISTINCT 
-                    pp.product_tmpl_id as room_id,
-                    hb.id as booking_id,
-                    hb.check_in,
-                    hb.check_out,
-                    hb.status_bar,
-                    rp.name as guest_name,
-                    hbl.product_id as product_product_id,
-                    hb.split_from_booking_id,
-                    hb.connected_booking_id,
-                    hb.is_room_change_origin,
-                    hb.is_room_change_destination
-                FROM hotel_booking_line hbl
-                JOIN hotel_booking hb ON hbl.booking_id = hb.id
-                JOIN product_product pp ON hbl.product_id = pp.id
-                LEFT JOIN res_partner rp ON hb.partner_id = rp.id
-                WHERE pp.product_tmpl_id = ANY(%s)
-                    AND hb.status_bar NOT IN ('cancel', 'cancelled')
-                ORDER BY pp.product_tmpl_id, hb.check_in
-            """
-            
-            request.env.cr.execute(all_reservations_query, [room_ids])
-            all_results = request.env.cr.dictfetchall()
-            
-            # Procesar cada reserva
-            for row in all_results:
-                self._process_single_reservation(row, room_states)
-                
-        except Exception as e:
-            _logger.error("Error calculando estados de habitaciones: %s", e, exc_info=True)
-            # En caso de error, mantener estados por defecto
-            for room_id in room_ids:
-                if room_id not in room_states:
-                    room_states[room_id] = {
-                        'status': 'room_ready',
-                        'current_reservation': None,
-                        'next_reservation': None
-                    }
-
-    def _process_single_reservation(self, row: Dict[str, Any], room_states: Dict[int, Dict[str, Any]]) -> None:
-        """Procesa una reserva individual"""
-        room_id = row['room_id']
-        if room_id not in room_states:
-            return
-            
-        checkin_date = row['check_in']
-        checkout_date = row['check_out']
-        booking_status = row['status_bar']
-        
-        # Normalizar fechas
-        try:
-            checkin_dt, checkout_dt = self._normalize_reservation_dates(checkin_date, checkout_date)
-            if not checkin_dt or not checkout_dt:
-                return
-                
-            # Convertir a zona del usuario para mostrar
-            local_checkin_dt = fields.Datetime.context_timestamp(request.env.user, checkin_dt)
-            local_checkout_dt = fields.Datetime.context_timestamp(request.env.user, checkout_dt)
-            local_checkin_str = local_checkin_dt.strftime('%Y-%m-%dT%H:%M:%S')
-            local_checkout_str = local_checkout_dt.strftime('%Y-%m-%dT%H:%M:%S')
-            
-            # ADAPTADO: Crear payload de reserva con información de vínculos
-            reservation_payload = {
-                'id': row['booking_id'],
-                'guest_name': row['guest_name'] or 'Huésped',
-                'status': booking_status,
-                'checkin_date': local_checkin_str,
-                'checkout_date': local_checkout_str,
-                # Información de vínculos de cambio de habitación
-                'split_from_booking_id': row.get('split_from_booking_id'),
-                'connected_booking_id': row.get('connected_booking_id'),
-                'is_room_change_origin': row.get('is_room_change_origin', False),
-                'is_room_change_destination': row.get('is_room_change_destination', False),
-                'is_room_change': bool(row.get('split_from_booking_id') or row.get('connected_booking_id'))
-            }
-            
-            # Procesar según el tipo de estado
-            self._update_room_state_by_booking_status(
-                room_id, booking_status, checkin_dt, checkout_dt, 
-                reservation_payload, room_states
-            )
-            
-        except Exception as e:
-            _logger.warning("Error procesando fechas para habitación %s: %s", room_id, e)
-
-    def _normalize_reservation_dates(self, checkin_date, checkout_date):
-        """Normaliza las fechas de reserva a datetime UTC"""
-        try:
-            # Normalizar checkin
-            if isinstance(checkin_date, str):
-                checkin_dt = datetime.fromisoformat(checkin_date.replace(' ', 'T').replace('Z', '+00:00'))
-                if checkin_dt.tzinfo is not None:
-                    checkin_dt = checkin_dt.astimezone(timezone.utc).replace(tzinfo=None)
-            else:
-                checkin_dt = checkin_date
-
-            # Normalizar checkout
-            if isinstance(checkout_date, str):
-                checkout_dt = datetime.fromisoformat(checkout_date.replace(' ', 'T').replace('Z', '+00:00'))
-                if checkout_dt.tzinfo is not None:
-                    checkout_dt = checkout_dt.astimezone(timezone.utc).replace(tzinfo=None)
-            else:
-                checkout_dt = checkout_date
-
-            return checkin_dt, checkout_dt
-            
-        except Exception:
-            return None, None
-
-    def _handle_room_change_reservation(self, room_id: int, booking_status: str,
-                                      checkin_dt: datetime, checkout_dt: datetime,
-                                      reservation_payload: Dict[str, Any], 
-                                      room_states: Dict[int, Dict[str, Any]],
-                                      now_date, checkin_date_only, checkout_date_only, mapped_status) -> None:
-        """
-        Maneja la lógica especial para reservas con cambio de habitación.
-        ADAPTADO: Considera el cambio en el cálculo de fechas (original_end_date = change_start)
-        """
-        try:
-            # Para reservas que son origen de cambio (acortadas)
-            if reservation_payload.get('is_room_change_origin'):
-                # La reserva original se acorta y termina en change_start (no change_start - 1 día)
-                # Por lo tanto, si hoy es >= checkin_date y < checkout_date, está activa
-                if checkin_date_only <= now_date < checkout_date_only:
-                    room_states[room_id]['status'] = mapped_status
-                    room_states[room_id]['current_reservation'] = reservation_payload
-                    # Agregar indicador de que es reserva acortada
-                    reservation_payload['is_shortened_booking'] = True
-                return
-            
-            # Para reservas que son destino de cambio (nuevas)
-            if reservation_payload.get('is_room_change_destination'):
-                # La nueva reserva comienza en change_start y continúa hasta checkout
-                if checkin_date_only <= now_date <= checkout_date_only:
-                    room_states[room_id]['status'] = mapped_status
-                    room_states[room_id]['current_reservation'] = reservation_payload
-                    # Agregar indicador de que es reserva de continuación
-                    reservation_payload['is_continuation_booking'] = True
-                elif now_date < checkin_date_only and not room_states[room_id]['next_reservation']:
-                    room_states[room_id]['next_reservation'] = reservation_payload
-                    reservation_payload['is_continuation_booking'] = True
-                return
-            
-            # Para reservas con vínculo pero sin flags específicos (casos edge)
-            if reservation_payload.get('split_from_booking_id') or reservation_payload.get('connected_booking_id'):
-                # Aplicar lógica estándar pero con indicador de cambio
-                reservation_payload['has_room_change_link'] = True
-                # Continuar con lógica estándar...
-                
-        except Exception as e:
-            _logger.warning("Error manejando reserva con cambio de habitación: %s", e)
-            # En caso de error, aplicar lógica estándar
-            pass
-
-    def _update_room_state_by_booking_status(self, room_id: int, booking_status: str, 
-                                           checkin_dt: datetime, checkout_dt: datetime,
-                                           reservation_payload: Dict[str, Any], 
-                                           room_states: Dict[int, Dict[str, Any]]) -> None:
-        """Actualiza el estado de la habitación según el estado de la reserva"""
-        
-        now_date = fields.Date.context_today(request.env.user)
-        checkin_date_only = checkin_dt.date()
-        checkout_date_only = checkout_dt.date()
-        
-        # Mapear estado usando BOOKING_TO_ROOM_STATE
-        mapped_status = BOOKING_TO_ROOM_STATE.get(booking_status, booking_status)
-        
-        # ADAPTADO: Lógica especial para reservas con cambio de habitación
-        if reservation_payload.get('is_room_change'):
-            self._handle_room_change_reservation(
-                room_id, booking_status, checkin_dt, checkout_dt, 
-                reservation_payload, room_states, now_date, 
-                checkin_date_only, checkout_date_only, mapped_status
-            )
-            return
-        
-        # LÓGICA ESPECIAL PARA BORRADORES: Procesar sin importar fechas
-        if booking_status in ('initial', 'draft'):
-            room_states[room_id]['status'] = 'initial'
-            room_states[room_id]['current_reservation'] = reservation_payload
-            return
-        
-        # LÓGICA ESPECIAL PARA CONFIRMADAS: comparar por FECHA (no por hora)
-        if booking_status in ('confirmed', 'confirm', 'pending'):
-            if now_date <= checkout_date_only:
-                room_states[room_id]['status'] = 'confirmed'
-                if now_date < checkin_date_only and not room_states[room_id]['next_reservation']:
-                    room_states[room_id]['next_reservation'] = reservation_payload
-                else:
-                    room_states[room_id]['current_reservation'] = reservation_payload
-                return
-
-        # LÓGICA ESPECIAL PARA CHECK-IN: comparar por FECHA (no por hora)
-        if booking_status in ('checkin', 'allot', 'check_in'):
-            if checkin_date_only <= now_date <= checkout_date_only:
-                room_states[room_id]['status'] = 'checkin'
-                room_states[room_id]['current_reservation'] = reservation_payload
-                return
-            if now_date < checkin_date_only and not room_states[room_id]['next_reservation']:
-                room_states[room_id]['status'] = 'checkin'
-                room_states[room_id]['next_reservation'] = reservation_payload
-                return
-
-        # LÓGICA ESPECIAL PARA CHECK-OUT: comparar por FECHA (no por hora)
-        if booking_status in ('checkout', 'check_out'):
-            if now_date >= checkout_date_only:
-                room_states[room_id]['status'] = 'cleaning_needed'
-                room_states[room_id]['current_reservation'] = reservation_payload
-                return
-            if now_date < checkout_date_only:
-                room_states[room_id]['status'] = 'checkout'
-                room_states[room_id]['current_reservation'] = reservation_payload
-                return
-
-        # LÓGICA ESPECIAL PARA LIMPIEZA NECESARIA: mantener estado
-        if booking_status in ('cleaning_needed', 'cleaning'):
-            room_states[room_id]['status'] = 'cleaning_needed'
-            room_states[room_id]['current_reservation'] = reservation_payload
-            return
-
-        # Determinar si es reserva actual o futura (para no-borradores)
-        now = fields.Datetime.now()
-        
-        if checkin_dt <= now <= checkout_dt:
-            # Reserva activa
-            room_states[room_id]['status'] = mapped_status
-            room_states[room_id]['current_reservation'] = reservation_payload
-        elif checkin_dt > now and not room_states[room_id]['next_reservation']:
-            # Próxima reserva
-            room_states[room_id]['status'] = mapped_status
-            room_states[room_id]['next_reservation'] = reservation_payload
+            return {}
+        return request.env['hotel.room.state'].get_panel_states(room_ids)
 
     def _format_reservation_for_panel(self, booking: Dict[str, Any]) -> Dict[str, Any]:
         """Formatea datos de reserva para el panel."""
@@ -805,6 +505,7 @@ class RoomPanelControllerExtension(http.Controller):
                     pt.name as product_name,
                     hb.split_from_booking_id,
                     hb.connected_booking_id,
+                    hb.chain_root_id,
                     hb.is_room_change_origin,
                     hb.is_room_change_destination
                 FROM hotel_booking_line hbl
@@ -854,6 +555,7 @@ class RoomPanelControllerExtension(http.Controller):
                 # Información de vínculos de cambio de habitación
                 'split_from_booking_id': row.get('split_from_booking_id'),
                 'connected_booking_id': row.get('connected_booking_id'),
+                'chain_root_id': row.get('chain_root_id'),
                 'is_room_change_origin': row.get('is_room_change_origin', False),
                 'is_room_change_destination': row.get('is_room_change_destination', False),
                 'has_room_change': bool(row.get('split_from_booking_id') or row.get('connected_booking_id'))
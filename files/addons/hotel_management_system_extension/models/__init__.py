@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
+from . import room_state
 from . import booking_extension
 from . import res_partner_extension
 from . import product_template_extension
 from . import hotel_required_documents
 from . import guest_info_extension
 from . import sale_order_extension
+from . import room_availability_extension
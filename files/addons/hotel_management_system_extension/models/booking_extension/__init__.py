@@ -8,3 +8,4 @@ from . import room_ops
 from . import sales
 from . import booking_line
 from . import product
+from . import room_state_sync
@@ -28,6 +28,7 @@ class HotelBookingExtension(models.Model):
         "hotel.booking",
         string="Reserva Vinculada",
         readonly=True,
+        index=True,
         help="Reserva vinculada (por ejemplo, la nueva reserva tras un cambio de habitación)",
     )
 
@@ -35,9 +36,20 @@ class HotelBookingExtension(models.Model):
         "hotel.booking",
         string="Continuación de Reserva",
         readonly=True,
+        index=True,
         help="Reserva original de la que se originó este cambio de habitación",
     )
 
+    chain_root_id = fields.Many2one(
+        "hotel.booking",
+        string="Reserva Raíz de la Cadena",
+        compute="_compute_chain_root_id",
+        store=True,
+        recursive=True,
+        index=True,
+        help="Primera reserva de la cadena de cambios de habitación (vacío si esta es la raíz)",
+    )
+
     is_room_change_origin = fields.Boolean(
         string="Es Origen de Cambio",
         default=False,
@@ -65,6 +77,59 @@ class HotelBookingExtension(models.Model):
                 record.split_from_booking_id or record.connected_booking_id
             )
 
+    @api.depends('split_from_booking_id', 'split_from_booking_id.chain_root_id')
+    def _compute_chain_root_id(self):
+        """La raíz se hereda de la reserva de la que se originó el cambio"""
+        for record in self:
+            origin = record.split_from_booking_id
+            record.chain_root_id = origin.chain_root_id or origin
+
+    def _get_room_change_chains(self):
+        """
+        Resolver las cadenas de cambio de habitación de todo el recordset con
+        una sola consulta WITH RECURSIVE.
+
+        La recursión arranca en la raíz almacenada (chain_root_id) de cada
+        reserva y recorre los vínculos split_from_booking_id/connected_booking_id
+        en ambos sentidos, de modo que también encuentra reservas enlazadas solo
+        por connected_booking_id.
+
+        :return: {booking_id: recordset de la cadena ordenado por check_in}
+        """
+        if not self.ids:
+            return {}
+        self.flush_model([
+            "check_in", "split_from_booking_id", "connected_booking_id", "chain_root_id",
+        ])
+        self.env.cr.execute("""
+            WITH RECURSIVE seed AS (
+                SELECT id AS booking_id, COALESCE(chain_root_id, id) AS root_id
+                  FROM hotel_booking
+                 WHERE id IN %(ids)s
+            ), chain(root_id, booking_id) AS (
+                SELECT DISTINCT root_id, root_id FROM seed
+                 UNION
+                SELECT chain.root_id, linked.id
+                  FROM chain
+                  JOIN hotel_booking node ON node.id = chain.booking_id
+                  JOIN hotel_booking linked
+                    ON linked.id = node.split_from_booking_id
+                    OR linked.id = node.connected_booking_id
+                    OR linked.split_from_booking_id = node.id
+                    OR linked.connected_booking_id = node.id
+            )
+            SELECT seed.booking_id,
+                   ARRAY_AGG(chain.booking_id ORDER BY booking.check_in, booking.id)
+              FROM seed
+              JOIN chain ON chain.root_id = seed.root_id
+              JOIN hotel_booking booking ON booking.id = chain.booking_id
+          GROUP BY seed.booking_id
+        """, {"ids": tuple(self.ids)})
+        return {
+            booking_id: self.browse(chain_ids)
+            for booking_id, chain_ids in self.env.cr.fetchall()
+        }
+
     # --- SOBRESCRIBIR CAMPOS PRINCIPALES PARA SOPORTE DE HORAS ---
 
     # Redefinir booking_days como Float para aceptar fracciones de día (horas)
@@ -150,18 +150,13 @@ class HotelBookingExtension(models.Model):
         # Obtener el ID de la habitación del contexto
         default_product_id = self.env.context.get("default_product_id")
 
-        # Obtener habitaciones disponibles
-        booking = self.env["hotel.booking"].search([])
+        # Obtener habitaciones no disponibles (otro hotel u ocupadas en el rango)
         product_ids = self.env["product.product"].search(
             [("product_tmpl_id.hotel_id", "!=", self.hotel_id.id)]
         )
-
-        for line in booking:
-            filtered_bookings = line.filter_booking_based_on_date(
-                self.check_in, self.check_out
-            )
-            if filtered_bookings:
-                product_ids += line.mapped("booking_line_ids.product_id")
+        product_ids |= self.env["hotel.room.availability"].get_booked_rooms(
+            self.check_in, self.check_out
+        )
 
         # Si hay una habitación específica en el contexto, filtrar solo esa
         if default_product_id:
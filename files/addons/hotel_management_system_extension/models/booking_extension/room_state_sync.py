@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Mantenimiento incremental de hotel.room.state: al crear, modificar o eliminar
+reservas y líneas se recalculan solo las habitaciones que tocan.
+"""
+from odoo import models, api
+
+from ..room_state import ROOM_STATE_BOOKING_FIELDS
+
+
+class HotelBookingRoomStateSync(models.Model):
+    _inherit = "hotel.booking"
+
+    def _get_room_state_room_ids(self):
+        """Plantillas de habitación de las líneas de las reservas"""
+        return set(self.sudo().booking_line_ids.product_id.product_tmpl_id.ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        bookings = super().create(vals_list)
+        self.env["hotel.room.state"]._refresh_rooms(bookings._get_room_state_room_ids())
+        return bookings
+
+    def write(self, vals):
+        if not ROOM_STATE_BOOKING_FIELDS.intersection(vals):
+            return super().write(vals)
+        room_ids = self._get_room_state_room_ids()
+        result = super().write(vals)
+        room_ids |= self._get_room_state_room_ids()
+        self.env["hotel.room.state"]._refresh_rooms(room_ids)
+        return result
+
+    def unlink(self):
+        room_ids = self._get_room_state_room_ids()
+        result = super().unlink()
+        self.env["hotel.room.state"]._refresh_rooms(room_ids)
+        return result
+
+
+class HotelBookingLineRoomStateSync(models.Model):
+    _inherit = "hotel.booking.line"
+
+    def _get_room_state_room_ids(self):
+        """Plantillas de habitación de las líneas"""
+        return set(self.sudo().product_id.product_tmpl_id.ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        self.env["hotel.room.state"]._refresh_rooms(lines._get_room_state_room_ids())
+        return lines
+
+    def write(self, vals):
+        if not {"product_id", "booking_id"}.intersection(vals):
+            return super().write(vals)
+        room_ids = self._get_room_state_room_ids()
+        result = super().write(vals)
+        room_ids |= self._get_room_state_room_ids()
+        self.env["hotel.room.state"]._refresh_rooms(room_ids)
+        return result
+
+    def unlink(self):
+        room_ids = self._get_room_state_room_ids()
+        result = super().unlink()
+        self.env["hotel.room.state"]._refresh_rooms(room_ids)
+        return result
@@ -8,6 +8,15 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+# Estado inferido de la habitación según el estado de su reserva activa
+ROOM_STATUS_BY_BOOKING_STATE = {
+    'confirmed': 'available',
+    'checkin': 'occupied',
+    'checkout': 'dirty',
+    'cleaning_needed': 'dirty',
+    'room_ready': 'available',
+}
+
 
 class ProductTemplateRoomPanel(models.Model):
     """
@@ -32,50 +41,63 @@ class ProductTemplateRoomPanel(models.Model):
         help="Descripción de características especiales"
     )
     
-    # Campo computado para obtener el estado inferido de reservas
+    # Estado inferido de reservas: almacenado para poder buscar y ordenar por él.
+    # Las reservas no son una dependencia del ORM, así que hotel.room.state lo
+    # marca para recalcular al modificarlas y en el cron diario de cambio de día.
     computed_room_status = fields.Selection([
         ('available', 'Disponible'),
         ('occupied', 'Ocupada'),
         ('dirty', 'Necesita limpieza'),
         ('maintenance', 'Mantenimiento')
-    ], string='Estado Inferido', compute='_compute_room_status', store=False)
+    ], string='Estado Inferido', compute='_compute_room_status', store=True)
     
     @api.depends('is_room_type')
     def _compute_room_status(self):
         """
-        Computar estado de habitación basado en reservas activas
+        Computar estado de habitación basado en reservas activas, con una sola
+        consulta para todas las habitaciones del recordset
+        """
+        rooms = self.filtered('is_room_type')
+        (self - rooms).computed_room_status = False
+        if not rooms:
+            return
+
+        status_by_room = self._get_active_booking_status_by_room(
+            [room._origin.id for room in rooms if room._origin.id]
+        )
+        for room in rooms:
+            booking_status = status_by_room.get(room._origin.id)
+            room.computed_room_status = ROOM_STATUS_BY_BOOKING_STATE.get(
+                booking_status, 'available'
+            )
+
+    @api.model
+    def _get_active_booking_status_by_room(self, room_ids):
+        """
+        Estado de la reserva activa hoy de cada habitación (la primera por id,
+        como el search limit=1 anterior): {room_id: status_bar}
         """
-        for room in self:
-            if not room.is_room_type:
-                room.computed_room_status = False
-                continue
-                
-            try:
-                today = fields.Date.today()
-                
-                # Buscar reserva activa usando los estados del hotel_booking_extension.py
-                active_booking = self.env['hotel.booking'].search([
-                    ('booking_line_ids.product_id', '=', room.id),
-                    ('check_in', '<=', today),
-                    ('check_out', '>=', today),
-                    ('status_bar', 'in', ['confirmed', 'checkin', 'checkout', 'cleaning_needed', 'room_ready'])
-                ], limit=1)
-                
-                if active_booking:
-                    if active_booking.status_bar == 'checkin':
-                        room.computed_room_status = 'occupied'
-                    elif active_booking.status_bar in ['checkout', 'cleaning_needed']:
-                        room.computed_room_status = 'dirty'
-                    elif active_booking.status_bar == 'room_ready':
-                        room.computed_room_status = 'available'
-                    else:
-                        room.computed_room_status = 'available'
-                else:
-                    room.computed_room_status = 'available'
-                    
-            except Exception as e:
-                _logger.error(f"Error computing room status for room {room.id}: {str(e)}")
-                room.computed_room_status = 'available'
+        if not room_ids:
+            return {}
+        today = fields.Date.today()
+        self.env['hotel.booking'].flush_model(['check_in', 'check_out', 'status_bar'])
+        self.env['hotel.booking.line'].flush_model(['booking_id', 'product_id'])
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (pp.product_tmpl_id) pp.product_tmpl_id, hb.status_bar
+              FROM hotel_booking hb
+              JOIN hotel_booking_line hbl ON hbl.booking_id = hb.id
+              JOIN product_product pp ON pp.id = hbl.product_id
+             WHERE pp.product_tmpl_id IN %s
+               AND hb.check_in <= %s
+               AND hb.check_out >= %s
+               AND hb.status_bar IN %s
+          ORDER BY pp.product_tmpl_id, hb.id
+        """, [tuple(room_ids), today, today, tuple(ROOM_STATUS_BY_BOOKING_STATE)])
+        return dict(self.env.cr.fetchall())
+
+    def _refresh_room_status(self):
+        """Marcar el estado inferido para recalcularse en el próximo flush"""
+        self.env.add_to_compute(self._fields['computed_room_status'], self)
 
 
 class HotelRoomFeature(models.Model):
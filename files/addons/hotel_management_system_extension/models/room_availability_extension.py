@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Extensión del motor de disponibilidad de habitaciones para reservas por horas
+y matriz de ocupación (habitación × día) para las vistas Gantt
+"""
+
+from datetime import datetime, time, timedelta
+
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+
+from odoo.addons.hotel_management_system.models.room_availability import (
+    occupancy_range,
+)
+
+# Estados que no se pintan en el Gantt (mismo criterio que /hotel/gantt_data)
+GANTT_HIDDEN_STATES = ["cancel", "cancelled", "room_ready"]
+
+# Ventana máxima de la matriz de ocupación
+MAX_MATRIX_DAYS = 366
+
+
+class HotelRoomAvailabilityExtension(models.AbstractModel):
+    _inherit = "hotel.room.availability"
+
+    def _get_non_blocking_states(self):
+        """Los estados terminales de la extensión también liberan la habitación"""
+        return super()._get_non_blocking_states() + ["cancelled", "no_show"]
+
+    def _get_availability_window(self, check_in, check_out):
+        """
+        Usar comparación precisa de fecha Y HORA, igual que
+        filter_booking_based_on_date: hay traslape si (StartA < EndB) y (EndA > StartB)
+        """
+        if not (check_in and check_out):
+            raise ValidationError(
+                _("Please fill the Check in and Check out Details !!")
+            )
+        return (
+            fields.Datetime.to_datetime(check_in),
+            fields.Datetime.to_datetime(check_out),
+        )
+
+    @api.model
+    def get_occupancy_matrix(self, date_from, date_to, hotel_id=None, excluded_states=None):
+        """
+        Matriz compacta de ocupación habitación × día para la ventana [date_from, date_to).
+
+        Cada línea de reserva ocupa las noches entre su inicio y su fin (en la zona
+        horaria del usuario); el inicio de cada línea se obtiene acumulando los
+        booking_days de las líneas anteriores de la misma reserva, como en el Gantt.
+        Toda la ocupación se resuelve en una sola consulta agregada y se devuelve
+        codificada por tramos (run-length) por habitación:
+
+            runs[i] = [[inicio, longitud, índice_estado, booking_id], ...]
+
+        alineado con rooms[i]. ``occupancy[d]`` es el número de habitaciones
+        ocupadas el día d de la ventana.
+        """
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        if not (date_from and date_to) or date_to <= date_from:
+            raise ValidationError(_("La fecha final debe ser posterior a la fecha inicial"))
+        days = (date_to - date_from).days
+        if days > MAX_MATRIX_DAYS:
+            raise ValidationError(
+                _("La ventana no puede ser mayor a %s días") % MAX_MATRIX_DAYS
+            )
+        if excluded_states is None:
+            excluded_states = GANTT_HIDDEN_STATES
+
+        room_domain = [("is_room_type", "=", True)]
+        if hotel_id:
+            room_domain.append(("hotel_id", "=", hotel_id))
+        rooms = self.env["product.template"].search_read(
+            room_domain, ["id", "name", "hotel_id"], order="name"
+        )
+        result = {
+            "date_from": date_from.isoformat(),
+            "date_to": date_to.isoformat(),
+            "days": days,
+            "states": [],
+            "rooms": rooms,
+            "runs": [[] for _room in rooms],
+            "occupancy": [0] * days,
+            "bookings": {},
+        }
+        if not rooms:
+            return result
+
+        self.env["hotel.booking"].flush_model(
+            ["check_in", "check_out", "status_bar", "partner_id", "sequence_id"]
+        )
+        self.env["hotel.booking.line"].flush_model(
+            ["booking_id", "product_id", "booking_days"]
+        )
+
+        # Ventana ampliada un día por lado: cubre cualquier desfase de zona horaria
+        query = f"""
+            WITH segment AS (
+                SELECT line.id AS line_id,
+                       line.booking_id,
+                       line.booking_days,
+                       product.product_tmpl_id AS room_id,
+                       booking.status_bar AS state,
+                       (booking.check_in AT TIME ZONE 'UTC' AT TIME ZONE %(tz)s)
+                           + make_interval(secs => 86400 * COALESCE(SUM(line.booking_days) OVER (
+                                 PARTITION BY line.booking_id ORDER BY line.id
+                                 ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                             ), 0)::float) AS seg_start
+                  FROM hotel_booking booking
+                  JOIN hotel_booking_line line ON line.booking_id = booking.id
+                  JOIN product_product product ON product.id = line.product_id
+                 WHERE {occupancy_range("booking")} && tsrange(%(start)s, %(end)s, '[)')
+                   AND booking.status_bar NOT IN %(excluded)s
+            ), cell AS (
+                SELECT line_id, booking_id, room_id, state,
+                       seg_start::date - %(date_from)s AS first_day,
+                       GREATEST(
+                           (seg_start + make_interval(secs => 86400 * booking_days::float))::date,
+                           seg_start::date + 1
+                       ) - %(date_from)s AS last_day
+                  FROM segment
+                 WHERE booking_days > 0
+                   AND room_id IN %(room_ids)s
+            )
+            SELECT cell.room_id,
+                   GREATEST(cell.first_day, 0) AS start,
+                   LEAST(cell.last_day, %(days)s) - GREATEST(cell.first_day, 0) AS length,
+                   cell.state,
+                   cell.booking_id,
+                   booking.sequence_id,
+                   partner.name
+              FROM cell
+              JOIN hotel_booking booking ON booking.id = cell.booking_id
+              LEFT JOIN res_partner partner ON partner.id = booking.partner_id
+             WHERE cell.last_day > 0
+               AND cell.first_day < %(days)s
+          ORDER BY cell.room_id, start, cell.line_id
+        """
+        self.env.cr.execute(
+            query,
+            {
+                "tz": self.env.context.get("tz") or self.env.user.tz or "UTC",
+                "start": datetime.combine(date_from - timedelta(days=1), time.min),
+                "end": datetime.combine(date_to + timedelta(days=1), time.min),
+                "excluded": tuple(excluded_states or [""]),
+                "date_from": date_from,
+                "days": days,
+                "room_ids": tuple(room["id"] for room in rooms),
+            },
+        )
+
+        room_index = {room["id"]: index for index, room in enumerate(rooms)}
+        state_index = {}
+        # Arreglo de diferencias: +1 al inicio de cada tramo, -1 al final
+        delta = [0] * (days + 1)
+        for room_id, start, length, state, booking_id, sequence, partner in self.env.cr.fetchall():
+            runs = result["runs"][room_index[room_id]]
+            state_idx = state_index.setdefault(state, len(state_index))
+            previous = runs[-1] if runs else None
+            if (
+                previous
+                and previous[3] == booking_id
+                and previous[2] == state_idx
+                and previous[0] + previous[1] == start
+            ):
+                previous[1] += length
+            else:
+                runs.append([start, length, state_idx, booking_id])
+            delta[start] += 1
+            delta[start + length] -= 1
+            result["bookings"].setdefault(
+                booking_id, {"sequence": sequence, "partner": partner}
+            )
+
+        occupied = 0
+        for day in range(days):
+            occupied += delta[day]
+            result["occupancy"][day] = occupied
+        result["states"] = list(state_index)
+        return result
@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+"""
+Estado actual de cada habitación para el panel de habitaciones.
+
+La tabla se mantiene de forma incremental: cada vez que cambia una reserva
+(o una de sus líneas) se recalculan solo las habitaciones afectadas, y cada
+fila guarda hasta cuándo es válida (medianoche local o el próximo check-in /
+check-out que pueda cambiar el estado). Así /hotel/room_panel_data lee una
+fila por habitación en lugar de reprocesar todo el historial de reservas.
+El cron de recálculo se programa para cuando vence la primera fila, y reescribe
+las filas vencidas antes de que el panel tenga que recalcularlas.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+import pytz
+
+from odoo import models, fields, api
+from odoo.tools import split_every
+from odoo.addons.hotel_management_system.tools.metrics import metrics
+
+_logger = logging.getLogger(__name__)
+
+# Mapeo directo de estados de reserva - UNIFICADO CON RESERVATION_GANTT
+BOOKING_TO_ROOM_STATE = {
+    # Estados principales del Gantt - MAPPING DIRECTO
+    'initial': 'initial',           # BORRADOR → BORRADOR
+    'confirmed': 'confirmed',       # CONFIRMADA → CONFIRMADA
+    'checkin': 'checkin',           # CHECK-IN → CHECK-IN
+    'checkout': 'checkout',         # CHECK-OUT → CHECK-OUT
+    'cleaning_needed': 'cleaning_needed', # LIMPIEZA NECESARIA → LIMPIEZA NECESARIA
+    'room_ready': 'room_ready',     # HABITACION LISTA → HABITACION LISTA
+    'cancelled': 'cancelled',       # CANCELADA → CANCELADA
+    'no_show': 'no_show',           # NO SE PRESENTO → NO SE PRESENTO
+
+    # Estados legacy (compatibilidad) - Mapeados a estados del Gantt
+    'draft': 'initial',             # draft → initial (BORRADOR)
+    'confirm': 'confirmed',         # confirm → confirmed (CONFIRMADA)
+    'allot': 'checkin',             # allot → checkin (CHECK-IN)
+    'check_in': 'checkin',          # check_in → checkin (CHECK-IN)
+    'checkout_pending': 'checkout', # checkout_pending → checkout (CHECK-OUT)
+    'pending': 'confirmed',         # pending → confirmed (CONFIRMADA)
+    'room_assigned': 'checkin',     # room_assigned → checkin (CHECK-IN)
+    'cancel': 'cancelled',          # cancel → cancelled (CANCELADA)
+    'done': 'room_ready'            # done → room_ready (HABITACION LISTA)
+}
+
+# Estados que fijan el estado de la habitación sin importar las fechas: de las
+# reservas ya terminadas solo cuenta la última de cada habitación
+STICKY_BOOKING_STATES = ('initial', 'draft', 'checkout', 'check_out', 'cleaning_needed', 'cleaning')
+
+# Campos de hotel.booking que afectan el estado de la habitación
+ROOM_STATE_BOOKING_FIELDS = {
+    'status_bar', 'check_in', 'check_out', 'booking_line_ids',
+    'split_from_booking_id', 'connected_booking_id',
+    'is_room_change_origin', 'is_room_change_destination',
+}
+
+
+class HotelRoomState(models.Model):
+    _name = 'hotel.room.state'
+    _description = 'Estado Actual de Habitación'
+    _rec_name = 'room_id'
+
+    room_id = fields.Many2one(
+        'product.template', string='Habitación', required=True,
+        ondelete='cascade', index=True,
+    )
+    status = fields.Char(string='Estado', required=True, default='room_ready')
+    current_booking_id = fields.Many2one(
+        'hotel.booking', string='Reserva Actual', ondelete='set null',
+    )
+    next_booking_id = fields.Many2one(
+        'hotel.booking', string='Próxima Reserva', ondelete='set null',
+    )
+    valid_until = fields.Datetime(
+        string='Válido Hasta',
+        help='Momento a partir del cual el estado debe recalcularse',
+    )
+
+    _sql_constraints = [
+        ('room_uniq', 'unique(room_id)', 'Solo puede existir un estado por habitación'),
+    ]
+
+    # -------------------------------------------------------------------------
+    # Lectura
+    # -------------------------------------------------------------------------
+
+    @api.model
+    def get_panel_states(self, room_ids):
+        """
+        Estado, reserva actual y próxima reserva de cada habitación.
+        Solo lectura: el estado de las filas vencidas o inexistentes se
+        calcula en memoria sin guardarlo; las filas las actualizan el cron y
+        las escrituras de reservas.
+
+        :return: {room_id: {'status', 'current_reservation', 'next_reservation'}}
+        """
+        room_ids = list(room_ids)
+        if not room_ids:
+            return {}
+        stale_ids = self._get_stale_room_ids(room_ids)
+        stale_states = self._compute_room_states(stale_ids) if stale_ids else {}
+
+        self.env.cr.execute("""
+            WITH st AS (
+                SELECT room_id, status, current_booking_id, next_booking_id
+                  FROM hotel_room_state
+                 WHERE room_id = ANY(%(fresh_ids)s)
+                 UNION ALL
+                SELECT *
+                  FROM unnest(
+                           %(stale_ids)s::int[], %(statuses)s::varchar[],
+                           %(current_ids)s::int[], %(next_ids)s::int[]
+                       )
+            )
+            SELECT st.room_id,
+                   st.status AS room_status,
+                   slot.kind,
+                   hb.id AS booking_id,
+                   hb.check_in,
+                   hb.check_out,
+                   hb.status_bar,
+                   rp.name AS guest_name,
+                   hb.split_from_booking_id,
+                   hb.connected_booking_id,
+                   hb.chain_root_id,
+                   hb.is_room_change_origin,
+                   hb.is_room_change_destination
+              FROM st
+         LEFT JOIN LATERAL (
+                       VALUES ('current', st.current_booking_id),
+                              ('next', st.next_booking_id)
+                   ) AS slot(kind, booking_id) ON slot.booking_id IS NOT NULL
+         LEFT JOIN hotel_booking hb ON hb.id = slot.booking_id
+         LEFT JOIN res_partner rp ON rp.id = hb.partner_id
+        """, {
+            'fresh_ids': [room_id for room_id in room_ids if room_id not in stale_states],
+            'stale_ids': stale_ids,
+            'statuses': [stale_states[room_id]['status'] for room_id in stale_ids],
+            'current_ids': [stale_states[room_id]['current'] for room_id in stale_ids],
+            'next_ids': [stale_states[room_id]['next'] for room_id in stale_ids],
+        })
+
+        room_states = {
+            room_id: {
+                'status': 'room_ready',
+                'current_reservation': None,
+                'next_reservation': None,
+            }
+            for room_id in room_ids
+        }
+        for row in self.env.cr.dictfetchall():
+            room_state = room_states[row['room_id']]
+            room_state['status'] = row['room_status']
+            if row['booking_id']:
+                room_state['%s_reservation' % row['kind']] = self._prepare_reservation_payload(row)
+        return room_states
+
+    def _prepare_reservation_payload(self, row):
+        """Payload de reserva del panel, con las fechas en la zona horaria del usuario"""
+        local_checkin = fields.Datetime.context_timestamp(self, row['check_in'])
+        local_checkout = fields.Datetime.context_timestamp(self, row['check_out'])
+        is_room_change = bool(row['split_from_booking_id'] or row['connected_booking_id'])
+        payload = {
+            'id': row['booking_id'],
+            'guest_name': row['guest_name'] or 'Huésped',
+            'status': row['status_bar'],
+            'checkin_date': local_checkin.strftime('%Y-%m-%dT%H:%M:%S'),
+            'checkout_date': local_checkout.strftime('%Y-%m-%dT%H:%M:%S'),
+            # Información de vínculos de cambio de habitación
+            'split_from_booking_id': row['split_from_booking_id'],
+            'connected_booking_id': row['connected_booking_id'],
+            'chain_root_id': row['chain_root_id'],
+            'is_room_change_origin': row['is_room_change_origin'] or False,
+            'is_room_change_destination': row['is_room_change_destination'] or False,
+            'is_room_change': is_room_change,
+        }
+        if is_room_change and row['is_room_change_origin']:
+            payload['is_shortened_booking'] = True
+        elif is_room_change and row['is_room_change_destination']:
+            payload['is_continuation_booking'] = True
+        return payload
+
+    def _get_stale_room_ids(self, room_ids):
+        """Habitaciones sin estado o con el estado vencido"""
+        if not room_ids:
+            return []
+        self.env.cr.execute("""
+            SELECT room_id
+              FROM hotel_room_state
+             WHERE room_id IN %s
+               AND valid_until > %s
+        """, [tuple(room_ids), fields.Datetime.now()])
+        fresh_ids = {row[0] for row in self.env.cr.fetchall()}
+        return [room_id for room_id in room_ids if room_id not in fresh_ids]
+
+    # -------------------------------------------------------------------------
+    # Mantenimiento
+    # -------------------------------------------------------------------------
+
+    @api.model
+    def _refresh_rooms(self, room_ids):
+        """
+        Recalcular y guardar el estado de las habitaciones indicadas; también
+        marca su estado inferido (computed_room_status) para recalcularse.
+        """
+        room_ids = list(set(room_ids or []))
+        if not room_ids:
+            return
+        states = self._compute_room_states(room_ids)
+        now = fields.Datetime.now()
+        self.env.cr.execute("""
+            INSERT INTO hotel_room_state (
+                room_id, status, current_booking_id, next_booking_id, valid_until,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT state.room_id, state.status, state.current_booking_id,
+                   state.next_booking_id, state.valid_until, %(uid)s, %(now)s, %(uid)s, %(now)s
+              FROM unnest(
+                       %(room_ids)s::int[], %(statuses)s::varchar[], %(current_ids)s::int[],
+                       %(next_ids)s::int[], %(valid_until)s::timestamp[]
+                   ) AS state(room_id, status, current_booking_id, next_booking_id, valid_until)
+            ON CONFLICT (room_id) DO UPDATE
+               SET status = EXCLUDED.status,
+                   current_booking_id = EXCLUDED.current_booking_id,
+                   next_booking_id = EXCLUDED.next_booking_id,
+                   valid_until = EXCLUDED.valid_until,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+        """, {
+            'uid': self.env.uid,
+            'now': now,
+            'room_ids': room_ids,
+            'statuses': [states[room_id]['status'] for room_id in room_ids],
+            'current_ids': [states[room_id]['current'] for room_id in room_ids],
+            'next_ids': [states[room_id]['next'] for room_id in room_ids],
+            'valid_until': [states[room_id]['valid_until'] for room_id in room_ids],
+        })
+        self.invalidate_model()
+        self.env['product.template'].browse(room_ids)._refresh_room_status()
+        self._schedule_rollover(min(state['valid_until'] for state in states.values()))
+
+    @api.model
+    def _schedule_rollover(self, at):
+        """Programar el cron para cuando venza la primera fila (si no hay ya
+        una ejecución programada antes), así las filas vencidas se reescriben
+        en lugar de recalcularse en cada lectura del panel"""
+        cron = self.env.ref(
+            'hotel_management_system_extension.ir_cron_room_state_rollover',
+            raise_if_not_found=False,
+        )
+        if not cron:
+            return
+        if self.env['ir.cron.trigger'].sudo().search_count(
+            [('cron_id', '=', cron.id), ('call_at', '<=', at)], limit=1
+        ):
+            return
+        cron.sudo()._trigger(at=at)
+
+    @api.model
+    def _cron_rollover_room_states(self):
+        """Recalcular las habitaciones con el estado vencido o sin estado: todas
+        al cambiar el día y, entre medias, las de los check-in / check-out
+        que van pasando (el cron se programa al vencer la primera fila)"""
+        with metrics.timer('hotel_cron_duration_seconds', cron='room_state_rollover'):
+            room_ids = self._get_stale_room_ids(
+                self.env['product.template'].search([('is_room_type', '=', True)]).ids
+            )
+            for batch_ids in split_every(500, room_ids):
+                self._refresh_rooms(list(batch_ids))
+                self.env['product.template'].flush_model(['computed_room_status'])
+        _logger.info("Estados de habitación recalculados: %s habitaciones", len(room_ids))
+
+    def _group_rooms_by_timezone(self, room_ids):
+        """{zona horaria: [room_id]} según el hotel de cada habitación o, si
+        el hotel no la tiene, su compañía"""
+        rooms_by_tz = defaultdict(list)
+        for room in self.env['product.template'].sudo().browse(room_ids):
+            hotel = room.hotel_id
+            company = hotel.company_id or room.company_id or self.env.company
+            rooms_by_tz[hotel.default_timezone or company.partner_id.tz or 'UTC'].append(room.id)
+        return rooms_by_tz
+
+    def _get_day_bounds(self, now, tz_name):
+        """(fecha local de hoy, próxima medianoche local en UTC)"""
+        tz = pytz.timezone(tz_name)
+        local_today = pytz.utc.localize(now).astimezone(tz).date()
+        next_midnight = tz.localize(datetime.combine(local_today + timedelta(days=1), time.min))
+        return local_today, next_midnight.astimezone(pytz.utc).replace(tzinfo=None)
+
+    @api.model
+    def _compute_room_states(self, room_ids):
+        """
+        Derivar el estado de las habitaciones reprocesando sus reservas en orden
+        de check-in (misma lógica que el panel). "Hoy" es el día en la zona
+        horaria del hotel de cada habitación, no la del usuario que dispara
+        el cálculo.
+        """
+        now = fields.Datetime.now()
+        states = {}
+        for tz_name, tz_room_ids in self._group_rooms_by_timezone(room_ids).items():
+            today, next_midnight = self._get_day_bounds(now, tz_name)
+            states.update(self._compute_room_states_for_day(tz_room_ids, now, today, next_midnight))
+        return states
+
+    @api.model
+    def _compute_room_states_for_day(self, room_ids, now, today, next_midnight):
+        """
+        Estados de las habitaciones para el día local today. Solo se leen las
+        reservas que pueden influir hoy: las que terminan desde ayer en
+        adelante y, de las anteriores, la última con un estado que no
+        depende de las fechas.
+        """
+        states = {
+            room_id: {'status': 'room_ready', 'current': None, 'next': None, 'valid_until': next_midnight}
+            for room_id in room_ids
+        }
+
+        self.env['hotel.booking'].flush_model([
+            'check_in', 'check_out', 'status_bar', 'split_from_booking_id', 'connected_booking_id',
+            'is_room_change_origin', 'is_room_change_destination',
+        ])
+        self.env['hotel.booking.line'].flush_model(['booking_id', 'product_id'])
+        self.env.cr.execute("""
+            WITH room_booking AS (
+                SELECT DISTINCT pp.product_tmpl_id AS room_id,
+                       hb.id AS booking_id,
+                       hb.check_in,
+                       hb.check_out,
+                       hb.status_bar,
+                       hb.split_from_booking_id,
+                       hb.connected_booking_id,
+                       hb.is_room_change_origin,
+                       hb.is_room_change_destination
+                  FROM hotel_booking_line hbl
+                  JOIN hotel_booking hb ON hbl.booking_id = hb.id
+                  JOIN product_product pp ON hbl.product_id = pp.id
+                 WHERE pp.product_tmpl_id IN %(room_ids)s
+                   AND hb.status_bar NOT IN ('cancel', 'cancelled')
+                   AND hb.check_in IS NOT NULL
+                   AND hb.check_out IS NOT NULL
+            )
+            SELECT * FROM room_booking WHERE check_out >= %(bound)s
+             UNION
+            SELECT * FROM (
+                SELECT DISTINCT ON (room_id) *
+                  FROM room_booking
+                 WHERE check_out < %(bound)s
+                   AND status_bar IN %(sticky)s
+                   AND split_from_booking_id IS NULL
+                   AND connected_booking_id IS NULL
+              ORDER BY room_id, check_in DESC
+            ) AS last_sticky
+          ORDER BY room_id, check_in
+        """, {
+            'room_ids': tuple(room_ids),
+            'bound': datetime.combine(today - timedelta(days=1), time.min),
+            'sticky': STICKY_BOOKING_STATES,
+        })
+
+        for row in self.env.cr.dictfetchall():
+            state = states[row['room_id']]
+            self._apply_booking_to_state(state, row, now, today)
+            for boundary in (row['check_in'], row['check_out']):
+                if now < boundary < state['valid_until']:
+                    state['valid_until'] = boundary
+        return states
+
+    def _apply_booking_to_state(self, state, row, now, today):
+        """Aplicar una reserva al estado de su habitación"""
+        booking_id = row['booking_id']
+        booking_status = row['status_bar']
+        checkin_dt = row['check_in']
+        checkout_dt = row['check_out']
+        checkin_date_only = checkin_dt.date()
+        checkout_date_only = checkout_dt.date()
+        mapped_status = BOOKING_TO_ROOM_STATE.get(booking_status, booking_status)
+
+        # Reservas con cambio de habitación
+        if row['split_from_booking_id'] or row['connected_booking_id']:
+            # Origen (acortada): termina en el inicio del cambio
+            if row['is_room_change_origin']:
+                if checkin_date_only <= today < checkout_date_only:
+                    state.update(status=mapped_status, current=booking_id)
+            # Destino (continuación): desde el cambio hasta el check-out
+            elif row['is_room_change_destination']:
+                if checkin_date_only <= today <= checkout_date_only:
+                    state.update(status=mapped_status, current=booking_id)
+                elif today < checkin_date_only and not state['next']:
+                    state['next'] = booking_id
+            return
+
+        # Borradores: sin importar fechas
+        if booking_status in ('initial', 'draft'):
+            state.update(status='initial', current=booking_id)
+            return
+
+        # Confirmadas: comparar por FECHA (no por hora)
+        if booking_status in ('confirmed', 'confirm', 'pending'):
+            if today <= checkout_date_only:
+                state['status'] = 'confirmed'
+                if today < checkin_date_only and not state['next']:
+                    state['next'] = booking_id
+                else:
+                    state['current'] = booking_id
+                return
+
+        # Check-in: comparar por FECHA (no por hora)
+        if booking_status in ('checkin', 'allot', 'check_in'):
+            if checkin_date_only <= today <= checkout_date_only:
+                state.update(status='checkin', current=booking_id)
+                return
+            if today < checkin_date_only and not state['next']:
+                state.update(status='checkin', next=booking_id)
+                return
+
+        # Check-out: comparar por FECHA (no por hora)
+        if booking_status in ('checkout', 'check_out'):
+            if today >= checkout_date_only:
+                state.update(status='cleaning_needed', current=booking_id)
+            else:
+                state.update(status='checkout', current=booking_id)
+            return
+
+        # Limpieza necesaria: mantener estado
+        if booking_status in ('cleaning_needed', 'cleaning'):
+            state.update(status='cleaning_needed', current=booking_id)
+            return
+
+        # Resto de estados: reserva actual o futura
+        if checkin_dt <= now <= checkout_dt:
+            state.update(status=mapped_status, current=booking_id)
+        elif checkin_dt > now and not state['next']:
+            state.update(status=mapped_status, next=booking_id)
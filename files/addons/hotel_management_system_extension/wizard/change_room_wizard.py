@@ -84,18 +84,17 @@ class ChangeRoomWizard(models.TransientModel):
                 record.available_rooms = False
                 return
             
-            # Buscar habitaciones disponibles en el rango de fechas
-            available_room_ids = []
-            
             # Obtener todas las habitaciones del hotel
             hotel_rooms = self.env['product.product'].search([
                 ('is_room_type', '=', True),
                 ('product_tmpl_id.hotel_id', '=', record.booking_id.hotel_id.id)
             ])
             
-            for room in hotel_rooms:
-                if self._is_room_available(room, record.change_start_date, record.change_end_date):
-                    available_room_ids.append(room.id)
+            # Buscar habitaciones disponibles en el rango de fechas
+            booked_room_ids = record._get_booked_room_ids(
+                hotel_rooms.ids, record.change_start_date, record.change_end_date
+            )
+            available_room_ids = [room.id for room in hotel_rooms if room.id not in booked_room_ids]
             
             record.available_rooms = [(6, 0, available_room_ids)]
 
@@ -174,16 +173,20 @@ class ChangeRoomWizard(models.TransientModel):
                         (checkout_hour, checkout_minute, change_hour, change_minute)
                     )
 
+    def _get_booked_room_ids(self, room_ids, start_date, end_date):
+        # Habitaciones ocupadas en el rango, en una sola consulta
+        # Las reservas de la misma cadena de cambios son la misma estancia: no bloquean
+        chain = self.booking_id._get_room_change_chains().get(self.booking_id.id, self.booking_id)
+        return self.env['hotel.room.availability'].get_booked_room_ids(
+            start_date,
+            end_date,
+            room_ids=room_ids,
+            excluded_states=['cancelled', 'no_show'],
+            exclude_booking_ids=chain.ids,
+        )
+
     def _is_room_available(self, room, start_date, end_date):
-        # Check overlapping booking lines using the same room (simple availability check)
-        overlapping_lines = self.env['hotel.booking.line'].search([
-            ('product_id', '=', room.id),
-            ('booking_id.status_bar', 'not in', ['cancelled', 'no_show']),
-            ('booking_id', '!=', self.booking_id.id),
-            ('booking_id.check_in', '<', fields.Datetime.to_datetime(end_date)),
-            ('booking_id.check_out', '>', fields.Datetime.to_datetime(start_date)),
-        ], limit=1)
-        return not bool(overlapping_lines)
+        return not self._get_booked_room_ids([room.id], start_date, end_date)
 
     def action_confirm(self):
         self.ensure_one()
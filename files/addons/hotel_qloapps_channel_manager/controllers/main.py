@@ -165,19 +165,31 @@ class HotelRestWebServices(Controller):
         """
         API Endpoint: /api/bookings
         Fetches booking details based on query parameters and returns JSON response.
+        With `since` and/or `limit` it works as a change feed: only the bookings
+        changed after the `since` sync sequence are returned, together with the
+        `next_since` cursor for the next poll.
         """
         response = self._authenticate(**kwargs)
         if response.get("success"):
             try:
-                bookings = (
-                    request.env["hotel.booking"].sudo().get_filtered_bookings(**kwargs)
-                )
-                data = {
-                    "responseCode": 200,
-                    "message": "Data fetched successfully",
-                    "data": bookings,
-                    "success": True,
-                }
+                Booking = request.env["hotel.booking"].sudo()
+                if "since" in kwargs or "limit" in kwargs:
+                    feed = Booking.get_booking_feed(**kwargs)
+                    data = {
+                        "responseCode": 200,
+                        "message": "Data fetched successfully",
+                        "data": feed["data"],
+                        "next_since": feed["next_since"],
+                        "has_more": feed["has_more"],
+                        "success": True,
+                    }
+                else:
+                    data = {
+                        "responseCode": 200,
+                        "message": "Data fetched successfully",
+                        "data": Booking.get_filtered_bookings(**kwargs),
+                        "success": True,
+                    }
                 return self._response(data)
             except Exception as e:
                 error_response = {
@@ -204,6 +216,8 @@ class HotelRestWebServices(Controller):
         """
         API Endpoint: /api/bookings (POST)
         Creates a new booking based on the provided data and returns the newly created booking's ID.
+        A JSON list of bookings is processed as one batch and returns, per deduplicated booking,
+        its channel id_booking and booking_status with the id_pms_booking (False on failure).
         """
         response = self._authenticate(**kwargs)
         if response.get("success"):
@@ -218,6 +232,22 @@ class HotelRestWebServices(Controller):
                         }
                     )
 
+                if isinstance(data, list):
+                    # One transaction for the whole batch: a failing payload
+                    # rolls back what the previous ones already wrote
+                    with request.env.cr.savepoint():
+                        results = (
+                            request.env["hotel.booking"].sudo().process_booking_batch(data)
+                        )
+                    return self._response(
+                        {
+                            "responseCode": 200,
+                            "message": "Booking data have been processed successfully at the odoo end",
+                            "data": results,
+                            "success": True,
+                        }
+                    )
+
                 booking_id = (
                     request.env["hotel.booking"].sudo().process_booking_data(data)
                 )
@@ -253,3 +283,49 @@ class HotelRestWebServices(Controller):
                 status=401,
                 headers=[("WWW-Authenticate", 'Basic realm="Hotel WebService"')],
             )
+
+    @route(
+        "/api/bookings/acknowledge",
+        csrf=False,
+        type="http",
+        auth="public",
+        methods=["POST"],
+    )
+    def acknowledge_bookings(self, **kwargs):
+        """
+        API Endpoint: /api/bookings/acknowledge (POST)
+        Body: {"id_bookings": [1, 2, ...]} and/or {"until": SYNC_SEQUENCE}
+        Clears the need_to_sync flag of the bookings already processed by the channel.
+        """
+        response = self._authenticate(**kwargs)
+        if response.get("success"):
+            try:
+                data = json.loads(request.httprequest.data or "{}")
+                count = (
+                    request.env["hotel.booking"]
+                    .sudo()
+                    .acknowledge_synced_bookings(
+                        booking_ids=data.get("id_bookings"), until=data.get("until")
+                    )
+                )
+                return self._response(
+                    {
+                        "responseCode": 200,
+                        "message": "Bookings have been acknowledged successfully",
+                        "data": {"acknowledged": count},
+                        "success": True,
+                    }
+                )
+            except Exception as e:
+                error_response = {
+                    "responseCode": 500,
+                    "message": f"An error occurred: {e}",
+                    "success": False,
+                }
+                return self._response(error_response)
+        else:
+            return werkzeug.wrappers.Response(
+                "401 Unauthorized",
+                status=401,
+                headers=[("WWW-Authenticate", 'Basic realm="Hotel WebService"')],
+            )
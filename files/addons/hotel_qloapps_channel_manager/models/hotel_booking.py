@@ -7,71 +7,269 @@
 
 import logging
 
-from odoo import models, fields, _, api
+from odoo import models, fields, _, api, Command
 from odoo.exceptions import UserError
 from datetime import datetime
 
 _logger = logging.getLogger(__name__)
 
+# Sequence feeding hotel.booking.sync_sequence (change feed cursor of /api/bookings)
+SYNC_SEQUENCE_NAME = "hotel_booking_sync_sequence_seq"
+# Advisory lock serializing the sequence assignment with the commit
+SYNC_SEQUENCE_LOCK = 7351846230187
+# Booking and line fields exposed by the feed: only their changes renew the sequence
+SYNC_FEED_FIELDS = {
+    "status_bar", "check_in", "check_out", "hotel_id", "partner_id", "pricelist_id",
+    "currency_id", "order_id", "booking_reference", "cancellation_reason", "booking_line_ids",
+}
+SYNC_FEED_LINE_FIELDS = {
+    "product_id", "booking_id", "price", "discount", "tax_ids", "guest_info_ids",
+}
+# Fields whose changes on channel bookings must be pushed back to the channel
+SYNC_TRACKED_FIELDS = {"status_bar", "check_in", "check_out", "booking_line_ids"}
+DEFAULT_FEED_LIMIT = 100
+MAX_FEED_LIMIT = 500
+# booking_status values handled by /api/booking_notification
+CHANNEL_BOOKING_STATUSES = ("new", "modified", "cancelled")
+
 
 class HotelBooking(models.Model):
     _inherit = "hotel.booking"
 
     # Creating a new field for determining if the booking is modified or not.
     need_to_sync = fields.Boolean("Need to sync?")
+    channel_booking_id = fields.Char(
+        "Channel Booking ID",
+        copy=False,
+        index=True,
+        help="Booking id on the channel side, used to ignore repeated notifications.",
+    )
+    sync_sequence = fields.Integer(
+        "Sync Sequence",
+        readonly=True,
+        copy=False,
+        index=True,
+        help="Increases every time the booking changes. Used as the cursor of the channel change feed.",
+    )
+    sync_pending = fields.Boolean(
+        "Sync Sequence Pending",
+        readonly=True,
+        copy=False,
+        help="Set while the booking waits for a new sync sequence, assigned at commit.",
+    )
+
+    def init(self):
+        super().init()
+        self.env.cr.execute(f"CREATE SEQUENCE IF NOT EXISTS {SYNC_SEQUENCE_NAME}")
+        # Number the bookings that existed before the feed, oldest change first
+        self.env.cr.execute(
+            f"""
+            UPDATE hotel_booking booking
+               SET sync_sequence = numbered.seq
+              FROM (
+                    SELECT id, nextval('{SYNC_SEQUENCE_NAME}') AS seq
+                      FROM (
+                            SELECT id
+                              FROM hotel_booking
+                             WHERE sync_sequence IS NULL
+                          ORDER BY write_date, id
+                           ) pending
+                   ) numbered
+             WHERE booking.id = numbered.id
+            """
+        )
+        # Deferred constraint trigger: runs at COMMIT only (never at a
+        # savepoint), after every statement of the transaction
+        self.env.cr.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION hotel_booking_assign_sync_sequence()
+            RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_advisory_xact_lock({SYNC_SEQUENCE_LOCK});
+                UPDATE hotel_booking
+                   SET sync_sequence = nextval('{SYNC_SEQUENCE_NAME}'),
+                       sync_pending = FALSE
+                 WHERE id = NEW.id
+                   AND sync_pending;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS hotel_booking_sync_sequence_trigger ON hotel_booking;
+            CREATE CONSTRAINT TRIGGER hotel_booking_sync_sequence_trigger
+                AFTER INSERT OR UPDATE OF sync_pending ON hotel_booking
+                DEFERRABLE INITIALLY DEFERRED
+                FOR EACH ROW WHEN (NEW.sync_pending)
+                EXECUTE FUNCTION hotel_booking_assign_sync_sequence();
+            """
+        )
+
+    def _bump_sync_sequence(self):
+        """
+        Give each booking a fresh sync sequence so the feed reports it again.
+
+        The bookings are only flagged (sync_pending); the sequence is taken at
+        COMMIT by a deferred trigger, under an advisory lock held until the
+        commit ends, so sequences become visible in increasing order: a feed
+        reader never sees sequence N+1 while N is still held by an uncommitted
+        transaction, and clients can safely move `since` past every row they
+        receive. The trigger only updates rows the transaction already locked
+        when flagging them, so whoever holds the advisory lock never waits for
+        another transaction.
+        """
+        if not self.ids:
+            return
+        self.env.cr.execute(
+            "UPDATE hotel_booking SET sync_pending = TRUE WHERE id IN %s",
+            [tuple(self.ids)],
+        )
+        self.invalidate_recordset(["sync_pending", "sync_sequence"])
+
+    def _get_channel_feed_bookings(self):
+        """Bookings of the properties exposed to the channel (published hotels)."""
+        return self.filtered(lambda booking: booking.hotel_id.is_published)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        bookings = super(HotelBooking, self).create(vals_list)
+        bookings._bump_sync_sequence()
+        return bookings
+
+    def _get_bookings_to_sync(self, vals):
+        """
+        Return the channel bookings (booking_reference == "other") whose dates,
+        state or room assignment really change with `vals`, checked in one pass
+        over the batch.
+        """
+        if not SYNC_TRACKED_FIELDS.intersection(vals):
+            return self.browse()
+        bookings = self.filtered(lambda booking: booking.booking_reference == "other")
+        if not bookings:
+            return bookings
+
+        to_sync = self.browse()
+        if vals.get("status_bar") == "cancel":
+            to_sync |= bookings.filtered(lambda booking: booking.status_bar != "cancel")
+        for field_name in ("check_in", "check_out"):
+            if field_name in vals:
+                new_value = fields.Datetime.to_datetime(vals[field_name])
+                to_sync |= bookings.filtered(
+                    lambda booking: booking[field_name] != new_value
+                )
+        if "booking_line_ids" in vals:
+            to_sync |= bookings._get_bookings_with_room_changes(vals["booking_line_ids"])
+        return to_sync
+
+    def _get_bookings_with_room_changes(self, commands):
+        """Bookings whose set of lines or line rooms change with the x2many commands."""
+        lines_by_id = {line.id: line for line in self.booking_line_ids}
+        changed_ids = set()
+        for command in commands or []:
+            if not isinstance(command, (list, tuple)) or not command:
+                continue
+            operation = command[0]
+            if operation == Command.CREATE:
+                # Every booking of the batch receives the new line
+                return self
+            if operation in (Command.DELETE, Command.UNLINK):
+                line = lines_by_id.get(command[1])
+                if line:
+                    changed_ids.add(line.booking_id.id)
+            elif operation == Command.UPDATE:
+                line = lines_by_id.get(command[1])
+                new_product_id = (command[2] or {}).get("product_id")
+                if line and new_product_id and new_product_id != line.product_id.id:
+                    changed_ids.add(line.booking_id.id)
+            elif operation == Command.CLEAR:
+                changed_ids.update(self.filtered("booking_line_ids").ids)
+            elif operation == Command.LINK:
+                changed_ids.update(
+                    booking.id
+                    for booking in self
+                    if command[1] not in booking.booking_line_ids.ids
+                )
+            elif operation == Command.SET:
+                new_ids = set(command[2] or [])
+                changed_ids.update(
+                    booking.id
+                    for booking in self
+                    if set(booking.booking_line_ids.ids) != new_ids
+                )
+        return self.browse(list(changed_ids))
 
     def write(self, vals):
         """
-        This method is used for setting the need_to_sync field to True if the booking is modified for specific fields.
-        """
-        for record in self:
-            need_sync = False
-            if record.booking_reference == "other":
-                if "status_bar" in vals and vals["status_bar"] == "cancel":
-                    need_sync = True
-
-                if "check_in" in vals and vals["check_in"] != record.check_in:
-                    need_sync = True
-                if "check_out" in vals and vals["check_out"] != record.check_out:
-                    need_sync = True
-
-                if "booking_line_ids" in vals:
-                    old_count = len(record.booking_line_ids)
-                    new_count = (
-                        len(vals["booking_line_ids"])
-                        if isinstance(vals["booking_line_ids"], list)
-                        else old_count
-                    )
-                    if new_count != old_count:
-                        need_sync = True
-                    else:
-                        for line in record.booking_line_ids:
-                            for changes in vals["booking_line_ids"]:
-                                if (
-                                    isinstance(changes, (list, tuple))
-                                    and changes[0] == 1
-                                ):
-                                    line_id, updated_values = changes[1], changes[2]
-                                    if (
-                                        line.id == line_id
-                                        and "room_id" in updated_values
-                                        and updated_values["room_id"] != line.room_id.id
-                                    ):
-                                        need_sync = True
-                                        break
-                            if need_sync:
-                                break
-
-            if need_sync:
-                vals["need_to_sync"] = True
-
-        return super(HotelBooking, self).write(vals)
+        Sets need_to_sync on the channel bookings whose dates, state or room
+        assignment actually change; the rest of the batch is written untouched.
+        """
+        to_sync = self.browse()
+        if not vals.get("need_to_sync"):
+            to_sync = self._get_bookings_to_sync(vals)
+
+        if to_sync:
+            result = super(HotelBooking, to_sync).write(dict(vals, need_to_sync=True))
+            others = self - to_sync
+            if others:
+                super(HotelBooking, others).write(vals)
+        else:
+            result = super(HotelBooking, self).write(vals)
+        if SYNC_FEED_FIELDS.intersection(vals):
+            self._get_channel_feed_bookings()._bump_sync_sequence()
+        return result
 
     def get_filtered_bookings(self, **kwargs):
         """
         Fetch filtered booking details based on API request parameters.
         Returns: -> An array of booking detail's object/dict
         """
+        bookings = self.search(self._get_booking_filter_domain(**kwargs))
+        return self.prepare_booking_response(bookings)
+
+    def get_booking_feed(self, **kwargs):
+        """
+        Change feed of the bookings for API-endpoint: /api/bookings?since=&limit=
+        Returns the bookings changed after the `since` sync sequence, oldest change first.
+        Returns: -> A dict with the booking details, the next cursor and whether more changes are pending.
+        """
+        try:
+            since = int(kwargs.get("since") or 0)
+            limit = int(kwargs.get("limit") or DEFAULT_FEED_LIMIT)
+        except (TypeError, ValueError):
+            raise UserError(_("The since and limit parameters must be integers."))
+        limit = max(1, min(limit, MAX_FEED_LIMIT))
+
+        domain = self._get_booking_filter_domain(**kwargs)
+        domain += [("sync_sequence", ">", since), ("hotel_id.is_published", "=", True)]
+        bookings = self.search(domain, order="sync_sequence, id", limit=limit + 1)
+        has_more = len(bookings) > limit
+        bookings = bookings[:limit]
+        return {
+            "data": self.prepare_booking_response(bookings),
+            "next_since": bookings[-1].sync_sequence if bookings else since,
+            "has_more": has_more,
+        }
+
+    def acknowledge_synced_bookings(self, booking_ids=None, until=None):
+        """
+        Clear need_to_sync on the bookings the channel has processed, in one write.
+        Arguments:
+            booking_ids: ids of the acknowledged bookings.
+            until: acknowledge every booking up to this sync sequence.
+        Returns: -> The number of acknowledged bookings.
+        """
+        if not booking_ids and until is None:
+            raise UserError(_("Provide the booking ids or the sync sequence to acknowledge."))
+        domain = [("need_to_sync", "=", True)]
+        if booking_ids:
+            domain.append(("id", "in", [int(booking_id) for booking_id in booking_ids]))
+        if until is not None:
+            domain.append(("sync_sequence", "<=", int(until)))
+        bookings = self.search(domain)
+        bookings.write({"need_to_sync": False})
+        return len(bookings)
+
+    def _get_booking_filter_domain(self, **kwargs):
+        """Domain of the filter[...] parameters of /api/bookings"""
         domain = []
 
         if "filter[id_property]" in kwargs:
@@ -97,8 +295,11 @@ class HotelBooking(models.Model):
             if key in kwargs:
                 domain.append((field_name, operator, kwargs[key]))
 
-        bookings = self.search(domain)
-        return self.prepare_booking_response(bookings)
+        if "filter[need_to_sync]" in kwargs:
+            domain.append(
+                ("need_to_sync", "=", kwargs["filter[need_to_sync]"] in ("1", "true", "True"))
+            )
+        return domain
 
     def prepare_guest_details(self, partner):
         return {
@@ -204,6 +405,7 @@ class HotelBooking(models.Model):
             booking_data.append(
                 {
                     "id_booking": booking.id if booking else "",
+                    "sync_sequence": booking.sync_sequence,
                     "id_property": booking.hotel_id.id if booking.hotel_id else "",
                     "currency": booking.currency_id.name if booking.currency_id else "",
                     "booking_status": booking_status,
@@ -306,12 +508,278 @@ class HotelBooking(models.Model):
         Returns:
             The ID of the newly created booking record or an acknowledgement.
         """
-        if booking_data.get("booking_status") == "new":
-            return self.create_or_modify_booking(booking_data)
-        elif booking_data.get("booking_status") == "cancelled":
-            return self.cancel_existing_booking(booking_data)
-        elif booking_data.get("booking_status") == "modified":
-            return self.create_or_modify_booking(booking_data, "edit")
+        if booking_data.get("booking_status") not in CHANNEL_BOOKING_STATUSES:
+            return None
+        return self.process_booking_batch([booking_data])[0]["id_pms_booking"]
+
+    def process_booking_batch(self, payloads):
+        """
+        Process a list of booking notifications received from the qlo end.
+        Reference data is resolved once for the whole batch, payloads repeating a
+        channel booking id are collapsed to the last one, new bookings are created
+        with a single create() and equal modifications are written together.
+        Arguments:
+            payloads: List of booking data dictionaries (from request).
+        Returns:
+            One dict per deduplicated payload, with the channel ``id_booking`` and
+            ``booking_status`` it answers and the processed ``id_pms_booking``
+            (False when the booking was not found or could not be processed).
+        """
+        payloads = self._dedupe_channel_payloads(payloads)
+        lookups = self._get_channel_lookups(payloads)
+        partners = self._get_channel_partners(payloads, lookups)
+
+        referenced_ids = [
+            int(data["id_booking"])
+            for data in payloads
+            if data.get("booking_status") in ("modified", "cancelled")
+            and data.get("id_booking")
+        ]
+        existing = {booking.id: booking for booking in self.browse(referenced_ids).exists()}
+
+        results = [False] * len(payloads)
+        to_create = []
+        to_write = {}
+        for index, data in enumerate(payloads):
+            status = data.get("booking_status")
+            if status == "cancelled":
+                booking = existing.get(int(data.get("id_booking") or 0))
+                if booking:
+                    booking.cancel_booking("Booking cancelled from the qlo end")
+                    results[index] = booking.id
+                continue
+
+            vals = self._prepare_channel_booking_vals(data, partners, lookups)
+            if status == "new":
+                booking = lookups["channel_bookings"].get(str(data.get("id_booking") or ""))
+                if not booking:
+                    vals.update(
+                        {
+                            "channel_booking_id": data.get("id_booking") or False,
+                            "booking_line_ids": self._prepare_booking_lines(data, lookups),
+                        }
+                    )
+                    to_create.append((index, vals))
+                    continue
+            else:
+                booking = existing.get(int(data.get("id_booking") or 0))
+            if booking and booking.status_bar not in ["checkout", "cancel"]:
+                key = tuple(sorted(vals.items()))
+                to_write.setdefault(key, [vals, self.browse()])[1] |= booking
+            results[index] = booking.id if booking else False
+
+        for vals, bookings in to_write.values():
+            bookings.write(vals)
+
+        if to_create:
+            bookings = self.create([vals for _index, vals in to_create])
+            for (index, _vals), booking in zip(to_create, bookings):
+                booking.with_context(bypass_checkin_checkout=True).action_confirm_booking()
+                results[index] = booking.id
+        return [
+            {
+                "id_booking": data.get("id_booking"),
+                "booking_status": data.get("booking_status"),
+                "id_pms_booking": booking_id,
+            }
+            for data, booking_id in zip(payloads, results)
+        ]
+
+    def _dedupe_channel_payloads(self, payloads):
+        """Keep the last payload of every channel booking id, in order of first appearance.
+
+        A cancellation is terminal: a later modification of the same booking
+        does not replace it.
+        """
+        deduped = {}
+        for position, data in enumerate(payloads):
+            if data.get("booking_status") not in CHANNEL_BOOKING_STATUSES:
+                continue
+            if data.get("id_booking"):
+                kind = "new" if data["booking_status"] == "new" else "pms"
+                key = (kind, str(data["id_booking"]))
+            else:
+                key = ("payload", position)
+            if deduped.get(key, {}).get("booking_status") == "cancelled":
+                continue
+            deduped[key] = data
+        return list(deduped.values())
+
+    def _get_channel_partner_key(self, partner_data):
+        name = f"{partner_data.get('firstname', '')} {partner_data.get('lastname', '')}".strip()
+        return name, partner_data.get("email") or False
+
+    def _get_channel_lookups(self, payloads):
+        """
+        Resolve the reference data of a batch of payloads with one search per model.
+        Returns:
+            A dict of lookup maps shared by the whole batch.
+        """
+        partner_keys, state_names, country_codes, currencies = set(), set(), set(), set()
+        hotel_ids, room_type_ids, service_names, channel_ids = set(), set(), set(), set()
+        for data in payloads:
+            partner_data = data.get("guest_detail", {})
+            partner_keys.add(self._get_channel_partner_key(partner_data))
+            state_names.add(partner_data.get("state"))
+            country_codes.add(partner_data.get("country_code"))
+            currencies.add(data.get("currency"))
+            if data.get("id_property"):
+                hotel_ids.add(int(data["id_property"]))
+            if data.get("booking_status") == "new" and data.get("id_booking"):
+                channel_ids.add(str(data["id_booking"]))
+            for room_booking in data.get("room_bookings", []):
+                room_type_ids.add(int(room_booking.get("id_room_type")))
+                for room in room_booking.get("rooms", []):
+                    service_names.update(
+                        service.get("name", False) for service in room.get("services", [])
+                    )
+
+        partners = {}
+        for partner in self.env["res.partner"].sudo().search(
+            [
+                ("name", "in", [name for name, _email in partner_keys]),
+                ("email", "in", [email for _name, email in partner_keys]),
+            ]
+        ):
+            partners.setdefault((partner.name, partner.email or False), partner)
+
+        states = {}
+        for state in self.env["res.country.state"].sudo().search(
+            [("name", "in", [name for name in state_names if name])]
+        ):
+            states.setdefault(state.name, state.id)
+
+        countries = {}
+        for country in self.env["res.country"].sudo().search(
+            [("code", "in", [code for code in country_codes if code])]
+        ):
+            countries.setdefault(country.code, country.id)
+
+        pricelists = {}
+        for pricelist in self.env["product.pricelist"].sudo().search(
+            [("currency_id.name", "in", [name for name in currencies if name])]
+        ):
+            pricelists.setdefault(pricelist.currency_id.name, pricelist)
+
+        Service = self.env["hotel.service"]
+        services = {}
+        for service in Service.search(
+            [("name", "in", list(service_names)), ("service_type", "=", "paid")]
+        ):
+            services.setdefault(service.name, service.id)
+        missing = [name for name in service_names if name and name not in services]
+        for name, service in zip(
+            missing,
+            Service.create([{"name": name, "service_type": "paid"} for name in missing]),
+        ):
+            services[name] = service.id
+
+        channel_bookings = {}
+        if channel_ids:
+            for booking in self.search([("channel_booking_id", "in", list(channel_ids))]):
+                channel_bookings.setdefault(booking.channel_booking_id, booking)
+
+        # Prefetch the room types and their variants for _prepare_booking_lines
+        self.env["product.template"].browse(list(room_type_ids)).product_variant_ids
+
+        return {
+            "partners": partners,
+            "states": states,
+            "countries": countries,
+            "pricelists": pricelists,
+            "default_pricelist": self._default_pricelist_id(),
+            "hotels": set(self.env["hotel.hotels"].browse(list(hotel_ids)).exists().ids),
+            "services": services,
+            "channel_bookings": channel_bookings,
+        }
+
+    def _get_channel_partners(self, payloads, lookups):
+        """
+        Update the known guests and create the missing ones in one create() call.
+        Returns:
+            A dict (name, email) -> res.partner for every payload of the batch.
+        """
+        partners = lookups["partners"]
+        address_by_key = {}
+        for data in payloads:
+            partner_data = data.get("guest_detail", {})
+            address_by_key[self._get_channel_partner_key(partner_data)] = (partner_data, {
+                "street": partner_data.get("address"),
+                "city": partner_data.get("city"),
+                "state_id": lookups["states"].get(partner_data.get("state")) or False,
+                "zip": partner_data.get("zip"),
+                "country_id": lookups["countries"].get(partner_data.get("country_code")) or False,
+            })
+
+        to_write = {}
+        to_create = []
+        for key, (partner_data, address) in address_by_key.items():
+            if key in partners:
+                group = tuple(sorted(address.items()))
+                to_write.setdefault(group, [address, self.env["res.partner"].sudo()])[1] |= partners[key]
+            else:
+                to_create.append((key, dict(
+                    address,
+                    name=key[0],
+                    email=partner_data.get("email"),
+                    phone=partner_data.get("phone"),
+                )))
+
+        for address, partner_records in to_write.values():
+            partner_records.write(address)
+        if to_create:
+            created = self.env["res.partner"].sudo().create([vals for _key, vals in to_create])
+            for (key, _vals), partner in zip(to_create, created):
+                partners[key] = partner
+        return partners
+
+    def _prepare_channel_booking_vals(self, booking_data, partners, lookups):
+        """Booking values of a payload, resolved through the batch lookup maps"""
+        room_data = booking_data.get("room_bookings", [])[0].get("rooms", [])
+        booking_date = booking_data.get("booking_date")
+        price_details = booking_data.get("price_details", {})
+
+        if price_details:
+            total_amount = price_details.get("total_price_with_tax")
+            tax_amount = price_details.get("total_tax")
+        else:
+            raise UserError("Price Details are missing")
+
+        partner = partners[self._get_channel_partner_key(booking_data.get("guest_detail", {}))]
+
+        check_in = check_out = False
+        if room_data:
+            check_in = datetime.strptime(
+                booking_data.get("room_bookings", [])[0].get("check_in_date"),
+                "%Y-%m-%d",
+            )
+            check_out = datetime.strptime(
+                booking_data.get("room_bookings", [])[0].get("check_out_date"),
+                "%Y-%m-%d",
+            )
+        pricelist = (
+            lookups["pricelists"].get(booking_data.get("currency"))
+            or lookups["default_pricelist"]
+        )
+        if not pricelist:
+            raise ValueError(
+                "-> No active pricelist found. Ensure a pricelist is configured in the system."
+            )
+        hotel_id = booking_data.get("id_property")
+        return {
+            "hotel_id": hotel_id if hotel_id and int(hotel_id) in lookups["hotels"] else False,
+            "booking_reference": "other",
+            "origin": booking_data.get("source", ""),
+            "description": booking_data.get("remark"),
+            "check_in": check_in,
+            "check_out": check_out,
+            "booking_date": datetime.strptime(booking_date, "%Y-%m-%d %H:%M:%S"),
+            "partner_id": partner.id,
+            "pricelist_id": pricelist.id,
+            "total_amount": total_amount or False,
+            "tax_amount": tax_amount or False,
+            "need_to_sync": True,
+        }
 
     def cancel_existing_booking(self, booking_data):
         """
@@ -396,32 +864,37 @@ class HotelBooking(models.Model):
         else:
             return Service.create({"name": service_name, "service_type": "paid"}).id
 
-    def get_services_details(self, services):
+    def get_services_details(self, services, service_ids=None):
         """
         Prepare the services lines for the booking lines.
         Arguments:
         booking_data: Data dictionary that contains details for the booking(from request).
+        service_ids: Optional map service name -> id resolved for the whole batch.
         :returns:           A list with a dictionary.
         """
+        service_ids = service_ids or {}
         return [
             (
                 0,
                 0,
                 {
-                    "service_id": self.get_service_id(service.get("name", False)),
+                    "service_id": service_ids.get(service.get("name", False))
+                    or self.get_service_id(service.get("name", False)),
                     "amount": service.get("total_price_with_tax", 0),
                 },
             )
             for service in services
         ]
 
-    def _prepare_booking_lines(self, booking_data):
+    def _prepare_booking_lines(self, booking_data, lookups=None):
         """
         Prepare the booking lines for the hotel bookings.
         Arguments:
             booking_data: Data dictionary that contains details for the booking(from request).
+            lookups: Optional lookup maps of the batch (see _get_channel_lookups).
         :returns:           A list with a dictionary.
         """
+        service_ids = (lookups or {}).get("services")
         booking_lines = []
         room_bookings = booking_data.get("room_bookings", [])
         for room_booking in room_bookings:
@@ -444,7 +917,9 @@ class HotelBooking(models.Model):
                             "guest_info_ids": self.get_guest_details(
                                 room.get("occupancy", {})
                             ),
-                            "hotel_service_lines": self.get_services_details(room.get("services", [])),
+                            "hotel_service_lines": self.get_services_details(
+                                room.get("services", []), service_ids
+                            ),
                         },
                     )
                     booking_lines.append(booking_line)
@@ -458,134 +933,31 @@ class HotelBooking(models.Model):
         Returns:
             The ID of the newly created booking record.
         """
-
-        partner_data = booking_data.get("guest_detail", {})
-        room_data = booking_data.get("room_bookings", [])[0].get("rooms", [])
-        booking_date = booking_data.get("booking_date")
-        price_details = booking_data.get("price_details", {})
-
-        partner = (
-            self.env["res.partner"]
-            .sudo()
-            .search(
-                [
-                    (
-                        "name",
-                        "=",
-                        f"{partner_data.get('firstname', '')} {partner_data.get('lastname', '')}".strip(
-                        ),
-                    ),
-                    ("email", "=", partner_data.get("email")),
-                ],
-                limit=1,
-            )
+        booking_data = dict(
+            booking_data, booking_status="new" if mode == "create" else "modified"
         )
+        return self.process_booking_batch([booking_data])[0]["id_pms_booking"]
 
-        if price_details:
-            total_amount = price_details.get("total_price_with_tax")
-            tax_amount = price_details.get("total_tax")
-        else:
-            raise UserError("Price Details are missing")
 
-        if partner:
-            partner.write(
-                {
-                    "street": partner_data.get("address"),
-                    "city": partner_data.get("city"),
-                    "state_id": self.env["res.country.state"]
-                    .sudo()
-                    .search([("name", "=", partner_data.get("state"))], limit=1)
-                    .id
-                    or False,
-                    "zip": partner_data.get("zip"),
-                    "country_id": self.env["res.country"]
-                    .sudo()
-                    .search([("code", "=", partner_data.get("country_code"))], limit=1)
-                    .id
-                    or False,
-                }
-            )
-        else:
-            partner = (
-                self.env["res.partner"]
-                .sudo()
-                .create(
-                    {
-                        "name": f"{partner_data.get('firstname', '')} {partner_data.get('lastname', '')}".strip(),
-                        "email": partner_data.get("email"),
-                        "phone": partner_data.get("phone"),
-                        "street": partner_data.get("address"),
-                        "city": partner_data.get("city"),
-                        "state_id": self.env["res.country.state"]
-                        .sudo()
-                        .search([("name", "=", partner_data.get("state"))], limit=1)
-                        .id
-                        or False,
-                        "zip": partner_data.get("zip"),
-                        "country_id": self.env["res.country"]
-                        .sudo()
-                        .search(
-                            [("code", "=", partner_data.get("country_code"))], limit=1
-                        )
-                        .id
-                        or False,
-                    }
-                )
-            )
-
-        check_in = check_out = False
-        if room_data:
-            check_in = datetime.strptime(
-                booking_data.get("room_bookings", [])[0].get("check_in_date"),
-                "%Y-%m-%d",
-            )
-            check_out = datetime.strptime(
-                booking_data.get("room_bookings", [])[0].get("check_out_date"),
-                "%Y-%m-%d",
-            )
-        pricelist = (
-            self.env["product.pricelist"]
-            .sudo()
-            .search([("currency_id.name", "=", booking_data.get("currency"))], limit=1)
-        )
-        if not pricelist:
-            pricelist = self._default_pricelist_id()
+class HotelBookingLine(models.Model):
+    _inherit = "hotel.booking.line"
 
-        if not pricelist:
-            raise ValueError(
-                "-> No active pricelist found. Ensure a pricelist is configured in the system."
-            )
-        hotel_id = (
-            self.env["hotel.hotels"].browse(
-                booking_data.get("id_property")).exists()
-        )
-        data = {
-            "hotel_id": booking_data.get("id_property") if hotel_id else False,
-            "booking_reference": "other",
-            "origin": booking_data.get("source", ""),
-            "description": booking_data.get("remark"),
-            "check_in": check_in,
-            "check_out": check_out,
-            "booking_date": datetime.strptime(booking_date, "%Y-%m-%d %H:%M:%S"),
-            "partner_id": partner.id,
-            "pricelist_id": pricelist.id,
-            "total_amount": total_amount or False,
-            "tax_amount": tax_amount or False,
-            "need_to_sync": True,
-        }
-        if mode == "create":
-            lines = self._prepare_booking_lines(booking_data)
-            data.update({"booking_line_ids": lines})
-            odoo_booking = self.create(data)
-            odoo_booking.with_context(
-                bypass_checkin_checkout=True
-            ).action_confirm_booking()
-        else:
-            odoo_booking = self.browse(int(booking_data["id_booking"]))
-            if odoo_booking.exists() and odoo_booking.status_bar not in [
-                "checkout",
-                "cancel",
-            ]:
-                odoo_booking.write(data)
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super(HotelBookingLine, self).create(vals_list)
+        lines.booking_id._get_channel_feed_bookings()._bump_sync_sequence()
+        return lines
 
-        return odoo_booking.id if odoo_booking else False
+    def write(self, vals):
+        if not SYNC_FEED_LINE_FIELDS.intersection(vals):
+            return super(HotelBookingLine, self).write(vals)
+        bookings = self.booking_id
+        result = super(HotelBookingLine, self).write(vals)
+        (bookings | self.booking_id)._get_channel_feed_bookings()._bump_sync_sequence()
+        return result
+
+    def unlink(self):
+        bookings = self.booking_id._get_channel_feed_bookings()
+        result = super(HotelBookingLine, self).unlink()
+        bookings.exists()._bump_sync_sequence()
+        return result
@@ -4,22 +4,65 @@
 #    Copyright (c) 2016-Present Webkul Software Pvt. Ltd. (<https://webkul.com/>)
 #
 #################################################################################
-import random
+import hashlib
+import secrets
 import string
 import logging
 
 from odoo import models, fields, _, api
 from odoo.exceptions import UserError
+from odoo.tools.sql import column_exists
+from odoo.addons.hotel_management_system.tools.cache import SharedCache
 
 _logger = logging.getLogger(__name__)
 
+# Validated channel keys: key hash -> hotel.rest.api id. Hits do not query the
+# database: each worker checks the cache generation at most every
+# API_KEY_CACHE_CHECK_INTERVAL seconds, so regenerating a key or archiving an
+# account reaches the other workers within that delay.
+API_KEY_CACHE_TTL = 300
+API_KEY_CACHE_SIZE = 256
+API_KEY_CACHE_CHECK_INTERVAL = 5
+api_key_cache = SharedCache(
+    "channel_api_key", API_KEY_CACHE_TTL, API_KEY_CACHE_SIZE,
+    check_interval=API_KEY_CACHE_CHECK_INTERVAL,
+)
+
+
+def _hash_api_key(api_key):
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
 
 class HotelRestAPI(models.Model):
     _name = "hotel.rest.api"
     _description = "Hotel RESTful Web Services"
 
     def _default_unique_key(self, size, chars=string.ascii_uppercase + string.digits):
-        return "".join(random.choice(chars) for x in range(size))
+        return "".join(secrets.choice(chars) for x in range(size))
+
+    def init(self):
+        api_key_cache.init_generation(self.env.cr)
+        # Keys created before hashing was introduced: keep only their hash and hint
+        if column_exists(self.env.cr, self._table, "api_key"):
+            self.env.cr.execute(
+                """
+                UPDATE hotel_rest_api
+                   SET api_key_hash = encode(sha256(convert_to(api_key, 'UTF8')), 'hex'),
+                       api_key_hint = '****' || right(api_key, 4),
+                       api_key = NULL
+                 WHERE api_key IS NOT NULL
+                """
+            )
+
+    @api.model
+    def _get_account_id_by_key(self, api_key):
+        """Id of the active account owning the key, served from the cache when possible."""
+        api_key_hash = _hash_api_key(api_key)
+        return api_key_cache.get_or_compute(
+            self.env.cr,
+            api_key_hash,
+            lambda: self.sudo().search([("api_key_hash", "=", api_key_hash)], limit=1).id or None,
+        ) or False
 
     @api.model
     def _validate(self, api_key, context=None):
@@ -30,7 +73,7 @@ class HotelRestAPI(models.Model):
             response["message"] = "Invalid/Missing Api Key !!!"
             return response
         try:
-            Obj_exists = self.sudo().search([("api_key", "=", api_key)])
+            Obj_exists = self._get_account_id_by_key(api_key)
             if not Obj_exists:
                 response["responseCode"] = 401
                 response["message"] = "API Key is invalid !!!"
@@ -49,11 +92,42 @@ class HotelRestAPI(models.Model):
     description = fields.Text(
         "Extra Information", help="Quick description of the key", translate=True
     )
-    api_key = fields.Char(string="API Secret key")
+    api_key_hash = fields.Char(
+        string="API Secret key Hash", index=True, copy=False, readonly=True
+    )
+    api_key_hint = fields.Char(string="API Secret key", copy=False, readonly=True)
     active = fields.Boolean(default=True)
 
     def generate_secret_key(self):
-        self.api_key = self._default_unique_key(32)
+        """Only the hash of the key is stored, so the new key is shown once."""
+        for rec in self:
+            api_key = self._default_unique_key(32)
+            rec.write(
+                {
+                    "api_key_hash": _hash_api_key(api_key),
+                    "api_key_hint": "****" + api_key[-4:],
+                }
+            )
+        if len(self) != 1:
+            return True
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Api Secret Key"),
+                "message": _(
+                    "Copy the new key now, it will not be shown again: %s", api_key
+                ),
+                "sticky": True,
+                "type": "warning",
+                "next": {"type": "ir.actions.act_window_close"},
+            },
+        }
+
+    def write(self, vals):
+        if "active" in vals or "api_key_hash" in vals:
+            api_key_cache.invalidate(self.env.cr)
+        return super(HotelRestAPI, self).write(vals)
 
     def copy(self, default=None):
         raise UserError(_("You can't duplicate this Configuration."))
@@ -65,3 +65,21 @@ class HotelHotels(models.Model):
             }
             for room in self.room_ids
         ]
+
+    def write(self, vals):
+        """
+        Renew the sync sequence of every booking of the hotels whose publication
+        changes, so a newly published hotel reaches the change feed with all its
+        bookings instead of keeping sequences below the clients' `since`.
+        """
+        toggled = self.browse()
+        if "is_published" in vals:
+            toggled = self.filtered(
+                lambda hotel: hotel.is_published != bool(vals["is_published"])
+            )
+        result = super(HotelHotels, self).write(vals)
+        if toggled:
+            self.env["hotel.booking"].sudo().search(
+                [("hotel_id", "in", toggled.ids)]
+            )._bump_sync_sequence()
+        return result
@@ -31,18 +31,109 @@ class HotelBooking(models.Model):
             rec.pos_invoice_count = len(rec.pos_order_ids.mapped('account_move').ids)
 
     @api.model
-    def fetch_booked_room_data_for_pos(self):
-            booking=self.env['hotel.booking']
-            booking_ids = booking.search([('booking_line_ids','!=',False),('status_bar','=', 'allot')])
-            return [
-                {
-                    'booking_id':rec.id,
-                    'booking_customer':rec.partner_id.name,
-                    'customer_id':rec.partner_id.id,
-                    'booking_name':rec.sequence_id,
-                    'lines':rec.booking_line_ids.read(['id', 'product_id', 'booking_id'])
-                } for rec in booking_ids
-            ]
+    def fetch_booked_room_data_for_pos(self, booking_ids=None):
+        """Room folio data of the allotted bookings for the POS.
+
+        Bookings, customers and lines are loaded with a single query as
+        compact (booking, partner, line, room) rows, then grouped in the
+        payload the POS room popup expects.
+        """
+        self.check_access_rights('read')
+        self.env['hotel.booking.line'].check_access_rights('read')
+        self.flush_model(['partner_id', 'sequence_id', 'status_bar'])
+        self.env['hotel.booking.line'].flush_model(['booking_id', 'product_id'])
+        self.env['res.partner'].flush_model(['name'])
+        booking_clause = "AND booking.id IN %(booking_ids)s" if booking_ids else ""
+        self.env.cr.execute(
+            f"""
+            SELECT booking.id, booking.sequence_id,
+                   partner.id, partner.name,
+                   line.id, line.product_id
+              FROM hotel_booking booking
+              JOIN hotel_booking_line line ON line.booking_id = booking.id
+         LEFT JOIN res_partner partner ON partner.id = booking.partner_id
+             WHERE booking.status_bar = 'allot'
+               {booking_clause}
+          ORDER BY booking.id, line.id
+            """,
+            {'booking_ids': tuple(booking_ids or ())},
+        )
+        rows = self.env.cr.fetchall()
+        # Room names for every line in one batch
+        room_names = {
+            room.id: room.display_name
+            for room in self.env['product.product'].browse(
+                list({row[5] for row in rows if row[5]})
+            )
+        }
+        bookings = {}
+        for booking_id, booking_name, partner_id, partner_name, line_id, room_id in rows:
+            booking = bookings.setdefault(booking_id, {
+                'booking_id': booking_id,
+                'booking_customer': partner_name or False,
+                'customer_id': partner_id or False,
+                'booking_name': booking_name,
+                'lines': [],
+            })
+            booking['lines'].append({
+                'id': line_id,
+                'product_id': [room_id, room_names[room_id]] if room_id else False,
+                'booking_id': [booking_id, booking_name],
+            })
+        return list(bookings.values())
+
+    def _notify_pos_room_folio(self, added_ids=(), removed_ids=()):
+        """Push room folio changes to the open POS sessions.
+
+        Allotted bookings that are new or changed (rooms, customer) are sent
+        with their folio data, bookings leaving the allotted state by id only,
+        so the POS replaces its entries without fetching the room list again.
+        Changed bookings left without rooms are sent as removed.
+        """
+        if not added_ids and not removed_ids:
+            return
+        configs = self.env['pos.session'].sudo().search(
+            [('state', '!=', 'closed')]
+        ).config_id
+        if not configs:
+            return
+        added = self.fetch_booked_room_data_for_pos(list(added_ids)) if added_ids else []
+        sent_ids = {booking['booking_id'] for booking in added}
+        payload = {
+            'added': added,
+            'removed': list(set(removed_ids) | (set(added_ids) - sent_ids)),
+        }
+        self.env['bus.bus']._sendmany([
+            (config.access_token, 'HOTEL_ROOM_FOLIO', payload) for config in configs
+        ])
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        bookings = super().create(vals_list)
+        self._notify_pos_room_folio(
+            added_ids=bookings.filtered(lambda booking: booking.status_bar == 'allot').ids
+        )
+        return bookings
+
+    def write(self, vals):
+        if 'status_bar' not in vals and 'partner_id' not in vals:
+            return super().write(vals)
+        allotted = set(self.filtered(lambda booking: booking.status_bar == 'allot').ids)
+        result = super().write(vals)
+        now_allotted = set(self.filtered(lambda booking: booking.status_bar == 'allot').ids)
+        # A new customer changes the folio of the bookings that stay allotted
+        added_ids = now_allotted if 'partner_id' in vals else now_allotted - allotted
+        self._notify_pos_room_folio(
+            added_ids=added_ids,
+            removed_ids=allotted - now_allotted,
+        )
+        return result
+
+    def unlink(self):
+        allotted = self.filtered(lambda booking: booking.status_bar == 'allot').ids
+        result = super().unlink()
+        self._notify_pos_room_folio(removed_ids=allotted)
+        return result
 
     def pos_invoice_and_order_view(self):
         """POS invoice & order View
@@ -67,3 +158,33 @@ class HotelBooking(models.Model):
             'domain': [('id', 'in', record_ids)],
             "target": "current"
         }
+
+
+class HotelBookingLine(models.Model):
+    """Push the room changes of allotted bookings (room exchange, added or
+    removed rooms) to the open POS sessions."""
+    _inherit = "hotel.booking.line"
+
+    def _notify_pos_allotted_bookings(self, bookings):
+        allotted = bookings.exists().filtered(lambda booking: booking.status_bar == 'allot')
+        allotted._notify_pos_room_folio(added_ids=allotted.ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        self._notify_pos_allotted_bookings(lines.booking_id)
+        return lines
+
+    def write(self, vals):
+        if 'product_id' not in vals and 'booking_id' not in vals:
+            return super().write(vals)
+        bookings = self.booking_id
+        result = super().write(vals)
+        self._notify_pos_allotted_bookings(bookings | self.booking_id)
+        return result
+
+    def unlink(self):
+        bookings = self.booking_id
+        result = super().unlink()
+        self._notify_pos_allotted_bookings(bookings)
+        return result
@@ -19,8 +19,34 @@ export class RoomInfoButton extends Component {
         this.orm = useService('orm');
         this.popup = useService("popup");
         this.pos = usePos();
+        this.busService = useService("bus_service");
         onWillStart(async () => {
-            this.rooms = await this.orm.call('hotel.booking', 'fetch_booked_room_data_for_pos');
+            // Loaded once per POS session, then kept up to date over the bus
+            if (!this.pos.hotel_rooms) {
+                this.pos.hotel_rooms = await this.orm.call('hotel.booking', 'fetch_booked_room_data_for_pos');
+                this.listenRoomFolio();
+            }
+        });
+    }
+    get rooms() {
+        return this.pos.hotel_rooms;
+    }
+    listenRoomFolio() {
+        const pos = this.pos;
+        this.busService.addChannel(pos.config.access_token);
+        this.busService.addEventListener("notification", ({ detail }) => {
+            for (const { type, payload } of detail) {
+                if (type !== "HOTEL_ROOM_FOLIO") {
+                    continue;
+                }
+                const changed = new Set([
+                    ...payload.removed,
+                    ...payload.added.map((booking) => booking.booking_id),
+                ]);
+                pos.hotel_rooms = pos.hotel_rooms
+                    .filter((booking) => !changed.has(booking.booking_id))
+                    .concat(payload.added);
+            }
         });
     }
     get bookingName() {